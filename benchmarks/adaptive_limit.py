@@ -0,0 +1,78 @@
+"""
+How the AIMD limit settles against a backend that can only serve a few calls
+at once: the fixed bulkhead size vs the adaptive limit, at the same offered load.
+
+    uv run python benchmarks/adaptive_limit.py --requests 2000 --concurrency 64 --backend-capacity 6
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+from src.meta_supervisor.clients import adaptive_limit, backend, bulkhead, http  # noqa: E402
+from src.meta_supervisor.clients.backend import BackendClient  # noqa: E402
+from src.meta_supervisor.config import settings  # noqa: E402
+
+
+def stub_transport(capacity: int) -> httpx.MockTransport:
+    """A backend whose latency grows with the calls queued inside it."""
+    slots = asyncio.Semaphore(capacity)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        async with slots:
+            await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"ok": True})
+
+    return httpx.MockTransport(handler)
+
+
+async def measure(args, adaptive: bool) -> None:
+    settings.ADAPTIVE_LIMIT_ENABLED = adaptive
+    settings.BULKHEAD_QUEUE_TIMEOUT = 60.0
+    settings.BULKHEAD_MAX_QUEUE = args.concurrency
+    for registry in (adaptive_limit._limiters, bulkhead._bulkheads, backend._endpoints):
+        registry.clear()
+    http._transport = http.HTTPTransport(transport=stub_transport(args.backend_capacity))
+    client = BackendClient("stub", "http://stub", timeout=30.0)
+    remaining = iter(range(args.requests))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.request("GET", "/api/query")
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - started
+    # Time spent inside the backend, excluding the wait for a bulkhead slot.
+    snapshot = backend.get_endpoint_stats("stub", "/api/query").snapshot()
+    print(
+        f"{'adaptive' if adaptive else 'fixed   '} limit {client.bulkhead.capacity:3d}"
+        f"  {args.requests / elapsed:7.1f} req/s"
+        f"  backend latency p50 {snapshot['p50_ms']:6.1f} ms  p99 {snapshot['p99_ms']:6.1f} ms"
+    )
+    await http._transport.aclose()
+
+
+async def run(args) -> None:
+    await measure(args, adaptive=False)
+    await measure(args, adaptive=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--backend-capacity", type=int, default=6)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
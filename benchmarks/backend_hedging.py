@@ -0,0 +1,95 @@
+"""
+Tail latency of a backend with occasional stalls, with and without hedging
+idempotent requests after the endpoint's p95 latency.
+
+    uv run python benchmarks/backend_hedging.py --requests 400 --stall-rate 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from src.meta_supervisor.clients import backend  # noqa: E402
+from src.meta_supervisor.clients.backend import BackendClient  # noqa: E402
+from src.meta_supervisor.config import settings  # noqa: E402
+from src.meta_supervisor.metrics import LatencyStats  # noqa: E402
+
+stub = FastAPI()
+stall_rate = 0.05
+
+
+@stub.post("/api/query")
+async def stub_query(payload: dict):
+    await asyncio.sleep(1.0 if random.random() < stall_rate else 0.02)
+    return {"answer": "stub report", "timestamp": "2025-01-01T00:00:00"}
+
+
+def start_stub() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def measure(client: BackendClient, total: int, concurrency: int) -> LatencyStats:
+    latency = LatencyStats(window=total)
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.request("POST", "/api/query", idempotent=True, json={"q": 1})
+            response.raise_for_status()
+            latency.observe(time.perf_counter() - started)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latency
+
+
+async def run(args) -> None:
+    global stall_rate
+    stall_rate = args.stall_rate
+    base_url = start_stub()
+    settings.BREAKER_SLOW_CALL_SECONDS = 60.0
+    for hedging in (False, True):
+        settings.BACKEND_HEDGING = hedging
+        backend._endpoints.clear()
+        client = BackendClient(f"stub-{hedging}", base_url, timeout=30.0)
+        # Latency history the hedge delay is derived from.
+        await measure(client, settings.BACKEND_TIMEOUT_MIN_SAMPLES, 1)
+        snapshot = (await measure(client, args.requests, args.concurrency)).snapshot()
+        stats = backend.get_endpoint_stats(client.name, "/api/query")
+        print(
+            f"hedging={'on ' if hedging else 'off'}  p50 {snapshot['p50_ms']:7.1f} ms"
+            f"  p95 {snapshot['p95_ms']:7.1f} ms  p99 {snapshot['p99_ms']:7.1f} ms"
+            f"  max {snapshot['max_ms']:7.1f} ms  hedged {stats.hedged}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--stall-rate", type=float, default=0.05)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Cold start: seconds from launching the server to the first successful /api/query.
+
+Starts the app in a fresh uvicorn process with and without the startup warm-up,
+against a local stub of the OpenAI API, and sends --concurrency identical first
+queries. With warm-up the clients wait for /ready first, as a load balancer
+would; without it they go as soon as /health answers. The NLU fast path is off
+so every query runs the agent graph.
+
+    uv run python benchmarks/cold_start.py --runs 3 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+ANSWER = "stub answer"
+
+stub = FastAPI()
+
+
+@stub.post("/v1/chat/completions")
+async def stub_chat_completions(payload: dict):
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "stub"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": ANSWER},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub() -> str:
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def wait_for(client: httpx.AsyncClient, path: str, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get(path)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.01)
+    raise TimeoutError(f"{path} not ready after {timeout}s")
+
+
+async def first_query(client: httpx.AsyncClient, launched: float) -> float:
+    response = await client.post("/api/query", json={"query": "삼성전자 전망"})
+    response.raise_for_status()
+    if response.json()["answer"] != ANSWER:
+        raise RuntimeError(f"unexpected answer: {response.json()['answer']}")
+    return time.perf_counter() - launched
+
+
+async def cold_start(warm_up: bool, stub_url: str, concurrency: int) -> dict:
+    port = free_port()
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "benchmark",
+        "OPENAI_BASE_URL": f"{stub_url}/v1",
+        "NLU_FAST_PATH_MODE": "off",
+        "PERSISTENT_CACHE_ENABLED": "false",
+        "WARM_UP_ON_STARTUP": str(warm_up).lower(),
+    }
+    launched = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "src.meta_supervisor.main:app",
+            "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            await wait_for(client, "/health", timeout=60)
+            serving = time.perf_counter() - launched
+            await wait_for(client, "/ready", timeout=60)
+            ready = time.perf_counter() - launched
+            sent = time.perf_counter() - launched
+            done = await asyncio.gather(
+                *[first_query(client, launched) for _ in range(concurrency)]
+            )
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "serving_s": serving,
+        "ready_s": ready,
+        "first_success_s": min(done),
+        "first_request_ms": (min(done) - sent) * 1000,
+        "all_done_s": max(done),
+    }
+
+
+async def run(args) -> None:
+    stub_url = start_stub()
+    for warm_up in (False, True):
+        results = [
+            await cold_start(warm_up, stub_url, args.concurrency) for _ in range(args.runs)
+        ]
+        medians = {key: statistics.median(r[key] for r in results) for key in results[0]}
+        label = "warm-up at startup" if warm_up else "built on first use"
+        print(
+            f"{label:>19}: serving {medians['serving_s']:.2f}s, ready {medians['ready_s']:.2f}s, "
+            f"first success {medians['first_success_s']:.2f}s "
+            f"(first request {medians['first_request_ms']:.0f}ms), "
+            f"{args.concurrency} queries done {medians['all_done_s']:.2f}s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Measures /health latency while /api/process is under load.
+
+Compares the old inline tokenization (blocking the event loop) with the NLU
+executor. Okt is replaced by a tokenizer that blocks for --tokenize-ms so the
+benchmark also runs on machines without a JVM; pass --real-okt to use konlpy.
+
+    uv run python benchmarks/health_under_nlu_load.py --concurrency 16
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+from src.meta_supervisor.main import app  # noqa: E402
+from src.meta_supervisor.services import nlu_service, tokenizer_engine  # noqa: E402
+
+
+class BlockingTokenizer:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def pos(self, text, norm=False, stem=False):
+        time.sleep(self.delay)
+        return [(word, "Noun") for word in text.split()]
+
+
+async def _inline_analyze(text):
+    # Baseline behaviour: synchronous analysis straight on the event loop.
+    return nlu_service.analyze(text)
+
+
+async def run(mode: str, concurrency: int, duration: float) -> dict:
+    if mode == "inline":
+        nlu_service.analyze_async = _inline_analyze
+    else:
+        nlu_service.analyze_async = original_analyze_async
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = time.perf_counter() + duration
+        processed = 0
+
+        async def load():
+            nonlocal processed
+            while time.perf_counter() < stop:
+                await client.post("/api/process", json={"query": "오늘 날씨 어때"})
+                processed += 1
+
+        async def probe():
+            samples = []
+            while time.perf_counter() < stop:
+                started = time.perf_counter()
+                await client.get("/health")
+                samples.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(0.01)
+            return samples
+
+        results = await asyncio.gather(probe(), *[load() for _ in range(concurrency)])
+        samples = sorted(results[0])
+
+    return {
+        "mode": mode,
+        "process_rps": round(processed / duration, 1),
+        "health_p50_ms": round(statistics.median(samples), 2),
+        "health_p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+        "health_max_ms": round(samples[-1], 2),
+    }
+
+
+original_analyze_async = nlu_service.analyze_async
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--tokenize-ms", type=float, default=20.0)
+    parser.add_argument("--real-okt", action="store_true")
+    args = parser.parse_args()
+    logging.getLogger("http_middleware").setLevel(logging.WARNING)
+
+    engine = tokenizer_engine.get_tokenizer_engine()
+    if not args.real_okt:
+        engine._factory = lambda: BlockingTokenizer(args.tokenize_ms / 1000)
+    engine.warm_up()
+    # Measure tokenization, not the result cache.
+    nlu_service.result_cache.max_entries = 0
+
+    for mode in ("inline", "executor"):
+        print(asyncio.run(run(mode, args.concurrency, args.duration)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Requests per second against a local stub backend: a new httpx.AsyncClient per
+call (the previous behaviour) vs the shared pooled transport.
+
+    uv run python benchmarks/http_transport.py --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from src.meta_supervisor.clients.http import HTTPTransport  # noqa: E402
+
+stub = FastAPI()
+
+
+@stub.post("/api/query")
+async def stub_query(payload: dict):
+    return {"answer": "stub report", "timestamp": "2025-01-01T00:00:00"}
+
+
+def start_stub() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def per_call_client(base_url: str) -> None:
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{base_url}/api/query", json={"query": "q"})
+        response.raise_for_status()
+
+
+async def pooled_client(transport: HTTPTransport, base_url: str) -> None:
+    client = transport.client("stub", base_url)
+    response = await client.post("/api/query", json={"query": "q"})
+    response.raise_for_status()
+
+
+async def measure(call, total: int, concurrency: int) -> float:
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            await call()
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return total / (time.perf_counter() - started)
+
+
+async def run(args) -> None:
+    base_url = start_stub()
+    transport = HTTPTransport(max_connections=args.concurrency)
+    try:
+        before = await measure(lambda: per_call_client(base_url), args.requests, args.concurrency)
+        after = await measure(
+            lambda: pooled_client(transport, base_url), args.requests, args.concurrency
+        )
+    finally:
+        await transport.aclose()
+    print(f"client per call: {before:8.1f} req/s")
+    print(f"pooled transport: {after:8.1f} req/s ({after / before:.1f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
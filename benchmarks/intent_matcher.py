@@ -0,0 +1,56 @@
+"""
+Micro-benchmark: compiled intent matcher vs the original keyword loop.
+
+Grows the keyword vocabulary with synthetic terms and reports the per-query
+cost of both classifiers.
+
+    uv run python benchmarks/intent_matcher.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from src.meta_supervisor.services.intent_matcher import IntentMatcher  # noqa: E402
+from src.meta_supervisor.services.nlu_service import INTENT_KEYWORDS  # noqa: E402
+
+QUERY_TEXT = "삼성전자 005930 주가 차트 분석하고 매매 전략 만들어줘"
+QUERY_TOKENS = ["삼성전자", "주가", "차트", "분석", "하다", "매매", "전략", "만들다"]
+
+
+def legacy_classify(intent_keywords, tokens):
+    for intent, keywords in intent_keywords.items():
+        if any(keyword in tokens for keyword in keywords):
+            return intent
+    return "unknown"
+
+
+def synthetic_vocabulary(size: int) -> dict:
+    rng = random.Random(size)
+    vocabulary = {intent: list(keywords) for intent, keywords in INTENT_KEYWORDS.items()}
+    intents = list(vocabulary)
+    while sum(len(keywords) for keywords in vocabulary.values()) < size:
+        word = "".join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(2, 4)))
+        vocabulary[rng.choice(intents)].append(word)
+    # Real keywords last: the legacy loop has to scan everything before them.
+    return {intent: keywords[::-1] for intent, keywords in vocabulary.items()}
+
+
+def main():
+    print(f"{'keywords':>9} {'legacy_us':>10} {'matcher_us':>11}")
+    for size in (20, 200, 2000, 5000):
+        vocabulary = synthetic_vocabulary(size)
+        matcher = IntentMatcher(vocabulary)
+        number = 2000
+
+        legacy = timeit.timeit(lambda: legacy_classify(vocabulary, QUERY_TOKENS), number=number)
+        compiled = timeit.timeit(lambda: matcher.rank(QUERY_TOKENS, QUERY_TEXT), number=number)
+        print(f"{size:>9} {legacy / number * 1e6:>10.2f} {compiled / number * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Throughput of the batch analysis endpoint vs one /api/process call per query.
+
+Okt is replaced by a tokenizer that blocks for --tokenize-ms unless
+--real-okt is given.
+
+    uv run python benchmarks/nlu_batch.py --queries 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+from src.meta_supervisor.main import app  # noqa: E402
+from src.meta_supervisor.services import nlu_service, tokenizer_engine  # noqa: E402
+
+SAMPLE_QUERIES = [
+    "오늘 날씨 어때",
+    "좋은 아침이에요",
+    "도움말 보여줘",
+    "안녕하세요 반갑습니다",
+]
+
+
+class BlockingTokenizer:
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def pos(self, text, norm=False, stem=False):
+        time.sleep(self.delay)
+        return [(word, "Noun") for word in text.split()]
+
+
+async def single_path(client: httpx.AsyncClient, queries: list, concurrency: int) -> None:
+    pending = iter(queries)
+
+    async def worker():
+        for query in pending:
+            await client.post("/api/process", json={"query": query})
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+
+async def batch_path(client: httpx.AsyncClient, queries: list, batch_size: int) -> None:
+    for start in range(0, len(queries), batch_size):
+        response = await client.post(
+            "/api/analyze/batch", json={"queries": queries[start : start + batch_size]}
+        )
+        assert response.json()["success"], response.text
+
+
+async def run(args) -> None:
+    queries = [SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)] + f" {i}" for i in range(args.queries)]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, path in (
+            ("single", lambda: single_path(client, queries, args.concurrency)),
+            ("batch", lambda: batch_path(client, queries, args.batch_size)),
+        ):
+            started = time.perf_counter()
+            await path()
+            elapsed = time.perf_counter() - started
+            print(f"{name:>6}: {args.queries / elapsed:8.1f} queries/s ({elapsed:.2f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--tokenize-ms", type=float, default=1.0)
+    parser.add_argument("--real-okt", action="store_true")
+    args = parser.parse_args()
+    logging.getLogger("http_middleware").setLevel(logging.WARNING)
+
+    engine = tokenizer_engine.get_tokenizer_engine()
+    if not args.real_okt:
+        engine._factory = lambda: BlockingTokenizer(args.tokenize_ms / 1000)
+    engine.warm_up()
+    # Measure tokenization, not the result cache.
+    nlu_service.result_cache.max_entries = 0
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
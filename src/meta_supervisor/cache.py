@@ -0,0 +1,203 @@
+"""
+In-process caches shared by services.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and an optional memory cap.
+
+    Entries are evicted least-recently-used first whenever the entry count
+    exceeds `max_entries` or the estimated size exceeds `max_bytes`.
+    Sizes come from `sizeof(key, value)`; without a memory cap they are
+    not computed at all.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Hashable, Any], int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof if max_bytes else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (value, expires_at, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at, size = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.max_entries <= 0:
+            return
+        size = self._sizeof(key, value) if self._sizeof else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes and self._bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self._bytes -= entry[2]
+            return entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class AsyncTTLCache:
+    """
+    Async cache with per-entry TTL and stale-while-revalidate.
+
+    An entry is fresh for `ttl` seconds and may then be served stale for
+    another `stale_ttl` seconds. A stale hit returns immediately and starts
+    one background refresh for that key; a failed refresh keeps serving the
+    stale value until it expires. Only misses wait for the loader.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        stale_ttl: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        # Values are stored as (value, fresh_until) for ttl + stale_ttl.
+        self._entries = TTLCache(max_entries=max_entries, ttl=ttl + stale_ttl, clock=clock)
+        self._refreshing: Set[Hashable] = set()
+        # Keeps background refreshes referenced until they finish.
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, str]:
+        """
+        Returns (value, status) where status is "fresh", "stale" or "miss".
+        Loader exceptions propagate on a miss and are never cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if fresh_until > self._clock():
+                self.fresh_hits += 1
+                return value, "fresh"
+            self.stale_hits += 1
+            if key not in self._refreshing:
+                self._refreshing.add(key)
+                task = asyncio.ensure_future(self._refresh(key, loader))
+                self._refresh_tasks.add(task)
+                task.add_done_callback(self._refresh_tasks.discard)
+            return value, "stale"
+
+        self.misses += 1
+        value = await loader()
+        self.set(key, value)
+        return value, "miss"
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        self.refreshes += 1
+        try:
+            self.set(key, await loader())
+        except Exception as e:
+            self.refresh_failures += 1
+            logger.warning(f"Background refresh failed for {key!r}: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries.set(key, (value, self._clock() + self.ttl))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._entries.max_entries,
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else None,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "in_progress_refreshes": len(self._refreshing),
+            "evictions": self._entries.evictions,
+        }
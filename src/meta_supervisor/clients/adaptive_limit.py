@@ -0,0 +1,162 @@
+"""
+AIMD concurrency limits for backends.
+
+`AdaptiveLimiter` sets the capacity of a backend's bulkhead the way TCP
+congestion control sets its window: while calls succeed at close to the
+baseline latency and the limit is actually in use, it grows by one per
+limit's worth of calls (additive increase); when a call fails or takes
+longer than `latency_tolerance` times the baseline it is cut by
+`backoff_ratio` (multiplicative decrease), at most once per round trip.
+
+Latency is judged per endpoint: the baseline is the average of the
+endpoint's last `baseline_window` successful calls, and what is compared
+against it is an exponentially weighted moving average of the same calls,
+which follows the last few dozen. One slow answer from an LLM-backed
+endpoint whose latency varies tenfold from call to call does not count as
+congestion; a sustained rise does.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from ..config import settings
+from .bulkhead import Bulkhead, get_bulkhead
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        bulkhead: Bulkhead,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.7,
+        latency_tolerance: float = 2.0,
+        baseline_window: int = 200,
+        min_samples: int = 20,
+        smoothing: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.bulkhead = bulkhead
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.baseline_window = baseline_window
+        # Latency is not judged until an endpoint has this many successful calls.
+        self.min_samples = max(1, min_samples)
+        self.smoothing = smoothing
+        self._clock = clock
+        self._lock = threading.Lock()
+        # endpoint -> recent successful latencies, and their moving average
+        self._recent: Dict[str, Deque[float]] = {}
+        self._smoothed: Dict[str, float] = {}
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial_limit)))
+        self._last_decrease = float("-inf")
+        self.increases = 0
+        self.decreases = 0
+        self.bulkhead.set_capacity(int(self._limit))
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def baseline(self, endpoint: str = "") -> Optional[float]:
+        with self._lock:
+            return self._baseline(endpoint)
+
+    def _baseline(self, endpoint: str) -> Optional[float]:
+        recent = self._recent.get(endpoint)
+        if recent is None or len(recent) < self.min_samples:
+            return None
+        return sum(recent) / len(recent)
+
+    def record(self, latency: float, success: bool, in_flight: int, endpoint: str = "") -> None:
+        """
+        Feeds one finished call to `endpoint`; `in_flight` counts calls running
+        alongside it.
+        """
+        with self._lock:
+            baseline = self._baseline(endpoint)
+            slow = False
+            if success:
+                recent = self._recent.get(endpoint)
+                if recent is None:
+                    recent = self._recent[endpoint] = deque(maxlen=self.baseline_window)
+                recent.append(latency)
+                smoothed = self._smoothed.get(endpoint, latency)
+                smoothed += self.smoothing * (latency - smoothed)
+                self._smoothed[endpoint] = smoothed
+                slow = baseline is not None and smoothed > baseline * self.latency_tolerance
+            congested = not success or slow
+            if congested:
+                now = self._clock()
+                # Calls that overlapped the last cut reflect the old limit.
+                if now - self._last_decrease < latency:
+                    return
+                self._last_decrease = now
+                limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                if int(limit) < int(self._limit):
+                    self.decreases += 1
+            elif in_flight * 2 >= self._limit:
+                # Growing while most of the limit sits idle would prove nothing.
+                limit = min(self.max_limit, self._limit + 1 / self._limit)
+                if int(limit) > int(self._limit):
+                    self.increases += 1
+            else:
+                return
+            self._limit = limit
+        self.bulkhead.set_capacity(int(limit))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    "baseline_ms": _ms(self._baseline(endpoint)),
+                    "smoothed_ms": _ms(self._smoothed.get(endpoint)),
+                }
+                for endpoint in self._recent
+            }
+        return {
+            "limit": self.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "endpoints": endpoints,
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+
+_limiters: Dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_adaptive_limiter(name: str) -> Optional[AdaptiveLimiter]:
+    """Returns the process-wide limiter for backend `name`, or None when disabled."""
+    if not settings.ADAPTIVE_LIMIT_ENABLED:
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = _limiters[name] = AdaptiveLimiter(
+                get_bulkhead(name),
+                initial_limit=settings.ADAPTIVE_LIMIT_INITIAL,
+                min_limit=settings.ADAPTIVE_LIMIT_MIN,
+                # The configured bulkhead size is the hard ceiling.
+                max_limit=settings.BULKHEAD_MAX_CONCURRENT,
+                backoff_ratio=settings.ADAPTIVE_LIMIT_BACKOFF_RATIO,
+                latency_tolerance=settings.ADAPTIVE_LIMIT_LATENCY_TOLERANCE,
+            )
+        return limiter
+
+
+def adaptive_limit_stats() -> Dict[str, Any]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {backend: limiter.stats() for backend, limiter in limiters.items()}
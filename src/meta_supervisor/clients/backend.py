@@ -0,0 +1,329 @@
+"""
+Resilient client for one backend service.
+
+`BackendClient` sends requests over the shared pooled transport and guards
+them with the backend's circuit breaker: transport errors, 5xx responses and
+slow calls count against the backend, and while its circuit is open calls
+fail immediately with `CircuitOpenError` instead of waiting for a timeout.
+
+Each backend also has a bulkhead capping its concurrent calls (sized by an
+AIMD limiter that tracks the backend's latency, when enabled), and
+idempotent calls that hit a transient failure (connection errors, connect
+timeouts, 502/503/504) are retried a bounded number of times with
+full-jitter exponential backoff, within the configured timeout. Read
+timeouts are not retried.
+
+Latency is tracked per backend and endpoint. Once an endpoint has enough
+samples its read timeout follows the observed tail latency (capped by the
+configured timeout, and doubled after each read timeout in a row), and
+idempotent calls can be hedged: when the first attempt outlives the
+endpoint's hedge percentile a second attempt is sent, the first response
+wins and the other attempt is cancelled.
+
+`stream()` opens a request whose body the caller reads incrementally;
+`aiter_limited` caps how many bytes of it are accepted.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+from ..config import settings
+from ..metrics import LatencyStats
+from .adaptive_limit import get_adaptive_limiter
+from .bulkhead import get_bulkhead
+from .circuit_breaker import CLOSED, get_circuit_breaker
+from .http import get_http_transport
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+
+
+class ResponseTooLargeError(RuntimeError):
+    """Raised when a backend response exceeds the accepted size."""
+
+    def __init__(self, name: str, max_bytes: int):
+        super().__init__(f"Response from '{name}' exceeds {max_bytes} bytes")
+        self.name = name
+        self.max_bytes = max_bytes
+
+
+async def aiter_limited(
+    response: httpx.Response, max_bytes: int, name: str = "backend"
+) -> AsyncIterator[bytes]:
+    """Yields the decoded body of a streamed response, failing past `max_bytes`."""
+    declared = response.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+        raise ResponseTooLargeError(name, max_bytes)
+    received = 0
+    async for chunk in response.aiter_bytes():
+        received += len(chunk)
+        if received > max_bytes:
+            raise ResponseTooLargeError(name, max_bytes)
+        yield chunk
+
+
+def backoff_delay(retry: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^retry)]."""
+    return random.uniform(0, min(cap, base * 2**retry))
+
+
+class EndpointStats:
+    """Latency and hedging counters for one backend endpoint."""
+
+    def __init__(self):
+        self.latency = LatencyStats()
+        self.timeouts = 0
+        # Read timeouts since the last reply; each one doubles the next timeout.
+        self.consecutive_timeouts = 0
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.latency.snapshot(),
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+_endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+_endpoints_lock = threading.Lock()
+
+
+def get_endpoint_stats(backend: str, endpoint: str) -> EndpointStats:
+    with _endpoints_lock:
+        stats = _endpoints.get((backend, endpoint))
+        if stats is None:
+            stats = _endpoints[(backend, endpoint)] = EndpointStats()
+        return stats
+
+
+class BackendClient:
+    def __init__(self, name: str, base_url: str, timeout: float):
+        self.name = name
+        self.base_url = base_url
+        # Upper bound; adaptive timeouts only ever shorten it.
+        self.timeout = timeout
+        self.breaker = get_circuit_breaker(name)
+        self.bulkhead = get_bulkhead(name)
+        self.limiter = get_adaptive_limiter(name)
+
+    def timeout_for(self, endpoint: str) -> float:
+        """Read timeout for `endpoint`: a multiple of its tail latency, within bounds."""
+        if not settings.BACKEND_ADAPTIVE_TIMEOUTS:
+            return self.timeout
+        stats = get_endpoint_stats(self.name, endpoint)
+        if stats.latency.count < settings.BACKEND_TIMEOUT_MIN_SAMPLES:
+            return self.timeout
+        tail = stats.latency.percentile(settings.BACKEND_TIMEOUT_PERCENTILE)
+        # A backend that slowed down past the timeout must be able to win it back.
+        backoff = 2 ** min(stats.consecutive_timeouts, 16)
+        adaptive = tail * settings.BACKEND_TIMEOUT_MULTIPLIER * backoff
+        return min(self.timeout, max(settings.BACKEND_TIMEOUT_FLOOR_SECONDS, adaptive))
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little data."""
+        latency = get_endpoint_stats(self.name, endpoint).latency
+        if latency.count < settings.BACKEND_TIMEOUT_MIN_SAMPLES:
+            return None
+        return latency.percentile(settings.BACKEND_HEDGE_PERCENTILE)
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        timeout: Optional[float] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Sends one request. Raises `CircuitOpenError` without touching the
+        network while the circuit is open, and `BulkheadFullError` when the
+        backend's concurrency cap and queue are exhausted; status errors are
+        left to the caller.
+
+        `idempotent` defaults to True for safe methods; only idempotent
+        requests are retried and hedged. Read timeouts are not retried, and
+        no retry starts after the configured timeout would have expired.
+        """
+        if timeout is None:
+            timeout = self.timeout_for(endpoint)
+        if idempotent is None:
+            idempotent = method.upper() in SAFE_METHODS
+        retries = settings.BACKEND_RETRY_ATTEMPTS if idempotent else 0
+        stats = get_endpoint_stats(self.name, endpoint)
+
+        # Retries never take the call past one attempt's configured timeout.
+        deadline = time.monotonic() + self.timeout
+        retry = 0
+        while True:
+            delay = self.hedge_delay(endpoint) if idempotent and settings.BACKEND_HEDGING else None
+            error: Optional[httpx.TransportError] = None
+            try:
+                if delay is None:
+                    response = await self._attempt(method, endpoint, timeout, **kwargs)
+                else:
+                    response = await self._hedged(method, endpoint, timeout, delay, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES or retry >= retries:
+                    return response
+            except httpx.ReadTimeout:
+                # The backend got the request and is slow; another attempt adds
+                # load to an overloaded backend and outlives the caller's deadline.
+                raise
+            except httpx.TransportError as e:
+                if retry >= retries:
+                    raise
+                error = e
+            backoff = backoff_delay(
+                retry, settings.BACKEND_RETRY_BASE_DELAY, settings.BACKEND_RETRY_MAX_DELAY
+            )
+            if time.monotonic() + backoff >= deadline:
+                if error is not None:
+                    raise error
+                return response
+            stats.retries += 1
+            await asyncio.sleep(backoff)
+            retry += 1
+
+    @asynccontextmanager
+    async def stream(
+        self, method: str, endpoint: str, timeout: Optional[float] = None, **kwargs: Any
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Opens a request whose body the caller reads incrementally. The bulkhead
+        slot is held until the stream closes; the circuit breaker judges the
+        call by its response headers, the adaptive limiter by the whole
+        stream. Streams are never retried or hedged, and `timeout` bounds
+        each read rather than the whole body.
+        """
+        async with self.bulkhead.slot():
+            self.breaker.before_call()
+            started = time.monotonic()
+            try:
+                client = get_http_transport().client(self.name, self.base_url)
+                request = client.build_request(
+                    method,
+                    endpoint,
+                    timeout=httpx.Timeout(
+                        self.timeout if timeout is None else timeout,
+                        connect=settings.HTTP_CONNECT_TIMEOUT,
+                    ),
+                    **kwargs,
+                )
+                response = await client.send(request, stream=True)
+            except httpx.RequestError:
+                self._record(False, time.monotonic() - started, endpoint)
+                raise
+            except BaseException:
+                self.breaker.release()
+                raise
+            success = response.status_code < 500
+            self.breaker.record(success, time.monotonic() - started)
+            # The limiter sees the whole stream, which holds its slot throughout;
+            # time to headers alone would be a baseline no buffered call could meet.
+            try:
+                yield response
+            except httpx.TransportError:
+                self._limit(False, time.monotonic() - started, endpoint)
+                raise
+            else:
+                self._limit(success, time.monotonic() - started, endpoint)
+            finally:
+                await response.aclose()
+
+    async def _hedged(
+        self, method: str, endpoint: str, timeout: float, delay: float, **kwargs: Any
+    ) -> httpx.Response:
+        stats = get_endpoint_stats(self.name, endpoint)
+        primary = asyncio.ensure_future(self._attempt(method, endpoint, timeout, **kwargs))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+            # A recovering backend gets no extra load from hedges.
+            if self.breaker.state != CLOSED:
+                return await primary
+
+            stats.hedged += 1
+            hedge = asyncio.ensure_future(self._attempt(method, endpoint, timeout, **kwargs))
+            pending.add(hedge)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(
+        self, method: str, endpoint: str, timeout: float, **kwargs: Any
+    ) -> httpx.Response:
+        async with self.bulkhead.slot():
+            self.breaker.before_call()
+            stats = get_endpoint_stats(self.name, endpoint)
+            started = time.monotonic()
+            try:
+                client = get_http_transport().client(self.name, self.base_url)
+                response = await client.request(
+                    method,
+                    endpoint,
+                    timeout=httpx.Timeout(timeout, connect=settings.HTTP_CONNECT_TIMEOUT),
+                    **kwargs,
+                )
+            except httpx.RequestError as e:
+                elapsed = time.monotonic() - started
+                if isinstance(e, httpx.TimeoutException):
+                    stats.timeouts += 1
+                if isinstance(e, httpx.ReadTimeout):
+                    # The reply took at least this long; leaving it out of the
+                    # window would pin the timeout below the backend's latency.
+                    stats.consecutive_timeouts += 1
+                    stats.latency.observe(max(elapsed, timeout))
+                self._record(False, elapsed, endpoint)
+                raise
+            except BaseException:
+                # Cancellation or a local error says nothing about the backend.
+                self.breaker.release()
+                raise
+            elapsed = time.monotonic() - started
+            self._record(response.status_code < 500, elapsed, endpoint)
+            if response.status_code < 500:
+                stats.consecutive_timeouts = 0
+                stats.latency.observe(elapsed)
+            return response
+
+    def _record(self, success: bool, elapsed: float, endpoint: str) -> None:
+        self.breaker.record(success, elapsed)
+        self._limit(success, elapsed, endpoint)
+
+    def _limit(self, success: bool, elapsed: float, endpoint: str) -> None:
+        if self.limiter is not None:
+            self.limiter.record(
+                elapsed, success, in_flight=self.bulkhead.stats()["active"], endpoint=endpoint
+            )
+
+
+def backend_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-backend, per-endpoint latency and hedging statistics."""
+    with _endpoints_lock:
+        endpoints = dict(_endpoints)
+    result: Dict[str, Dict[str, Any]] = {}
+    for (backend, endpoint), stats in endpoints.items():
+        result.setdefault(backend, {})[endpoint] = stats.snapshot()
+    return result
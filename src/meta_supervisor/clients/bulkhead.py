@@ -0,0 +1,142 @@
+"""
+Per-backend concurrency bulkheads.
+
+A bulkhead caps the number of concurrent calls to one backend. Calls over
+the cap wait in a bounded FIFO queue; when the queue is full, or a call has
+waited longer than `queue_timeout`, it is rejected with `BulkheadFullError`
+so a burst cannot pile unbounded work onto a struggling backend.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+
+from ..config import settings
+from ..metrics import LatencyStats
+
+
+class BulkheadFullError(RuntimeError):
+    """Raised when a backend's bulkhead has no free slot or queue space."""
+
+    def __init__(self, name: str, reason: str):
+        super().__init__(f"Bulkhead for '{name}' rejected the call: {reason}")
+        self.name = name
+
+
+class Bulkhead:
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int = 32,
+        max_queue: int = 64,
+        queue_timeout: float = 5.0,
+    ):
+        self.name = name
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._capacity = max(1, max_concurrent)
+        self._active = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self.wait_stats = LatencyStats()
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def set_capacity(self, capacity: int) -> None:
+        """Changes the concurrency cap; a raised cap admits queued calls at once."""
+        self._capacity = max(1, capacity)
+        self._grant()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self) -> None:
+        if self._active < self._capacity and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            self.wait_stats.observe(0.0)
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise BulkheadFullError(self.name, f"{len(self._waiters)} calls already queued")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on.
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejected_timeout += 1
+                raise BulkheadFullError(
+                    self.name, f"no free slot within {self.queue_timeout:.1f}s"
+                ) from None
+            raise
+        self.admitted += 1
+        self.wait_stats.observe(time.monotonic() - started)
+
+    def release(self) -> None:
+        self._active -= 1
+        self._grant()
+
+    def _grant(self) -> None:
+        # Slots pass to queued calls in arrival order.
+        while self._waiters and self._active < self._capacity:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._active += 1
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self._capacity,
+            "active": self._active,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "wait": self.wait_stats.snapshot(),
+        }
+
+
+_bulkheads: Dict[str, Bulkhead] = {}
+_bulkheads_lock = threading.Lock()
+
+
+def get_bulkhead(name: str) -> Bulkhead:
+    """Returns the process-wide bulkhead for backend `name`."""
+    with _bulkheads_lock:
+        bulkhead = _bulkheads.get(name)
+        if bulkhead is None:
+            bulkhead = _bulkheads[name] = Bulkhead(
+                name,
+                max_concurrent=settings.BULKHEAD_MAX_CONCURRENT,
+                max_queue=settings.BULKHEAD_MAX_QUEUE,
+                queue_timeout=settings.BULKHEAD_QUEUE_TIMEOUT,
+            )
+        return bulkhead
+
+
+def bulkhead_stats() -> Dict[str, Any]:
+    with _bulkheads_lock:
+        bulkheads = dict(_bulkheads)
+    return {backend: bulkhead.stats() for backend, bulkhead in bulkheads.items()}
@@ -0,0 +1,180 @@
+"""
+Per-backend circuit breakers.
+
+A breaker watches a rolling time window of call outcomes. When enough calls
+in the window failed, or were slower than `slow_call_seconds`, it opens and
+rejects calls immediately with `CircuitOpenError`. After `open_seconds` it
+lets a limited number of probe calls through (half-open): a successful probe
+closes it again, a failed or slow one reopens it.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+from ..config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a backend whose circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit for '{name}' is open; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Error-rate and slow-call-rate circuit breaker over a rolling window.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 60.0,
+        min_calls: int = 5,
+        error_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 30.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (finished_at, failed, slow) per call in the window
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance()
+            return self._state
+
+    def before_call(self) -> None:
+        """Admits a call or raises `CircuitOpenError`."""
+        with self._lock:
+            self._advance()
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return
+            self.rejected += 1
+            retry_after = max(0.0, self._opened_at + self.open_seconds - self._clock())
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record(self, success: bool, duration: float) -> None:
+        """Records the outcome of an admitted call."""
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            now = self._clock()
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if success and not slow:
+                    self._state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._open(now)
+                return
+            if self._state == OPEN:
+                # A call admitted before the circuit opened; it changes nothing.
+                return
+            self._calls.append((now, not success, slow))
+            self._prune(now)
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            slow_calls = sum(1 for _, _, was_slow in self._calls if was_slow)
+            if (
+                failures / total >= self.error_rate_threshold
+                or slow_calls / total >= self.slow_call_rate_threshold
+            ):
+                self._open(now)
+
+    def release(self) -> None:
+        """Returns the probe slot of an admitted call that was cancelled."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self._calls.clear()
+        self.times_opened += 1
+
+    def _advance(self) -> None:
+        if self._state == OPEN and self._clock() >= self._opened_at + self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _prune(self, now: float) -> None:
+        while self._calls and self._calls[0][0] <= now - self.window_seconds:
+            self._calls.popleft()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._advance()
+            self._prune(self._clock())
+            total = len(self._calls)
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            slow_calls = sum(1 for _, _, was_slow in self._calls if was_slow)
+            return {
+                "state": self._state,
+                "window_calls": total,
+                "error_rate": round(failures / total, 4) if total else None,
+                "slow_call_rate": round(slow_calls / total, 4) if total else None,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Returns the process-wide breaker for backend `name`."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                window_seconds=settings.BREAKER_WINDOW_SECONDS,
+                min_calls=settings.BREAKER_MIN_CALLS,
+                error_rate_threshold=settings.BREAKER_ERROR_RATE,
+                slow_call_seconds=settings.BREAKER_SLOW_CALL_SECONDS,
+                slow_call_rate_threshold=settings.BREAKER_SLOW_CALL_RATE,
+                open_seconds=settings.BREAKER_OPEN_SECONDS,
+                half_open_probes=settings.BREAKER_HALF_OPEN_PROBES,
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def circuit_breaker_stats() -> Dict[str, Any]:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {backend: breaker.stats() for backend, breaker in breakers.items()}
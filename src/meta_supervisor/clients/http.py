@@ -0,0 +1,123 @@
+"""
+Shared pooled HTTP transport for backend clients.
+
+Each backend gets its own `httpx.AsyncClient`, and therefore its own
+connection pool, so connections are reused across calls (keep-alive, no
+repeated TCP/TLS setup) and one slow backend cannot exhaust the sockets of
+another. The transport is opened and closed by the FastAPI app lifespan.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPTransport:
+    """
+    Per-backend pooled `httpx.AsyncClient`s with shared limit settings.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 5.0,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.connect_timeout = connect_timeout
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        # Custom transport (e.g. httpx.MockTransport) replaces the network layer.
+        self._transport = transport
+        # backend -> (client, base URL, event loop the connections belong to)
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, str, Any]] = {}
+        # Replaced clients, closed with the transport: calls may still be using them.
+        self._retired: List[Tuple[httpx.AsyncClient, Any]] = []
+        self._requests: Dict[str, int] = {}
+
+    def client(self, backend: str, base_url: str) -> httpx.AsyncClient:
+        """Returns the pooled client for `backend`, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(backend)
+        # Pooled connections cannot move between event loops, so a client
+        # created on another loop (or for another URL) is replaced.
+        if entry is not None and entry[1] == base_url and entry[2] is loop:
+            self._requests[backend] += 1
+            return entry[0]
+        if entry is not None and not entry[2].is_closed():
+            # A client of a closed loop lost its connections with the loop.
+            self._retired.append((entry[0], entry[2]))
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=self.limits,
+            http2=self.http2,
+            timeout=httpx.Timeout(None, connect=self.connect_timeout),
+            transport=self._transport,
+        )
+        self._clients[backend] = (client, base_url, loop)
+        self._requests[backend] = self._requests.get(backend, 0) + 1
+        return client
+
+    async def aclose(self) -> None:
+        clients = [(client, loop) for client, _, loop in self._clients.values()] + self._retired
+        self._clients.clear()
+        self._retired = []
+        current = asyncio.get_running_loop()
+        for client, loop in clients:
+            if loop is current:
+                await client.aclose()
+            elif loop.is_running():
+                # Connections must be closed on the loop that opened them.
+                future = asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "backends": {
+                backend: {"base_url": str(client.base_url), "requests": self._requests[backend]}
+                for backend, (client, _, _) in self._clients.items()
+            },
+        }
+
+
+_transport: Optional[HTTPTransport] = None
+
+
+def get_http_transport() -> HTTPTransport:
+    """Returns the process-wide transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        _transport = HTTPTransport(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+            http2=settings.HTTP_HTTP2,
+        )
+    return _transport
+
+
+async def close_http_transport() -> None:
+    global _transport
+    if _transport is not None:
+        transport, _transport = _transport, None
+        await transport.aclose()
@@ -16,10 +16,117 @@ class Settings(BaseSettings):
 
     # LLM Configuration
     MAIN_LLM_MODEL: str = "gpt-4o-mini"
+    # USD per million tokens, for the per-request cost estimate
+    LLM_PROMPT_PRICE_PER_1M_TOKENS: float = 0.15
+    LLM_COMPLETION_PRICE_PER_1M_TOKENS: float = 0.60
+    # Adds the request's LLM/tool usage to responses as the x-llm-usage header
+    USAGE_IN_RESPONSE: bool = False
 
     # OpenAI Configuration
     OPENAI_API_KEY: str
     OPENAI_BASE_URL: str = "https://api.openai.com/v1"
 
+    # NLU Configuration
+    NLU_TOKENIZER_POOL_SIZE: int = 4
+    NLU_TOKENIZER_ACQUIRE_TIMEOUT: float = 10.0
+    NLU_EXECUTOR_KIND: str = "thread"  # "thread" or "process"
+    NLU_EXECUTOR_WORKERS: int = 4
+    NLU_EXECUTOR_MAX_QUEUE: int = 64
+    NLU_EXECUTOR_QUEUE_TIMEOUT: float = 2.0
+    NLU_BATCH_MAX_QUERIES: int = 1000
+    NLU_BATCH_CHUNK_SIZE: int = 32
+    NLU_CACHE_MAX_ENTRIES: int = 10000  # 0 disables the result cache
+    NLU_CACHE_TTL_SECONDS: float = 3600.0
+    NLU_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    # Confident single-tool queries skip the agent's tool-selection LLM turn
+    NLU_FAST_PATH_MODE: str = "summarize"  # "off", "summarize" or "direct"
+    NLU_FAST_PATH_THRESHOLD: float = 0.8
+    # Backend HTTP transport (one connection pool per backend)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_HTTP2: bool = False  # requires the optional 'h2' package
+    MARKET_ANALYSIS_TIMEOUT_SECONDS: float = 180.0
+    MARKET_ANALYSIS_MAX_RESPONSE_BYTES: int = 4 * 1024 * 1024  # streamed reports
+    TRADING_TIMEOUT_SECONDS: float = 30.0
+    # Adaptive timeouts: a multiple of the endpoint's tail latency, never above
+    # the fixed timeouts above; hedging re-sends slow idempotent calls
+    BACKEND_ADAPTIVE_TIMEOUTS: bool = True
+    BACKEND_TIMEOUT_PERCENTILE: float = 99.0
+    BACKEND_TIMEOUT_MULTIPLIER: float = 3.0
+    BACKEND_TIMEOUT_FLOOR_SECONDS: float = 5.0
+    BACKEND_TIMEOUT_MIN_SAMPLES: int = 20
+    BACKEND_HEDGING: bool = False
+    BACKEND_HEDGE_PERCENTILE: float = 95.0
+    # Retries of idempotent calls after transient errors (full-jitter backoff)
+    BACKEND_RETRY_ATTEMPTS: int = 2
+    BACKEND_RETRY_BASE_DELAY: float = 0.2
+    BACKEND_RETRY_MAX_DELAY: float = 2.0
+    # Concurrent calls per backend, and calls allowed to queue behind them; backend
+    # calls run an LLM for tens of seconds, so a queued call may wait about as long
+    BULKHEAD_MAX_CONCURRENT: int = 32
+    BULKHEAD_MAX_QUEUE: int = 64
+    BULKHEAD_QUEUE_TIMEOUT: float = 60.0
+    # AIMD limit below BULKHEAD_MAX_CONCURRENT that follows backend latency
+    ADAPTIVE_LIMIT_ENABLED: bool = True
+    ADAPTIVE_LIMIT_INITIAL: int = 8
+    ADAPTIVE_LIMIT_MIN: int = 4
+    ADAPTIVE_LIMIT_BACKOFF_RATIO: float = 0.7
+    ADAPTIVE_LIMIT_LATENCY_TOLERANCE: float = 2.0
+
+    # Circuit breakers (one per backend, rolling window of call outcomes)
+    BREAKER_WINDOW_SECONDS: float = 60.0
+    BREAKER_MIN_CALLS: int = 5
+    BREAKER_ERROR_RATE: float = 0.5
+    BREAKER_SLOW_CALL_SECONDS: float = 60.0
+    BREAKER_SLOW_CALL_RATE: float = 0.8
+    BREAKER_OPEN_SECONDS: float = 30.0
+    BREAKER_HALF_OPEN_PROBES: int = 1
+
+    # Market analysis answer cache (stale answers are served while refreshing)
+    MARKET_CACHE_TTL_SECONDS: float = 300.0
+    MARKET_CACHE_STALE_SECONDS: float = 900.0
+    MARKET_CACHE_MAX_ENTRIES: int = 1000
+
+    # On-disk cache shared by workers on one host (relative to the working directory)
+    PERSISTENT_CACHE_ENABLED: bool = True
+    PERSISTENT_CACHE_PATH: str = "data/cache.sqlite3"
+    PERSISTENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    TRADING_CACHE_TTL_SECONDS: float = 60.0
+
+    # Agent: tool calls from one LLM turn running at the same time
+    AGENT_MAX_PARALLEL_TOOLS: int = 4
+
+    # Agent tool results reused across runs (read-only calls only)
+    TOOL_CACHE_ENABLED: bool = True
+    TOOL_CACHE_MAX_ENTRIES: int = 1000
+    MARKET_ANALYSIS_TOOL_CACHE_TTL_SECONDS: float = 300.0
+    TRADING_TOOL_CACHE_TTL_SECONDS: float = 30.0
+
+    # Agent answer cache: near-duplicate read-only queries reuse a recent answer
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_THRESHOLD: float = 0.85
+    ANSWER_CACHE_TTL_SECONDS: float = 600.0
+    ANSWER_CACHE_MAX_ENTRIES: int = 2000
+
+    # Agent sessions: per-session history budget, compacted into a summary
+    SESSION_TOKEN_BUDGET: int = 2000
+    SESSION_SUMMARY_MAX_TOKENS: int = 400
+    SESSION_MAX_SESSIONS: int = 50000
+    SESSION_IDLE_TTL_SECONDS: float = 3600.0
+
+    # Build the agent, clients and NLU tokenizer at startup; /ready reports 503 until done
+    WARM_UP_ON_STARTUP: bool = True
+
+    # Routing Configuration
+    ROUTING_DEADLINE_SECONDS: float = 190.0
+    ROUTING_MIN_INTENT_CONFIDENCE: float = 0.25
+    ROUTING_MAX_FANOUT: int = 3
+
+    # Stock listing source and compiled index (empty = bundled data/ files)
+    STOCK_LISTING_PATH: str = ""
+    STOCK_INDEX_PATH: str = ""
+
 
 settings = Settings()
@@ -1,13 +1,31 @@
-from functools import lru_cache
+import threading
+from functools import lru_cache, wraps
 from langchain_openai import ChatOpenAI
 
 from .config import settings
+from .usage import usage_callback
 from .services.market_analysis_service import MarketAnalysisService
 from .services.trading_service import TradingService
 from .services.agent_service import AgentService
 
+# FastAPI resolves these sync dependencies in its threadpool, where concurrent
+# first requests could each build them; lru_cache alone does not prevent that.
+_lock = threading.RLock()
 
-@lru_cache()
+
+def _singleton(factory):
+    cached = lru_cache()(factory)
+
+    @wraps(factory)
+    def get():
+        with _lock:
+            return cached()
+
+    get.cache_clear = cached.cache_clear
+    return get
+
+
+@_singleton
 def get_llm() -> ChatOpenAI:
     return ChatOpenAI(
         model=settings.MAIN_LLM_MODEL,
@@ -16,19 +34,25 @@ def get_llm() -> ChatOpenAI:
         timeout=600,  # 3분 타임아웃 설정
         request_timeout=500,  # 개별 요청 1분 타임아웃
         max_retries=2,  # 재시도 2회
+        stream_usage=True,  # 스트리밍 응답에도 토큰 사용량 포함
+        callbacks=[usage_callback],
     )
 
 
-@lru_cache()
+@_singleton
 def get_market_analysis_service() -> MarketAnalysisService:
     return MarketAnalysisService()
 
 
-@lru_cache()
+@_singleton
 def get_trading_service() -> TradingService:
     return TradingService()
 
 
-@lru_cache()
+@_singleton
 def get_agent_service() -> AgentService:
-    return AgentService(market_service=get_market_analysis_service(), llm=get_llm())
+    return AgentService(
+        market_service=get_market_analysis_service(),
+        trading_service=get_trading_service(),
+        llm=get_llm(),
+    )
@@ -1,14 +1,110 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 
+from .clients.http import close_http_transport, get_http_transport
+from .config import settings
+from .dependencies import get_agent_service
+from .persistent_cache import close_persistent_cache, get_persistent_cache
 from .routers import api
+from .services import nlu_service
+from .services.nlu_executor import shutdown_nlu_executor
 from .simple_logging import SimpleLoggingMiddleware
 
+logger = logging.getLogger(__name__)
+
+
+async def _timed(name: str, timings: dict, warm) -> None:
+    started = time.perf_counter()
+    try:
+        await warm()
+    finally:
+        timings[f"{name}_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+
+async def _warm_up_nlu() -> None:
+    try:
+        await asyncio.to_thread(nlu_service.warm_up)
+    except Exception as e:
+        # NLU keeps working lazily; only the first requests pay the start-up cost.
+        logger.warning(f"Tokenizer warm-up failed: {e}")
+
+
+async def _warm_up_agent() -> None:
+    # Creating the LLM client takes most of a second; keep the loop free for /health.
+    agent_service = await asyncio.to_thread(get_agent_service)
+    await agent_service.get_agent()
+
+
+async def _warm_up_clients() -> None:
+    get_http_transport()
+    get_persistent_cache()
+
+
+async def warm_up(app: FastAPI) -> None:
+    """
+    Builds what the first requests would otherwise build, then marks the app
+    ready. The agent and clients must come up; the NLU may fail and fall back
+    to starting on first use.
+    """
+    started = time.perf_counter()
+    timings = {}
+    try:
+        await asyncio.gather(
+            _timed("nlu", timings, _warm_up_nlu),
+            _timed("agent", timings, _warm_up_agent),
+            _timed("clients", timings, _warm_up_clients),
+        )
+    except Exception as e:
+        logger.exception("Warm-up failed")
+        app.state.warm_up_error = str(e)
+        return
+    timings["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    app.state.warm_up = timings
+    app.state.ready = True
+    logger.info(f"Warm-up finished in {timings['total_ms']}ms: {timings}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warms up shared resources in the background; /ready reports when done.
+    """
+    app.state.ready = False
+    app.state.warm_up = None
+    app.state.warm_up_error = None
+    warm_up_task = None
+    if settings.WARM_UP_ON_STARTUP:
+        warm_up_task = asyncio.create_task(warm_up(app))
+    else:
+        app.state.ready = True
+    yield
+    app.state.ready = False
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warm_up_task
+    await close_http_transport()
+    close_persistent_cache()
+    shutdown_nlu_executor()
+
+
 app = FastAPI(
     title="Meta Supervisor",
     description="Orchestration agent for Fin-Agent services.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# Not ready until the lifespan's warm-up has run
+app.state.ready = False
+app.state.warm_up = None
+app.state.warm_up_error = None
+
 app.add_middleware(SimpleLoggingMiddleware)
 
 app.include_router(api.router, prefix="/api")
@@ -22,6 +118,20 @@ async def root():
     return {"service": "Meta Supervisor", "version": "0.1.0", "status": "running"}
 
 
+@app.get("/ready", tags=["Health Check"])
+async def readiness():
+    """
+    Readiness probe: 503 until the startup warm-up has finished.
+    """
+    if not app.state.ready:
+        status = "failed" if app.state.warm_up_error else "warming_up"
+        return JSONResponse(
+            status_code=503,
+            content={"status": status, "error": app.state.warm_up_error},
+        )
+    return {"status": "ready", "warm_up": app.state.warm_up}
+
+
 @app.get("/health", tags=["Health Check"])
 async def health_check():
     """
@@ -73,4 +183,16 @@ async def health_check():
         }
         health_data["status"] = "unhealthy"
 
+    # Open circuits mean a backend is being failed fast
+    from .clients.circuit_breaker import circuit_breaker_stats
+
+    breakers = circuit_breaker_stats()
+    open_backends = [name for name, stats in breakers.items() if stats["state"] != "closed"]
+    health_data["checks"]["circuit_breakers"] = {
+        "status": "warning" if open_backends else "healthy",
+        "backends": breakers,
+    }
+    if open_backends and health_data["status"] == "healthy":
+        health_data["status"] = "degraded"
+
     return health_data
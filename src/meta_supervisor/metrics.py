@@ -0,0 +1,89 @@
+"""
+Lightweight in-process metrics primitives shared by services.
+"""
+
+import bisect
+import threading
+from collections import deque
+from typing import Any, Dict, Optional, Sequence
+
+
+class LatencyStats:
+    """
+    Thread-safe latency aggregate.
+
+    Keeps running totals plus a bounded window of recent samples so that
+    percentiles reflect current behaviour rather than the whole process life.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._samples: deque = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Returns the q-th percentile (0-100) of the recent window in seconds."""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        def _ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        return {
+            "count": self.count,
+            "avg_ms": _ms(self.total / self.count) if self.count else None,
+            "max_ms": _ms(self.max) if self.count else None,
+            "p50_ms": _ms(self.percentile(50)),
+            "p95_ms": _ms(self.percentile(95)),
+            "p99_ms": _ms(self.percentile(99)),
+        }
+
+
+class Histogram:
+    """
+    Thread-safe fixed-bucket histogram.
+
+    `buckets` are inclusive upper bounds in ascending order; larger values
+    land in the overflow bucket.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self._lock = threading.Lock()
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            count, total = self.count, self.total
+        labels = [f"<={bound:g}" for bound in self.buckets]
+        labels.append(f">{self.buckets[-1]:g}" if self.buckets else "all")
+        return {
+            "count": count,
+            "avg": round(total / count, 3) if count else None,
+            "buckets": dict(zip(labels, counts)),
+        }
@@ -0,0 +1,206 @@
+"""
+On-disk cache shared by every worker process on the host.
+
+Backend answers are stored as JSON in a SQLite database so they survive
+restarts and deploys. The database runs in WAL mode with a busy timeout,
+which lets several uvicorn workers read and write it concurrently. Once the
+stored payload grows past `max_bytes`, expired entries and then the least
+recently used ones are deleted.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+
+class PersistentCache:
+    """
+    SQLite-backed key/value cache with per-entry TTL and a size cap.
+
+    Values must be JSON-serializable. Storage errors are logged and counted,
+    never raised, so a broken cache file only costs cache hits.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        busy_timeout: float = 5.0,
+        compact_every: int = 100,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compact_every = compact_every
+        # Wall-clock time: expiry must mean the same thing across processes.
+        self._clock = clock
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        self._writes_since_compaction = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.compactions = 0
+        self.errors = 0
+        self.compact()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = self._clock()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._conn.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Persistent cache read failed: {e}")
+            return None
+        if row is None or row[1] <= now:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = self._clock()
+        encoded = json.dumps(value, ensure_ascii=False)
+        size = len(key) + len(encoded.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at, size)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, encoded, now + ttl, now, size),
+                )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Persistent cache write failed: {e}")
+            return
+        self.writes += 1
+        self._writes_since_compaction += 1
+        if self._writes_since_compaction >= self.compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drops expired entries, then least recently used ones above the size cap."""
+        self._writes_since_compaction = 0
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM entries WHERE expires_at <= ?", (self._clock(),))
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                if total > self.max_bytes:
+                    # Trim to 90% of the cap so compaction does not run on every write.
+                    excess = total - int(self.max_bytes * 0.9)
+                    self._conn.execute(
+                        """
+                        DELETE FROM entries WHERE key IN (
+                            SELECT key FROM (
+                                SELECT key,
+                                    SUM(size) OVER (ORDER BY accessed_at, key) - size AS freed_before
+                                FROM entries
+                            ) WHERE freed_before < ?
+                        )
+                        """,
+                        (excess,),
+                    )
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.warning(f"Persistent cache compaction failed: {e}")
+            return
+        self.compactions += 1
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: float) -> None:
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            with self._lock:
+                entries, stored = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+        except sqlite3.Error:
+            entries, stored = None, None
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": stored,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "writes": self.writes,
+            "compactions": self.compactions,
+            "errors": self.errors,
+        }
+
+
+_cache: Optional[PersistentCache] = None
+_cache_unavailable = False
+_cache_lock = threading.Lock()
+
+
+def get_persistent_cache() -> Optional[PersistentCache]:
+    """Returns the process-wide cache, or None when it is disabled or unusable."""
+    global _cache, _cache_unavailable
+    if not settings.PERSISTENT_CACHE_ENABLED or _cache_unavailable:
+        return None
+    with _cache_lock:
+        if _cache is None and not _cache_unavailable:
+            path = settings.PERSISTENT_CACHE_PATH
+            try:
+                _cache = PersistentCache(path, max_bytes=settings.PERSISTENT_CACHE_MAX_BYTES)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Persistent cache disabled, cannot open {path}: {e}")
+                _cache_unavailable = True
+        return _cache
+
+
+def close_persistent_cache() -> None:
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            cache, _cache = _cache, None
+            cache.close()
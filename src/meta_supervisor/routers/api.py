@@ -1,12 +1,43 @@
-from fastapi import APIRouter, Depends
+import json
+import logging
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 
 from src.meta_supervisor import schemas
-from src.meta_supervisor.services import nlu_service, routing_service
-from src.meta_supervisor.services.agent_service import AgentService
-from src.meta_supervisor.dependencies import get_agent_service
+from src.meta_supervisor.services import (
+    market_analysis_service,
+    nlu_service,
+    routing_service,
+    trading_service,
+)
+from src.meta_supervisor.services.agent_service import AgentService, answer_cache
+from src.meta_supervisor.services.fast_path import fast_path_stats
+from src.meta_supervisor.services.session_store import get_session_store
+from src.meta_supervisor.services.nlu_executor import (
+    NLUOverloadedError,
+    get_nlu_executor,
+)
+from src.meta_supervisor.services.tokenizer_engine import get_tokenizer_engine
+from src.meta_supervisor.dependencies import (
+    get_agent_service,
+    get_market_analysis_service,
+)
+from src.meta_supervisor.clients.adaptive_limit import adaptive_limit_stats
+from src.meta_supervisor.clients.backend import ResponseTooLargeError, backend_stats
+from src.meta_supervisor.clients.bulkhead import BulkheadFullError, bulkhead_stats
+from src.meta_supervisor.clients.circuit_breaker import CircuitOpenError
+from src.meta_supervisor.clients.http import get_http_transport
+from src.meta_supervisor.config import settings
+from src.meta_supervisor.persistent_cache import get_persistent_cache
+from src.meta_supervisor.tools.memo import tool_memo_stats
+from src.meta_supervisor.usage import usage_stats
+from src.meta_supervisor.tools.run_context import tool_timing_stats
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 
 @router.post("/process", response_model=schemas.CommonResponse, tags=["Supervisor"])
 async def process_request(request: schemas.UserRequest):
@@ -15,12 +46,56 @@ async def process_request(request: schemas.UserRequest):
     """
     try:
         # 1. Analyze intent and entities
-        analysis_result = nlu_service.analyze(request.query)
+        analysis_result = await nlu_service.analyze_async(request.query)
 
         # 2. Route the request to the appropriate service
-        final_result = await routing_service.route_request(analysis_result)
+        final_result = await routing_service.route_request(
+            analysis_result, query=request.query
+        )
 
         return schemas.CommonResponse(data=final_result)
+    except NLUOverloadedError as e:
+        return schemas.CommonResponse(
+            success=False,
+            data=None,
+            error_code="SERVICE_OVERLOADED",
+            error_message=str(e),
+        )
+    except Exception as e:
+        return schemas.CommonResponse(
+            success=False,
+            data=None,
+            error_code="INTERNAL_SERVER_ERROR",
+            error_message=str(e),
+        )
+
+
+@router.post(
+    "/analyze/batch",
+    response_model=schemas.CommonResponse[list[schemas.IntentAnalysisResult]],
+    tags=["Supervisor"],
+)
+async def analyze_batch(request: schemas.BatchAnalysisRequest):
+    """
+    Analyzes intents and entities of many queries in one call, preserving input order.
+    """
+    if len(request.queries) > settings.NLU_BATCH_MAX_QUERIES:
+        return schemas.CommonResponse(
+            success=False,
+            data=None,
+            error_code="BATCH_TOO_LARGE",
+            error_message=f"At most {settings.NLU_BATCH_MAX_QUERIES} queries are allowed per batch.",
+        )
+    try:
+        results = await nlu_service.analyze_batch_async(request.queries)
+        return schemas.CommonResponse(data=results)
+    except NLUOverloadedError as e:
+        return schemas.CommonResponse(
+            success=False,
+            data=None,
+            error_code="SERVICE_OVERLOADED",
+            error_message=str(e),
+        )
     except Exception as e:
         return schemas.CommonResponse(
             success=False,
@@ -39,7 +114,7 @@ async def query(
     Queries using the agent service with integrated tools and services.
     """
     try:
-        result = await agent_service.process_query(request.query)
+        result = await agent_service.process_query(request.query, session_id=request.session_id)
         
         # Safe string extraction
         raw_result = result.get("result")
@@ -62,6 +137,85 @@ async def query(
         )
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _stream_error_code(e: Exception) -> str:
+    if isinstance(e, ResponseTooLargeError):
+        return "RESPONSE_TOO_LARGE"
+    if isinstance(e, (CircuitOpenError, BulkheadFullError)):
+        return "SERVICE_UNAVAILABLE"
+    return "INTERNAL_SERVER_ERROR"
+
+
+def _event_stream_response(events, http_request: Request) -> StreamingResponse:
+    """
+    Sends {"event", "data"} dicts as server-sent events. A failure becomes a
+    final error event; a client disconnect closes `events`, cancelling the work.
+    """
+
+    async def event_stream():
+        try:
+            async for event in events:
+                if await http_request.is_disconnected():
+                    logger.info("Client disconnected; cancelling stream")
+                    break
+                yield _sse(event["event"], event["data"])
+        except Exception as e:
+            yield _sse(
+                "error", {"error_code": _stream_error_code(e), "error_message": str(e)}
+            )
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/query/stream", tags=["Supervisor"])
+async def query_stream(
+    request: schemas.UserRequest,
+    http_request: Request,
+    agent_service: AgentService = Depends(get_agent_service),
+):
+    """
+    Streams the agent answer as server-sent events: tool_start, tool_end and
+    token events while the agent runs, then done (or error). Disconnecting
+    cancels the agent run.
+    """
+    return _event_stream_response(
+        agent_service.stream_query(request.query, session_id=request.session_id), http_request
+    )
+
+
+@router.post("/market-analysis/stream", tags=["Supervisor"])
+async def market_analysis_stream(
+    request: schemas.UserRequest,
+    http_request: Request,
+    service: market_analysis_service.MarketAnalysisService = Depends(
+        get_market_analysis_service
+    ),
+):
+    """
+    Proxies the market analysis backend's answer as server-sent events: delta
+    events with text as it arrives, then done (or error). Disconnecting closes
+    the backend stream.
+    """
+
+    async def events():
+        length = 0
+        async for text in service.stream_market(request.query):
+            length += len(text)
+            yield {"event": "delta", "data": {"content": text}}
+        yield {"event": "done", "data": {"query": request.query, "length": length}}
+
+    return _event_stream_response(events(), http_request)
+
+
 @router.post("/agent", response_model=schemas.CommonResponse, tags=["Supervisor"])
 async def agent_query(
     request: schemas.UserRequest,
@@ -80,3 +234,34 @@ async def agent_query(
             error_code="INTERNAL_SERVER_ERROR",
             error_message=str(e),
         )
+
+
+@router.get("/stats", response_model=schemas.CommonResponse, tags=["Monitoring"])
+async def stats():
+    """
+    Runtime statistics for sizing pools and caches.
+    """
+    persistent_cache = get_persistent_cache()
+    return schemas.CommonResponse(
+        data={
+            "tokenizer": get_tokenizer_engine().stats(),
+            "nlu_executor": get_nlu_executor().stats(),
+            "nlu_cache": nlu_service.result_cache.stats(),
+            "http_transport": get_http_transport().stats(),
+            "backend_latency": backend_stats(),
+            "bulkheads": bulkhead_stats(),
+            "adaptive_limits": adaptive_limit_stats(),
+            "market_analysis_cache": market_analysis_service.response_cache.stats(),
+            "persistent_cache": persistent_cache.stats() if persistent_cache else None,
+            "agent_tools": tool_timing_stats.stats(),
+            "tool_cache": tool_memo_stats(),
+            "answer_cache": answer_cache.stats(),
+            "nlu_fast_path": fast_path_stats.stats(),
+            "llm_usage": usage_stats.stats(),
+            "sessions": get_session_store().stats(),
+            "upstream_coalescing": {
+                "market_analysis": market_analysis_service.upstream_flights.stats(),
+                "trading": trading_service.upstream_flights.stats(),
+            },
+        }
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, TypeVar, Generic
+from typing import Optional, Dict, Any, List, TypeVar, Generic
 
 T = TypeVar("T")
 
@@ -27,6 +27,23 @@ class UserRequest(BaseModel):
     session_id: Optional[str] = None
 
 
+class BatchAnalysisRequest(BaseModel):
+    """
+    Represents a batch of natural language queries to analyze in one call.
+    """
+
+    queries: List[str]
+
+
+class RankedIntent(BaseModel):
+    """
+    A candidate intent with its share of the keyword score.
+    """
+
+    intent: str
+    confidence: float
+
+
 class IntentAnalysisResult(BaseModel):
     """
     Represents the result of NLU intent and entity analysis.
@@ -35,6 +52,7 @@ class IntentAnalysisResult(BaseModel):
     intent: str
     entities: Dict[str, Any]
     confidence: Optional[float] = None
+    intents: List[RankedIntent] = []
 
 
 # Placeholder models for backend services
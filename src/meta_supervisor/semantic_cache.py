@@ -0,0 +1,250 @@
+"""
+Similarity-keyed answer cache.
+
+Queries are embedded offline as sparse vectors: hashed character n-grams of
+the query plus one feature per concept phrase it contains (so that
+paraphrases such as "전망" / "앞으로 어떻게 될까" meet in one feature). A lookup
+returns the most similar live entry when its cosine similarity reaches the
+threshold, and so does that of their subjects (the n-gram features alone):
+sharing "전망" and "어때" does not make "금 전망 어때?" a match for
+"유가 전망 어때?". Candidates come from an inverted index over the features,
+so a lookup only scores entries sharing at least one feature with the query.
+"""
+
+import math
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Set, Tuple
+
+# Feature -> weight. Negative features are concepts, the others the subject.
+SparseVector = Dict[int, float]
+
+_NON_WORD = re.compile(r"[^\w]+")
+# Upper bounds of the best-match similarity histogram.
+SIMILARITY_BUCKETS = (0.5, 0.7, 0.8, 0.9, 0.95, 1.0)
+
+
+class QueryVectorizer:
+    """
+    Hashed character n-gram vectors with concept features.
+
+    `concepts` maps a concept name to the phrases expressing it; matched
+    phrases are removed from the text and replaced by the concept feature
+    with weight `concept_weight`. `fillers` are dropped entirely, and
+    `suffixes` (e.g. Korean particles) are stripped from the end of each
+    remaining word so "삼성전자는" and "삼성전자" share all their n-grams.
+    """
+
+    def __init__(
+        self,
+        concepts: Optional[Mapping[str, Sequence[str]]] = None,
+        fillers: Sequence[str] = (),
+        suffixes: Sequence[str] = (),
+        ngram_sizes: Tuple[int, ...] = (2, 3),
+        concept_weight: float = 2.0,
+        dims: int = 1 << 20,
+    ):
+        self.ngram_sizes = ngram_sizes
+        self.concept_weight = concept_weight
+        self.dims = dims
+        # Longest phrases first so "어떻게 될까" wins over "어떻게".
+        phrases = [
+            (phrase.lower(), concept)
+            for concept, concept_phrases in (concepts or {}).items()
+            for phrase in concept_phrases
+        ]
+        phrases += [(filler.lower(), None) for filler in fillers]
+        phrases.sort(key=lambda item: len(item[0]), reverse=True)
+        self._phrases = phrases
+        self._suffixes = sorted((suffix.lower() for suffix in suffixes), key=len, reverse=True)
+
+    def _feature(self, token: str) -> int:
+        return zlib.crc32(token.encode("utf-8")) % self.dims
+
+    def _concept_feature(self, concept: str) -> int:
+        return -1 - self._feature(concept)
+
+    def _strip_suffix(self, word: str) -> str:
+        for suffix in self._suffixes:
+            # Keep at least two characters of the stem.
+            if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+                return word[: -len(suffix)]
+        return word
+
+    def __call__(self, text: str) -> SparseVector:
+        text = text.lower()
+        words = set(_NON_WORD.split(text))
+        vector: SparseVector = {}
+        for phrase, concept in self._phrases:
+            if phrase in text:
+                text = text.replace(phrase, " ")
+                if concept is not None:
+                    vector[self._concept_feature(concept)] = self.concept_weight
+        # Single characters left over from a removed phrase ("전망이" -> "이") are
+        # noise, but a one-character word of the query ("금", "은") is its subject.
+        compact = "".join(
+            self._strip_suffix(word)
+            for word in _NON_WORD.split(text)
+            if len(word) > 1 or (word and word in words)
+        )
+        for n in self.ngram_sizes:
+            for i in range(len(compact) - n + 1):
+                feature = self._feature(compact[i : i + n])
+                vector[feature] = vector.get(feature, 0.0) + 1.0
+        if compact and len(compact) < min(self.ngram_sizes):
+            vector[self._feature(compact)] = 1.0
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {feature: weight / norm for feature, weight in vector.items()} if norm else {}
+
+
+class SemanticCache:
+    """
+    Bounded TTL cache whose lookups match the most similar stored query.
+
+    Entries are only compared within the same `scope` (e.g. the set of
+    companies a query mentions), so "삼성전자 전망" can never answer
+    "SK하이닉스 전망" however similar the wording. The similarity of an
+    entry is the lower of its whole-vector and subject similarities.
+    """
+
+    def __init__(
+        self,
+        vectorize: Callable[[str], SparseVector],
+        threshold: float = 0.85,
+        max_entries: int = 1000,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.vectorize = vectorize
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # id -> (query, scope, vector, value, expires_at), in LRU order
+        self._entries: "OrderedDict[int, Tuple[str, Hashable, SparseVector, Any, float]]" = OrderedDict()
+        self._postings: Dict[int, Set[int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._histogram = [0] * len(SIMILARITY_BUCKETS)
+        self._hit_similarity_total = 0.0
+
+    def get(self, query: str, scope: Hashable = None) -> Optional[Tuple[Any, float, str]]:
+        """Returns (value, similarity, matched query) of the best match, or None."""
+        vector = self.vectorize(query)
+        now = self._clock()
+        with self._lock:
+            best_id, best_similarity = None, 0.0
+            for entry_id in self._candidates(vector):
+                entry_query, entry_scope, entry_vector, _, expires_at = self._entries[entry_id]
+                if expires_at <= now:
+                    self._remove(entry_id)
+                    self.expirations += 1
+                    continue
+                if entry_scope != scope:
+                    continue
+                similarity = min(
+                    _dot(vector, entry_vector), _subject_similarity(vector, entry_vector)
+                )
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+            if best_id is not None:
+                self._observe(best_similarity)
+            if best_id is None or best_similarity < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._hit_similarity_total += best_similarity
+            self._entries.move_to_end(best_id)
+            entry_query, _, _, value, _ = self._entries[best_id]
+            return value, round(best_similarity, 4), entry_query
+
+    def set(self, query: str, value: Any, scope: Hashable = None) -> None:
+        if self.max_entries <= 0:
+            return
+        vector = self.vectorize(query)
+        if not vector:
+            return
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (query, scope, vector, value, self._clock() + self.ttl)
+            for feature in vector:
+                self._postings.setdefault(feature, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _candidates(self, vector: SparseVector) -> List[int]:
+        candidates: Set[int] = set()
+        for feature in vector:
+            candidates.update(self._postings.get(feature, ()))
+        return list(candidates)
+
+    def _remove(self, entry_id: int) -> None:
+        _, _, vector, _, _ = self._entries.pop(entry_id)
+        for feature in vector:
+            postings = self._postings.get(feature)
+            if postings is not None:
+                postings.discard(entry_id)
+                if not postings:
+                    del self._postings[feature]
+
+    def _observe(self, similarity: float) -> None:
+        for index, upper in enumerate(SIMILARITY_BUCKETS):
+            if similarity <= upper + 1e-9:
+                self._histogram[index] += 1
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            lower = (0.0,) + SIMILARITY_BUCKETS[:-1]
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "avg_hit_similarity": (
+                    round(self._hit_similarity_total / self.hits, 4) if self.hits else None
+                ),
+                # Best-match similarity of lookups that had any candidate.
+                "best_similarity_histogram": {
+                    f"{low:.2f}-{high:.2f}": count
+                    for low, high, count in zip(lower, SIMILARITY_BUCKETS, self._histogram)
+                },
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def _dot(a: SparseVector, b: SparseVector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(feature, 0.0) for feature, weight in a.items())
+
+
+def _subject_similarity(a: SparseVector, b: SparseVector) -> float:
+    """Cosine similarity of the non-concept features; 1.0 when neither has any."""
+    a = {feature: weight for feature, weight in a.items() if feature >= 0}
+    b = {feature: weight for feature, weight in b.items() if feature >= 0}
+    if not a and not b:
+        return 1.0
+    norms = math.sqrt(_dot(a, a) * _dot(b, b))
+    return _dot(a, b) / norms if norms else 0.0
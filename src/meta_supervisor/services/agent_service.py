@@ -1,13 +1,97 @@
-from typing import Any, Dict
+import asyncio
+import logging
+import re
+import time
+from typing import (
+    Any, AsyncIterator, Awaitable, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+)
 from langgraph.prebuilt import create_react_agent
 from langchain_openai import ChatOpenAI
 
-from src.meta_supervisor.services.trading_service import TradingService
+from src.meta_supervisor import schemas
+from src.meta_supervisor.config import settings
+from src.meta_supervisor.semantic_cache import QueryVectorizer, SemanticCache
+from src.meta_supervisor.services import nlu_service
+from src.meta_supervisor.services.fast_path import (
+    FAST_PATH_MODES,
+    SUMMARIZE_PROMPT,
+    FastRoute,
+    choose_route,
+    fast_path_stats,
+    tool_output_text,
+)
+from src.meta_supervisor.services.session_store import SessionStore, Turn, get_session_store
+from src.meta_supervisor.services.stock_index import get_stock_index
+from src.meta_supervisor.services.trading_service import (
+    TradingService,
+    is_account_message,
+    is_read_only_message,
+)
+from src.meta_supervisor.tools.base_tool import BaseAPITool
 from src.meta_supervisor.tools.trading_tool import TradingTool
 
 from src.meta_supervisor.services.market_analysis_service import MarketAnalysisService
 from src.meta_supervisor.tools.market_analysis_tool import MarketAnalysisTool
+from src.meta_supervisor.tools.run_context import tool_run_context
 
+logger = logging.getLogger(__name__)
+
+# Phrases asking for the same thing in different words; each group becomes
+# one feature of the answer cache's query vectors.
+ANSWER_CACHE_CONCEPTS = {
+    "outlook": ("전망", "앞으로", "향후", "어떻게 될까", "어떻게 될", "예상", "예측", "outlook", "forecast"),
+    "price": ("주가", "가격", "시세", "얼마", "price"),
+    "analysis": ("분석", "리포트", "보고서", "analysis", "analyze"),
+    "fundamental": ("기본 분석", "펀더멘털", "실적", "재무", "매출", "영업이익", "fundamental"),
+    "technical": ("차트", "기술적", "지표", "rsi", "macd", "볼린저", "이동평균", "chart"),
+    "news": ("뉴스", "소식", "이슈", "news"),
+    "sector": ("섹터", "업종", "산업", "sector"),
+}
+ANSWER_CACHE_FILLERS = (
+    "어때", "어떤가요", "어떨까", "어떻습니까", "알려줘", "알려 줘", "알려주세요", "해줘", "해 줘",
+    "해주세요", "해 주세요", "주세요", "궁금해", "궁금합니다", "좀", "요즘", "지금", "에 대해", "대해서", "대해",
+    "please", "tell me", "what is", "what's", "how is",
+)
+# Particles and endings stripped from the end of each word.
+ANSWER_CACHE_SUFFIXES = ("에 대한", "은", "는", "을", "를", "의", "요", "까요", "나요", "인가요", "인가")
+# One side of each pair reverses the question ("금리 인상" vs "금리 인하") while
+# barely changing its n-grams, so a cached answer must mention the same ones.
+ANSWER_CACHE_POLAR_TERMS = (
+    "인상", "인하", "상승", "하락", "강세", "약세", "호재", "악재", "증가", "감소", "확대",
+    "축소", "급등", "급락", "흑자", "적자", "상향", "하향", "매파", "비둘기", "긍정", "부정",
+    "bullish", "bearish",
+)
+# Years, quarters and amounts ("2023년 4분기") change the answer the same way.
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+answer_cache = SemanticCache(
+    QueryVectorizer(ANSWER_CACHE_CONCEPTS, ANSWER_CACHE_FILLERS, ANSWER_CACHE_SUFFIXES),
+    threshold=settings.ANSWER_CACHE_THRESHOLD,
+    max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+    ttl=settings.ANSWER_CACHE_TTL_SECONDS,
+)
+
+
+def answer_cache_scope(query: str) -> Optional[FrozenSet[str]]:
+    """
+    Stock codes, numbers and polar terms (see ANSWER_CACHE_POLAR_TERMS) the
+    query mentions, which a cached answer must match exactly, or None when
+    the query's answer must not be cached at all.
+    """
+    if not settings.ANSWER_CACHE_ENABLED or not is_read_only_message(query):
+        return None
+    if is_account_message(query):
+        return None
+    lowered = query.lower()
+    try:
+        codes = {mention.code for mention in get_stock_index().find_all(query)}
+    except Exception as e:
+        # Without the companies a paraphrase could return another company's answer.
+        logger.warning(f"Answer cache skipped, stock index unavailable: {e}")
+        return None
+    numbers = {f"number:{number}" for number in _NUMBER.findall(lowered) if number not in codes}
+    terms = {f"term:{term}" for term in ANSWER_CACHE_POLAR_TERMS if term in lowered}
+    return frozenset(codes | numbers | terms)
 
 
 class AgentService:
@@ -16,20 +100,41 @@ class AgentService:
         market_service: MarketAnalysisService = None,
         trading_service: TradingService = None,  # 외부 API 미구현으로 주석처리
         llm: ChatOpenAI = None,
+        session_store: SessionStore = None,
+        analyze_intent: Callable[[str], Awaitable[schemas.IntentAnalysisResult]] = None,
     ):
         self.market_service = market_service or MarketAnalysisService()
         self.trading_service = trading_service or TradingService()  # 외부 API 미구현으로 주석처리
         self.llm = llm
+        self.sessions = session_store or get_session_store()
+        self.analyze_intent = analyze_intent or nlu_service.analyze_async
         self._agent = None
+        self._agent_lock = asyncio.Lock()
+        self._tools: Optional[Dict[str, BaseAPITool]] = None
+        # Keeps background compactions referenced until they finish.
+        self._compactions: Set[asyncio.Task] = set()
 
-    async def get_agent(self):
-        if self._agent is None:
+    def get_tools(self) -> Dict[str, BaseAPITool]:
+        if self._tools is None:
             tools = [
-                MarketAnalysisTool(),
-                TradingTool()  
+                MarketAnalysisTool(service=self.market_service),
+                TradingTool(service=self.trading_service),
             ]
-            
-            system_prompt = """You are a professional financial analysis and trading assistant that coordinates between market analysis and trading execution capabilities.
+            self._tools = {tool.name: tool for tool in tools}
+        return self._tools
+
+    async def get_agent(self):
+        if self._agent is None:
+            # Concurrent first requests would otherwise each build the graph.
+            async with self._agent_lock:
+                if self._agent is None:
+                    self._agent = self._build_agent()
+        return self._agent
+
+    def _build_agent(self):
+        tools = list(self.get_tools().values())
+        
+        system_prompt = """You are a professional financial analysis and trading assistant that coordinates between market analysis and trading execution capabilities.
 
 **Your Role:**
 - Provide accurate, data-driven financial analysis and market insights
@@ -59,8 +164,8 @@ class AgentService:
 - Examples: "삼성전자 차트 분석", "RSI 지표 확인", "매수 시점 분석", "포트폴리오 리밸런싱"
 
 **Workflow Integration:**
-1. **Analysis First**: Always gather market context using market_analysis tool
-2. **Trading Decision**: Use trading tool for technical analysis and execution
+1. **Gather in Parallel**: When a question needs both market context and technical analysis, call market_analysis and trading in the same turn - tool calls from one turn run concurrently
+2. **Trading Decision**: Only wait for the market analysis result before calling trading when the trading request depends on it (e.g., executing an order based on the analysis)
 3. **Synthesis**: Combine both analyses for comprehensive recommendations
 4. **Risk Assessment**: Evaluate both fundamental and technical risks
 
@@ -94,16 +199,241 @@ class AgentService:
 - Coordinate seamlessly between analysis and trading perspectives
 
 Always prioritize accuracy, transparency, and user education while ensuring trading recommendations are well-informed by comprehensive market analysis."""
-            
-            self._agent = create_react_agent(
-                model=self.llm,
-                tools=tools,
-                prompt=system_prompt,
-            )
-        return self._agent
+        
+        return create_react_agent(
+            model=self.llm,
+            tools=tools,
+            prompt=system_prompt,
+        )
+
+    async def process_query(self, query: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process user query directly with agent. With a session_id the agent
+        also sees that session's summary and recent turns, and the turn is
+        recorded. A read-only query without history that is close enough to
+        one answered within the cache TTL returns that answer instead, and
+        one the NLU routes to a single tool with confidence takes the fast
+        path (see fast_path).
+        """
+        messages = self._conversation(query, session_id)
+        # Follow-ups depend on the conversation, not just their own wording.
+        scope = answer_cache_scope(query) if len(messages) == 1 else None
+        cached = answer_cache.get(query, scope) if scope is not None else None
+        if cached is not None:
+            answer, similarity, matched_query = cached
+            self._remember(session_id, query, answer)
+            return {
+                "intent": "agent_response",
+                "result": answer,
+                "cached": True,
+                "similarity": similarity,
+                "matched_query": matched_query,
+            }
+
+        started = time.perf_counter()
+        route = await self._fast_route(query, messages)
+        if route is not None:
+            with tool_run_context(settings.AGENT_MAX_PARALLEL_TOOLS) as tools:
+                tool_output = await self.get_tools()[route.tool].ainvoke(route.args)
+            if settings.NLU_FAST_PATH_MODE == "direct":
+                answer = tool_output_text(tool_output)
+            else:
+                prompt = self._write_up_prompt(query, route, tool_output)
+                answer = (await self.llm.ainvoke(prompt)).content
+            fast_path_stats.record_fast(route, time.perf_counter() - started)
+            if answer:
+                self._remember(session_id, query, answer)
+                if scope is not None:
+                    answer_cache.set(query, answer, scope)
+            return {
+                "intent": "agent_response",
+                "result": answer,
+                "fast_path": route._asdict(),
+                "tool_timing": tools.timing(),
+            }
+
+        agent = await self.get_agent()
+        with tool_run_context(settings.AGENT_MAX_PARALLEL_TOOLS) as tools:
+            result = await agent.ainvoke({"messages": messages})
+        fast_path_stats.record_agent(time.perf_counter() - started)
+        output = result.get("messages") if isinstance(result, dict) else None
+        answer = getattr(output[-1], "content", None) if output else None
+        if isinstance(answer, str) and answer:
+            self._remember(session_id, query, answer)
+            if scope is not None:
+                answer_cache.set(query, answer, scope)
+        return {"intent": "agent_response", "result": result, "tool_timing": tools.timing()}
+
+    async def stream_query(
+        self, query: str, session_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Runs the agent like process_query but yields progress as it happens:
+        tool_start / tool_end around each tool call, token for every chunk of
+        LLM output, then done with the final answer. Closing the iterator
+        cancels the agent run. A cached answer (see process_query) is sent as
+        a single done event; the fast path sends tool_start / tool_end for its
+        tool call and then the write-up's tokens.
+        """
+        messages = self._conversation(query, session_id)
+        scope = answer_cache_scope(query) if len(messages) == 1 else None
+        cached = answer_cache.get(query, scope) if scope is not None else None
+        if cached is not None:
+            answer, similarity, matched_query = cached
+            self._remember(session_id, query, answer)
+            yield {
+                "event": "done",
+                "data": {
+                    "answer": answer,
+                    "cached": True,
+                    "similarity": similarity,
+                    "matched_query": matched_query,
+                },
+            }
+            return
+
+        started = time.perf_counter()
+        route = await self._fast_route(query, messages)
+        if route is not None:
+            async for event in self._stream_fast_path(query, route, session_id, scope, started):
+                yield event
+            return
 
-    async def process_query(self, query: str) -> Dict[str, Any]:
-        """Process user query directly with agent."""
         agent = await self.get_agent()
-        result = await agent.ainvoke({"messages": [("user", query)]})
-        return {"intent": "agent_response", "result": result}
\ No newline at end of file
+        answer: list = []
+        events = agent.astream_events({"messages": messages}, version="v2")
+        with tool_run_context(settings.AGENT_MAX_PARALLEL_TOOLS) as tools:
+            try:
+                async for event in events:
+                    kind = event["event"]
+                    if kind == "on_chat_model_start":
+                        # Only the last model turn (after all tool calls) is the answer.
+                        answer = []
+                    elif kind == "on_chat_model_stream":
+                        content = event["data"]["chunk"].content
+                        if isinstance(content, str) and content:
+                            answer.append(content)
+                            yield {"event": "token", "data": {"content": content}}
+                    elif kind == "on_tool_start":
+                        yield {
+                            "event": "tool_start",
+                            "data": {"tool": event["name"], "input": event["data"].get("input")},
+                        }
+                    elif kind == "on_tool_end":
+                        output = event["data"].get("output")
+                        yield {
+                            "event": "tool_end",
+                            "data": {
+                                "tool": event["name"],
+                                "output": getattr(output, "content", output),
+                            },
+                        }
+            finally:
+                await events.aclose()
+        fast_path_stats.record_agent(time.perf_counter() - started)
+        final_answer = "".join(answer)
+        if final_answer:
+            self._remember(session_id, query, final_answer)
+            if scope is not None:
+                answer_cache.set(query, final_answer, scope)
+        yield {"event": "done", "data": {"answer": final_answer, "tool_timing": tools.timing()}}
+
+    async def _stream_fast_path(
+        self,
+        query: str,
+        route: FastRoute,
+        session_id: Optional[str],
+        scope: Optional[FrozenSet[str]],
+        started: float,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        yield {"event": "tool_start", "data": {"tool": route.tool, "input": route.args}}
+        with tool_run_context(settings.AGENT_MAX_PARALLEL_TOOLS) as tools:
+            tool_output = await self.get_tools()[route.tool].ainvoke(route.args)
+        yield {"event": "tool_end", "data": {"tool": route.tool, "output": tool_output}}
+        if settings.NLU_FAST_PATH_MODE == "direct":
+            answer = tool_output_text(tool_output)
+        else:
+            chunks = []
+            async for chunk in self.llm.astream(self._write_up_prompt(query, route, tool_output)):
+                if isinstance(chunk.content, str) and chunk.content:
+                    chunks.append(chunk.content)
+                    yield {"event": "token", "data": {"content": chunk.content}}
+            answer = "".join(chunks)
+        fast_path_stats.record_fast(route, time.perf_counter() - started)
+        if answer:
+            self._remember(session_id, query, answer)
+            if scope is not None:
+                answer_cache.set(query, answer, scope)
+        yield {
+            "event": "done",
+            "data": {
+                "answer": answer,
+                "fast_path": route._asdict(),
+                "tool_timing": tools.timing(),
+            },
+        }
+
+    async def _fast_route(self, query: str, messages: List[Tuple[str, str]]) -> Optional[FastRoute]:
+        """The single tool call that answers the query, or None when it needs the agent."""
+        if settings.NLU_FAST_PATH_MODE not in FAST_PATH_MODES:
+            return None
+        if len(messages) > 1:
+            # Follow-ups may refer to earlier turns the NLU cannot see.
+            fast_path_stats.record_skip("history")
+            return None
+        try:
+            analysis = await self.analyze_intent(query)
+        except Exception as e:
+            logger.warning(f"NLU unavailable, using the full agent: {e}")
+            fast_path_stats.record_skip("nlu_error")
+            return None
+        route, reason = choose_route(query, analysis, settings.NLU_FAST_PATH_THRESHOLD)
+        if route is None:
+            fast_path_stats.record_skip(reason)
+        return route
+
+    def _write_up_prompt(
+        self, query: str, route: FastRoute, tool_output: Any
+    ) -> List[Tuple[str, str]]:
+        return [
+            ("system", SUMMARIZE_PROMPT),
+            (
+                "user",
+                f"Question: {query}\n\nResult of the {route.tool} tool:\n"
+                f"{tool_output_text(tool_output)}",
+            ),
+        ]
+
+    def _conversation(self, query: str, session_id: Optional[str]) -> List[Tuple[str, str]]:
+        """The agent's input messages: session summary, recent turns, then the query."""
+        messages: List[Tuple[str, str]] = []
+        if session_id:
+            summary, turns = self.sessions.history(session_id)
+            if summary:
+                messages.append(("system", f"Summary of the earlier conversation:\n{summary}"))
+            for user_message, assistant_message in turns:
+                messages += [("user", user_message), ("assistant", assistant_message)]
+        messages.append(("user", query))
+        return messages
+
+    def _remember(self, session_id: Optional[str], query: str, answer: str) -> None:
+        if not session_id or not self.sessions.append(session_id, query, answer):
+            return
+        # Compaction needs an LLM call; the answer should not wait for it.
+        task = asyncio.ensure_future(self.sessions.compact(session_id, self._summarize))
+        self._compactions.add(task)
+        task.add_done_callback(self._compactions.discard)
+
+    async def _summarize(self, summary: str, turns: List[Turn]) -> str:
+        transcript = "\n".join(f"User: {user}\nAssistant: {answer}" for user, answer in turns)
+        response = await self.llm.ainvoke([
+            (
+                "system",
+                "Condense this conversation between a user and a financial assistant into a "
+                "short summary for the assistant's own reference. Keep the companies, figures, "
+                "decisions and user preferences that later questions may refer to. Reply with "
+                "the summary only, in the language of the conversation.",
+            ),
+            ("user", f"Earlier summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"),
+        ])
+        return response.content
@@ -0,0 +1,133 @@
+"""
+NLU fast path for the supervisor agent.
+
+The agent spends one LLM turn picking a tool and another writing up its
+result. When the NLU analysis of a query is confident, names a stock and a single
+read-only tool call can answer it, the agent skips the first turn: the tool is called
+directly and its output is either returned as is ("direct" mode) or written
+up by one LLM call ("summarize" mode). Everything else, every query that
+could place an order and every instruction to the trading tool goes
+through the full agent.
+"""
+
+import json
+import threading
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from .. import schemas
+from ..metrics import LatencyStats
+from .trading_service import is_instruction, is_read_only_message
+
+FAST_PATH_MODES = ("summarize", "direct")
+# strategy_execution, strategy_creation and backtest always need the agent.
+FAST_PATH_INTENTS = ("market_analysis",)
+# Answered by the trading tool's technical analysis rather than market analysis.
+TECHNICAL_KEYWORDS = (
+    "차트", "기술적", "지표", "rsi", "macd", "볼린저", "이동평균", "스토캐스틱", "캔들",
+    "지지선", "저항선",
+)
+# Asked together with technical keywords, these need both tools.
+FUNDAMENTAL_KEYWORDS = (
+    "전망", "실적", "재무", "펀더멘털", "뉴스", "섹터", "업종", "산업", "기본 분석",
+)
+
+SUMMARIZE_PROMPT = (
+    "You are a professional financial assistant. Answer the user's question using only "
+    "the tool result provided. Be concise and structured, say so when the result does "
+    "not cover the question, and end with a one-line note that this is not financial "
+    "advice. Answer in the language of the question."
+)
+
+
+class FastRoute(NamedTuple):
+    tool: str
+    args: Dict[str, str]
+    intent: str
+    confidence: float
+
+
+def choose_route(
+    query: str, analysis: schemas.IntentAnalysisResult, threshold: float
+) -> Tuple[Optional[FastRoute], str]:
+    """Returns (route, tool name), or (None, why the query needs the agent)."""
+    confidence = analysis.confidence or 0.0
+    if analysis.intent not in FAST_PATH_INTENTS:
+        return None, "intent"
+    if confidence < threshold:
+        return None, "low_confidence"
+    # Confidence is the intent's share of the keyword score, so one stray keyword
+    # scores 1.0; without a stock to look up the question is the agent's to read.
+    if not analysis.entities.get("stock_code"):
+        return None, "no_entity"
+    if not is_read_only_message(query):
+        return None, "not_read_only"
+    lowered = query.lower()
+    technical = any(keyword in lowered for keyword in TECHNICAL_KEYWORDS)
+    if technical and any(keyword in lowered for keyword in FUNDAMENTAL_KEYWORDS):
+        return None, "multi_tool"
+    if technical:
+        # The trading tool can place orders and the fast path has no agent prompt
+        # in front of it, so only plain read-only questions go to it directly.
+        if is_instruction(query):
+            return None, "instruction"
+        return FastRoute("trading", {"message": query}, analysis.intent, confidence), "trading"
+    route = FastRoute("market_analysis", {"query": query}, analysis.intent, confidence)
+    return route, "market_analysis"
+
+
+def tool_output_text(output: Any) -> str:
+    """The text a tool result carries, for the answer or the summarizer."""
+    if isinstance(output, dict):
+        for key in ("answer", "content"):
+            if isinstance(output.get(key), str):
+                return output[key]
+        return json.dumps(output, ensure_ascii=False, default=str)
+    return str(output)
+
+
+class FastPathStats:
+    """Share of agent queries answered by the fast path, and the time it saved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fast = LatencyStats()
+        self.agent = LatencyStats()
+        self.routed: Dict[str, int] = {}
+        self.skipped: Dict[str, int] = {}
+
+    def record_fast(self, route: FastRoute, elapsed: float) -> None:
+        self.fast.observe(elapsed)
+        with self._lock:
+            self.routed[route.tool] = self.routed.get(route.tool, 0) + 1
+
+    def record_agent(self, elapsed: float) -> None:
+        self.agent.observe(elapsed)
+
+    def record_skip(self, reason: str) -> None:
+        with self._lock:
+            self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        fast, agent = self.fast.count, self.agent.count
+        saved_per_query = None
+        if fast and agent:
+            saved_per_query = self.agent.total / agent - self.fast.total / fast
+        with self._lock:
+            routed, skipped = dict(self.routed), dict(self.skipped)
+        return {
+            "fast_path_share": round(fast / (fast + agent), 4) if fast + agent else None,
+            "routed": routed,
+            "skipped": skipped,
+            "fast_path_latency": self.fast.snapshot(),
+            "agent_latency": self.agent.snapshot(),
+            # Average agent latency minus average fast path latency.
+            "estimated_saved_ms_per_query": (
+                round(saved_per_query * 1000, 3) if saved_per_query is not None else None
+            ),
+            "estimated_saved_seconds": (
+                round(saved_per_query * fast, 3) if saved_per_query is not None else None
+            ),
+        }
+
+
+fast_path_stats = FastPathStats()
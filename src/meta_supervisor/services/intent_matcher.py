@@ -0,0 +1,122 @@
+"""
+Compiled multi-pattern intent matcher.
+
+All intent keywords are compiled into a single Aho-Corasick automaton, so the
+query text is scanned once regardless of how large the vocabulary grows.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+
+class IntentMatcher:
+    """
+    Scores every intent in one pass over the tokens and the query text.
+
+    A keyword that equals a token counts `token_weight`; a keyword that only
+    occurs as a substring of the text (e.g. the stem "만들" in "만들어줘")
+    counts `text_weight`. Each keyword contributes once, and confidences are
+    the intent's share of the total score.
+    """
+
+    def __init__(
+        self,
+        intent_keywords: Dict[str, Iterable[str]],
+        token_weight: float = 1.0,
+        text_weight: float = 0.5,
+    ):
+        self.token_weight = token_weight
+        self.text_weight = text_weight
+        self._intents: List[str] = list(intent_keywords)
+        self._intent_order = {intent: index for index, intent in enumerate(self._intents)}
+        self._keyword_intents: List[List[int]] = []
+        self._keyword_ids: Dict[str, int] = {}
+
+        for intent_index, keywords in enumerate(intent_keywords.values()):
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                keyword_id = self._keyword_ids.get(keyword)
+                if keyword_id is None:
+                    keyword_id = len(self._keyword_intents)
+                    self._keyword_ids[keyword] = keyword_id
+                    self._keyword_intents.append([])
+                if intent_index not in self._keyword_intents[keyword_id]:
+                    self._keyword_intents[keyword_id].append(intent_index)
+
+        self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for keyword, keyword_id in self._keyword_ids.items():
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword_id)
+
+        # Breadth-first failure links; outputs are merged along them so the
+        # scan never has to walk the failure chain to report matches.
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                if fail[next_state] == next_state:
+                    fail[next_state] = 0
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def _scan(self, text: str) -> set:
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        matched = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                matched.update(outputs[state])
+        return matched
+
+    def scores(self, tokens: Iterable[str], text: str = "") -> Dict[str, float]:
+        """Returns the raw score of every intent with at least one match."""
+        weights: Dict[int, float] = {}
+        for keyword_id in self._scan(text) if text else ():
+            weights[keyword_id] = self.text_weight
+        for token in tokens:
+            keyword_id = self._keyword_ids.get(token)
+            if keyword_id is not None:
+                weights[keyword_id] = self.token_weight
+
+        scores: Dict[str, float] = {}
+        for keyword_id, weight in weights.items():
+            for intent_index in self._keyword_intents[keyword_id]:
+                intent = self._intents[intent_index]
+                scores[intent] = scores.get(intent, 0.0) + weight
+        return scores
+
+    def rank(self, tokens: Iterable[str], text: str = "") -> List[Tuple[str, float]]:
+        """
+        Returns (intent, confidence) pairs, best first.
+        Ties keep the declaration order of the keyword table.
+        """
+        scores = self.scores(tokens, text)
+        total = sum(scores.values())
+        if not total:
+            return []
+        order = self._intent_order
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], order[item[0]]))
+        return [(intent, round(score / total, 4)) for intent, score in ranked]
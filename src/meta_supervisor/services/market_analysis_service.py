@@ -1,13 +1,82 @@
+import codecs
 import httpx
-from typing import Any, Dict, Optional
+import json as jsonlib
+from typing import Any, AsyncIterator, Dict, Optional
 from pydantic import BaseModel
 import os
 from datetime import datetime
 import logging
+from ..cache import AsyncTTLCache
+from ..clients.backend import BackendClient, aiter_limited
 from ..config import settings
+from ..persistent_cache import get_persistent_cache
+from ..singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Shared by every service instance (tools build their own), so identical
+# concurrent queries reach the backend once.
+upstream_flights = SingleFlight("market_analysis")
+
+# Answers stay valid for minutes; stale ones are served while refreshing.
+response_cache = AsyncTTLCache(
+    max_entries=settings.MARKET_CACHE_MAX_ENTRIES,
+    ttl=settings.MARKET_CACHE_TTL_SECONDS,
+    stale_ttl=settings.MARKET_CACHE_STALE_SECONDS,
+)
+
+# Streaming formats we can forward incrementally, best first.
+STREAM_ACCEPT = "text/event-stream, application/x-ndjson;q=0.9, application/json;q=0.5"
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-seq")
+# Fields that carry answer text in streamed events; "answer" holds the whole
+# answer and is only used when nothing was streamed before it.
+DELTA_FIELDS = ("delta", "content", "token", "text")
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def _iter_sse_data(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Yields the data of each server-sent event."""
+    data = []
+    async for line in _iter_lines(chunks):
+        if not line:
+            if data:
+                yield "\n".join(data)
+                data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+    if data:
+        yield "\n".join(data)
+
+
+def _event_text(payload: str, streamed: bool) -> str:
+    """Extracts answer text from one streamed event (JSON object or plain text)."""
+    try:
+        event = jsonlib.loads(payload)
+    except ValueError:
+        return payload
+    if isinstance(event, str):
+        return event
+    if not isinstance(event, dict):
+        return ""
+    for field in DELTA_FIELDS:
+        if isinstance(event.get(field), str):
+            return event[field]
+    if not streamed and isinstance(event.get("answer"), str):
+        return event["answer"]
+    return ""
+
 
 class QueryRequest(BaseModel):
     """External market analysis API request format"""
@@ -27,6 +96,9 @@ class QueryResponse(BaseModel):
 class MarketAnalysisService:
     def __init__(self):
         self.base_url = settings.MARKET_ANALYSIS_API_BASE_URL
+        self.backend = BackendClient(
+            "market_analysis", self.base_url, timeout=settings.MARKET_ANALYSIS_TIMEOUT_SECONDS
+        )
 
     async def _request(
         self,
@@ -35,16 +107,19 @@ class MarketAnalysisService:
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """HTTP request handler for external market analysis API."""
-        url = f"{self.base_url}{endpoint}"
-        print(url)
+        """
+        HTTP request handler for external market analysis API.
+        Raises CircuitOpenError immediately while the backend is failing, and
+        BulkheadFullError when too many calls are already waiting on it.
+        """
+        logger.debug(f"{method} {self.base_url}{endpoint}")
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.request(
-                    method=method, url=url, params=params, json=json, timeout=180.0
-                )
-                response.raise_for_status()
-                return response.json()
+            # Every market analysis endpoint is a read, so requests may be hedged.
+            response = await self.backend.request(
+                method, endpoint, idempotent=True, params=params, json=json
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.RequestError as e:
             raise Exception(f"Market Analysis API request failed: {e}")
         except httpx.HTTPStatusError as e:
@@ -56,30 +131,105 @@ class MarketAnalysisService:
         """Simple proxy to external market analysis API."""
         logger.info(f"Market analysis request: {query}")
 
+        normalized = " ".join(query.split())
         try:
-            request_data = QueryRequest(
-                query=query,
-                # model=os.getenv("MAIN_LLM_MODEL", "gpt-4o-mini"),
-                temperature=0.2,
-            )
-
-            response_data = await self._request(
-                method="POST", endpoint="/api/query", json=request_data.model_dump()
+            result, status = await response_cache.get_or_load(
+                (self.base_url, normalized), lambda: self._load_analysis(query, normalized)
             )
-
-            response = QueryResponse(**response_data)
-
-            logger.info(f"API response successful - {len(response.answer)} chars")
-            return {
-                "query": query,
-                "answer": response.answer,
-                "timestamp": response.timestamp,
-            }
-
         except Exception as e:
             logger.warning(f"External API failed: {e}")
             return self._simple_fallback(query, str(e))
 
+        if status == "miss":
+            return dict(result)
+        return {**result, "cached": True, "cache_status": status}
+
+    async def _load_analysis(self, query: str, normalized: str) -> Dict[str, Any]:
+        """Reads through the on-disk cache shared with other workers and restarts."""
+        disk_cache = get_persistent_cache()
+        disk_key = f"market_analysis:{self.base_url}:{normalized}"
+        if disk_cache is not None:
+            stored = await disk_cache.aget(disk_key)
+            if stored is not None:
+                return {**stored, "cached": True, "cache_status": "persistent"}
+
+        result = await self._fetch_analysis(query)
+        if disk_cache is not None:
+            await disk_cache.aset(disk_key, result, settings.MARKET_CACHE_TTL_SECONDS)
+        return result
+
+    async def _fetch_analysis(self, query: str) -> Dict[str, Any]:
+        """Queries the external API; raises on failure so errors are never cached."""
+        request_data = QueryRequest(
+            query=query,
+            # model=os.getenv("MAIN_LLM_MODEL", "gpt-4o-mini"),
+            temperature=0.2,
+        )
+
+        payload = request_data.model_dump()
+        flight_key = (self.base_url, "/api/query", jsonlib.dumps(payload, sort_keys=True))
+        response_data = await upstream_flights.do(
+            flight_key,
+            lambda: self._request(method="POST", endpoint="/api/query", json=payload),
+        )
+
+        response = QueryResponse(**response_data)
+
+        logger.info(f"API response successful - {len(response.answer)} chars")
+        return {
+            "query": query,
+            "answer": response.answer,
+            "timestamp": response.timestamp,
+        }
+
+    async def stream_market(self, query: str) -> AsyncIterator[str]:
+        """
+        Streams answer text for `query` as the backend produces it, without
+        buffering the whole report. Server-sent events and NDJSON are
+        forwarded event by event; a plain JSON body arrives in one piece.
+        Raises ResponseTooLargeError past MARKET_ANALYSIS_MAX_RESPONSE_BYTES.
+        """
+        logger.info(f"Market analysis stream request: {query}")
+        payload = {**QueryRequest(query=query, temperature=0.2).model_dump(), "stream": True}
+        async with self.backend.stream(
+            "POST", "/api/query", json=payload, headers={"Accept": STREAM_ACCEPT}
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                raise Exception(
+                    f"Market Analysis API returned error: {response.status_code} {response.text}"
+                )
+            content_type = response.headers.get("content-type", "").split(";")[0].strip()
+            body = aiter_limited(
+                response, settings.MARKET_ANALYSIS_MAX_RESPONSE_BYTES, "market_analysis"
+            )
+
+            if content_type == "application/json":
+                raw = b"".join([chunk async for chunk in body])
+                yield QueryResponse(**jsonlib.loads(raw)).answer
+                return
+
+            if content_type == "text/event-stream":
+                events = _iter_sse_data(body)
+            elif content_type in NDJSON_TYPES:
+                events = _iter_lines(body)
+            else:
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                async for chunk in body:
+                    text = decoder.decode(chunk)
+                    if text:
+                        yield text
+                return
+
+            streamed = False
+            async for data in events:
+                if data.strip() == "[DONE]":
+                    break
+                text = _event_text(data, streamed) if data.strip() else ""
+                if text:
+                    streamed = True
+                    yield text
+
     def _simple_fallback(self, query: str, error: str) -> Dict[str, Any]:
         """Simple fallback when external API is unavailable."""
         logger.info(f"Generating simple fallback for query: {query}")
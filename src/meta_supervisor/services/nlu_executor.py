@@ -0,0 +1,161 @@
+"""
+Dedicated executor that keeps Korean tokenization off the event loop.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from ..config import settings
+from ..metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+class NLUOverloadedError(RuntimeError):
+    """Raised when the NLU executor is saturated and the wait queue is full."""
+
+
+def _init_process_worker() -> None:
+    # Each worker process owns its JVM and tokenizer pool; the stock index
+    # file is mapped again but its pages are shared with the parent.
+    from .stock_index import get_stock_index
+    from .tokenizer_engine import get_tokenizer_engine
+
+    try:
+        get_stock_index()
+        get_tokenizer_engine().warm_up()
+    except Exception as e:
+        logger.warning(f"Tokenizer warm-up failed in NLU worker: {e}")
+
+
+class NLUExecutor:
+    """
+    Runs blocking NLU calls in a thread or process pool with backpressure.
+
+    At most `max_workers + max_queue` calls are admitted at once. Further
+    callers wait up to `queue_timeout` seconds for a slot and are then
+    rejected with `NLUOverloadedError` instead of piling up unbounded.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 64,
+        queue_timeout: float = 2.0,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported NLU executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self.queue_timeout = queue_timeout
+        self._pool: Optional[Executor] = None
+        self._pool_lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._waiting = 0
+        self._rejected = 0
+        self.admission_wait_stats = LatencyStats()
+        self.run_stats = LatencyStats()
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    if self.kind == "process":
+                        self._pool = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            initializer=_init_process_worker,
+                        )
+                    else:
+                        self._pool = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="nlu",
+                        )
+        return self._pool
+
+    async def _admit(self) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.capacity)
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise NLUOverloadedError(
+                f"NLU executor is saturated ({self.capacity} requests in flight)"
+            )
+        finally:
+            self._waiting -= 1
+        self.admission_wait_stats.observe(time.perf_counter() - started)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Runs `fn(*args)` in the pool once an admission slot is free."""
+        await self._admit()
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+        finally:
+            self.run_stats.observe(time.perf_counter() - started)
+            self._in_flight -= 1
+            self._slots.release()
+
+    def warm_up(self) -> None:
+        """Starts the worker pool ahead of the first request."""
+        pool = self._get_pool()
+        if self.kind == "process":
+            # Process workers start lazily; submitting no-ops spawns them.
+            for future in [pool.submit(int) for _ in range(self.max_workers)]:
+                future.result()
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "capacity": self.capacity,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "rejected": self._rejected,
+            "admission_wait": self.admission_wait_stats.snapshot(),
+            "run": self.run_stats.snapshot(),
+        }
+
+
+_executor: Optional[NLUExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_nlu_executor() -> NLUExecutor:
+    """Returns the process-wide NLU executor, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = NLUExecutor(
+                    kind=settings.NLU_EXECUTOR_KIND,
+                    max_workers=settings.NLU_EXECUTOR_WORKERS,
+                    max_queue=settings.NLU_EXECUTOR_MAX_QUEUE,
+                    queue_timeout=settings.NLU_EXECUTOR_QUEUE_TIMEOUT,
+                )
+    return _executor
+
+
+def shutdown_nlu_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -1,6 +1,13 @@
-from konlpy.tag import Okt
+import asyncio
 import re
+from typing import Optional
 from .. import schemas
+from ..cache import TTLCache
+from ..config import settings
+from .intent_matcher import IntentMatcher
+from .nlu_executor import get_nlu_executor
+from .stock_index import get_stock_index
+from .tokenizer_engine import get_tokenizer_engine
 
 INTENT_KEYWORDS = {
     "market_analysis": ["분석", "시세", "주가", "차트", "전망"],
@@ -9,6 +16,32 @@ INTENT_KEYWORDS = {
     "strategy_execution": ["실행", "매매", "주문", "시작", "적용"],
 }
 
+_CLEANUP_PATTERN = re.compile(r"[^가-힣a-zA-Z0-9\s]")
+
+# Compiled once; matching cost no longer grows with the keyword count.
+_intent_matcher = IntentMatcher(INTENT_KEYWORDS)
+
+
+def _result_size(key: str, result: schemas.IntentAnalysisResult) -> int:
+    return len(key.encode("utf-8")) + len(result.model_dump_json())
+
+
+# Analysis results keyed by normalized query text.
+result_cache = TTLCache(
+    max_entries=settings.NLU_CACHE_MAX_ENTRIES,
+    ttl=settings.NLU_CACHE_TTL_SECONDS,
+    max_bytes=settings.NLU_CACHE_MAX_BYTES,
+    sizeof=_result_size,
+)
+
+
+def normalize_query(text: str) -> str:
+    """
+    Applies the tokenizer's cleanup and folds whitespace.
+    Queries with the same normalized form always get the same analysis.
+    """
+    return " ".join(_CLEANUP_PATTERN.sub("", text).split())
+
 
 def preprocess_and_tokenize(text: str) -> list[str]:
     """
@@ -16,31 +49,46 @@ def preprocess_and_tokenize(text: str) -> list[str]:
     - Removes special characters
     - Extracts nouns and verbs (lemmatized)
     """
-    okt = Okt()  # Create instance locally
     # 1. Remove special characters and hangul jamo
-    processed_text = re.sub(r"[^가-힣a-zA-Z0-9\s]", "", text)
+    processed_text = _CLEANUP_PATTERN.sub("", text)
     # 2. Tokenize and lemmatize
-    tokens = okt.pos(processed_text, norm=True, stem=True)
+    tokens = get_tokenizer_engine().pos(processed_text, norm=True, stem=True)
     # 3. Extract meaningful parts of speech (nouns, verbs)
     meaningful_tokens = [word for word, pos in tokens if pos in ["Noun", "Verb"]]
     return meaningful_tokens
 
 
-def classify_intent(tokens: list[str]) -> str:
+def rank_intents(tokens: list[str], text: str = "") -> list[tuple[str, float]]:
     """
-    Classifies the user's intent based on keywords in tokens.
+    Scores every intent against the tokens and raw text in one pass.
+    Returns (intent, confidence) pairs, best first.
     """
-    for intent, keywords in INTENT_KEYWORDS.items():
-        if any(keyword in tokens for keyword in keywords):
-            return intent
-    return "unknown"
+    return _intent_matcher.rank(tokens, _CLEANUP_PATTERN.sub("", text))
+
+
+def classify_intent(tokens: list[str], text: str = "") -> str:
+    """
+    Classifies the user's intent based on keywords in tokens and text.
+    """
+    ranked = rank_intents(tokens, text)
+    return ranked[0][0] if ranked else "unknown"
 
 
 def extract_entities(text: str) -> dict:
     """
     Extracts entities like stock codes from the text.
+    - Resolves company names, aliases and codes through the listing index
+    - Falls back to any 6-digit number for codes missing from the listing
     """
     entities = {}
+    stocks = []
+    for mention in get_stock_index().find_all(text):
+        if all(stock["code"] != mention.code for stock in stocks):
+            stocks.append({"code": mention.code, "name": mention.name})
+    if stocks:
+        entities["stock_code"] = stocks[0]["code"]
+        entities["stocks"] = stocks
+        return entities
     # Extract stock code (6-digit number)
     stock_code_match = re.search(r"(\d{6})", text)
     if stock_code_match:
@@ -48,11 +96,111 @@ def extract_entities(text: str) -> dict:
     return entities
 
 
+def _analyze_normalized(text: str) -> schemas.IntentAnalysisResult:
+    tokens = preprocess_and_tokenize(text)
+    ranked = rank_intents(tokens, text)
+    entities = extract_entities(text)
+    if not ranked:
+        return schemas.IntentAnalysisResult(
+            intent="unknown", entities=entities, confidence=0.0
+        )
+    return schemas.IntentAnalysisResult(
+        intent=ranked[0][0],
+        entities=entities,
+        confidence=ranked[0][1],
+        intents=[
+            schemas.RankedIntent(intent=intent, confidence=confidence)
+            for intent, confidence in ranked
+        ],
+    )
+
+
+def _cached(key: str) -> Optional[schemas.IntentAnalysisResult]:
+    cached = result_cache.get(key)
+    # Callers may mutate the result; never hand out the cached instance.
+    return cached.model_copy(deep=True) if cached is not None else None
+
+
+def _store(key: str, result: schemas.IntentAnalysisResult) -> schemas.IntentAnalysisResult:
+    result_cache.set(key, result)
+    return result.model_copy(deep=True)
+
+
 def analyze(text: str) -> schemas.IntentAnalysisResult:
     """
     Analyzes the user's natural language query.
     """
-    tokens = preprocess_and_tokenize(text)
-    intent = classify_intent(tokens)
-    entities = extract_entities(text)
-    return schemas.IntentAnalysisResult(intent=intent, entities=entities)
+    key = normalize_query(text)
+    cached = _cached(key)
+    if cached is not None:
+        return cached
+    return _store(key, _analyze_normalized(key))
+
+
+async def analyze_async(text: str) -> schemas.IntentAnalysisResult:
+    """
+    Analyzes the query on the NLU executor so tokenization never blocks the event loop.
+    Cache hits are answered directly. Raises NLUOverloadedError when the executor
+    is saturated.
+    """
+    key = normalize_query(text)
+    cached = _cached(key)
+    if cached is not None:
+        return cached
+    result = await get_nlu_executor().run(_analyze_normalized, key)
+    return _store(key, result)
+
+
+def analyze_many(texts: list[str]) -> list[schemas.IntentAnalysisResult]:
+    """
+    Analyzes a chunk of normalized queries in one executor task.
+    """
+    return [_analyze_normalized(text) for text in texts]
+
+
+async def analyze_batch_async(
+    texts: list[str], chunk_size: Optional[int] = None
+) -> list[schemas.IntentAnalysisResult]:
+    """
+    Analyzes many queries by spreading chunks across the NLU workers.
+    Cached and repeated queries are analyzed once; results are returned in
+    input order.
+    """
+    chunk_size = chunk_size or settings.NLU_BATCH_CHUNK_SIZE
+    executor = get_nlu_executor()
+    keys = [normalize_query(text) for text in texts]
+    results: dict[str, schemas.IntentAnalysisResult] = {}
+    misses: list[str] = []
+    for key in dict.fromkeys(keys):
+        cached = result_cache.get(key)
+        if cached is not None:
+            results[key] = cached
+        else:
+            misses.append(key)
+    chunks = [misses[i : i + chunk_size] for i in range(0, len(misses), chunk_size)]
+    # One batch may occupy every worker but must not flood the admission
+    # queue that single-query requests wait in.
+    in_flight = asyncio.Semaphore(executor.max_workers)
+
+    async def run_chunk(chunk: list[str]) -> list[schemas.IntentAnalysisResult]:
+        async with in_flight:
+            return await executor.run(analyze_many, chunk)
+
+    chunk_results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+    for chunk, chunk_result in zip(chunks, chunk_results):
+        for key, result in zip(chunk, chunk_result):
+            result_cache.set(key, result)
+            results[key] = result
+    return [results[key].model_copy(deep=True) for key in keys]
+
+
+def warm_up() -> None:
+    """
+    Maps the stock index and starts the NLU workers, the JVM and the tokenizer
+    pool ahead of the first request.
+    """
+    get_stock_index()
+    executor = get_nlu_executor()
+    if executor.kind == "thread":
+        get_tokenizer_engine().warm_up()
+    executor.warm_up()
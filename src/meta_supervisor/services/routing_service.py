@@ -1,45 +1,124 @@
-from .market_analysis_service import MarketAnalysisService
-from .trading_service import TradingService
+import asyncio
+import logging
+import time
+from .service_registry import ServiceRegistry
 from .. import schemas
-from typing import Any
+from ..config import settings
+from typing import Any, Dict, List, Optional
 
-# Mapping from intent to the corresponding service and method
-INTENT_TO_SERVICE_MAP = {
-    "market_analysis": {"service": MarketAnalysisService(), "method": "analyze_market"},
-    "strategy_creation": {"service": TradingService(), "method": "create_strategy"},
-    # "backtest" and "strategy_execution" can be added later
-}
+logger = logging.getLogger(__name__)
 
+# Intent -> service handlers. Services come from dependencies.py on first
+# dispatch, so routing shares their instances and imports nothing eagerly.
+registry = ServiceRegistry()
 
-async def route_request(analysis: schemas.IntentAnalysisResult) -> Any:
+
+def _market_analysis_service():
+    from ..dependencies import get_market_analysis_service
+
+    return get_market_analysis_service()
+
+
+def _trading_service():
+    from ..dependencies import get_trading_service
+
+    return get_trading_service()
+
+
+@registry.handler("market_analysis", _market_analysis_service)
+async def _analyze_market(
+    service: Any, analysis: schemas.IntentAnalysisResult, query: str
+) -> Any:
+    symbol = analysis.entities.get("stock_code")
+    if not symbol:
+        return {"error": "Stock symbol (stock_code) not found in the query."}
+    return await service.analyze_market(query or symbol)
+
+
+# The trading backend is message based; the agent behind it distinguishes
+# strategy creation, backtests and execution from the message itself.
+@registry.handler("strategy_creation", _trading_service)
+@registry.handler("backtest", _trading_service)
+@registry.handler("strategy_execution", _trading_service)
+async def _send_trading_query(
+    service: Any, analysis: schemas.IntentAnalysisResult, query: str
+) -> Any:
+    response = await service.send_query(query)
+    return response.model_dump()
+
+
+def select_intents(analysis: schemas.IntentAnalysisResult) -> List[str]:
     """
-    Routes the request to the appropriate backend service based on intent.
+    Picks the supported intents to dispatch, best first.
+    Secondary intents must reach ROUTING_MIN_INTENT_CONFIDENCE, and an intent
+    handled by the same call as a better one is dropped: the trading backend
+    gets one message per request, however many trading intents it matched.
     """
-    intent = analysis.intent
-    if intent not in INTENT_TO_SERVICE_MAP:
-        return {"error": f"Intent '{intent}' is not supported."}
-
-    service_info = INTENT_TO_SERVICE_MAP[intent]
-    service = service_info["service"]
-    method_name = service_info["method"]
-    method_to_call = getattr(service, method_name)
-
-    # This is a simplified way to create request params from entities.
-    # In a real scenario, this would be more robust.
-    params_data = analysis.entities
-
-    # Here we would map entities to the appropriate service method.
-    if intent == "market_analysis":
-        symbol = params_data.get("stock_code")
-        if not symbol:
-            return {"error": "Stock symbol (stock_code) not found in the query."}
-
-        analysis_type = params_data.get("analysis_type", "technical")
-        response = await method_to_call(symbol, analysis_type)
-    elif intent == "strategy_creation":
-        response = await method_to_call(params_data)
-    else:
-        # Fallback for unhandled intents that are in the map
-        return {"error": f"Service method for intent '{intent}' not implemented."}
-
-    return response
+    ranked = analysis.intents or [
+        schemas.RankedIntent(intent=analysis.intent, confidence=analysis.confidence or 1.0)
+    ]
+    selected = []
+    targets = set()
+    for candidate in ranked:
+        target = registry.target(candidate.intent)
+        if target is None or target in targets:
+            continue
+        if selected and candidate.confidence < settings.ROUTING_MIN_INTENT_CONFIDENCE:
+            continue
+        targets.add(target)
+        selected.append(candidate.intent)
+        if len(selected) >= settings.ROUTING_MAX_FANOUT:
+            break
+    return selected
+
+
+async def route_request(
+    analysis: schemas.IntentAnalysisResult,
+    query: str = "",
+    deadline: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Routes the request to every backend service its ranked intents ask for.
+
+    Services run concurrently under one per-request deadline, so latency is
+    the slowest backend rather than the sum. Backends that fail or miss the
+    deadline are reported in `errors` and the rest is returned as a partial
+    result.
+    """
+    intents = select_intents(analysis)
+    if not intents:
+        return {"error": f"Intent '{analysis.intent}' is not supported."}
+
+    deadline = settings.ROUTING_DEADLINE_SECONDS if deadline is None else deadline
+    started = time.perf_counter()
+    tasks = {
+        intent: asyncio.ensure_future(registry.resolve(intent)(analysis, query))
+        for intent in intents
+    }
+    _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for intent, task in tasks.items():
+        if task in pending:
+            errors[intent] = f"Deadline of {deadline}s exceeded."
+        elif task.exception() is not None:
+            errors[intent] = str(task.exception())
+        elif isinstance(task.result(), dict) and "error" in task.result():
+            errors[intent] = task.result()["error"]
+        else:
+            results[intent] = task.result()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Routed {intents} in {elapsed_ms:.1f} ms ({len(errors)} failed)")
+    merged = {
+        "intents": intents,
+        "results": results,
+        "errors": errors,
+        "partial": bool(errors) and bool(results),
+    }
+    if not results:
+        merged["error"] = next(iter(errors.values()))
+    return merged
@@ -0,0 +1,72 @@
+"""
+Registry that maps intents to the backend services handling them.
+"""
+
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .. import schemas
+
+Handler = Callable[[Any, schemas.IntentAnalysisResult, str], Awaitable[Any]]
+BoundHandler = Callable[[schemas.IntentAnalysisResult, str], Awaitable[Any]]
+
+
+class ServiceRegistry:
+    """
+    Intent -> (service provider, handler) registrations.
+
+    Registering is cheap and happens at import time; providers are only called
+    when the dispatch table is first needed. The table binds each handler to
+    its service instance once, so dispatch is a single dict lookup.
+    """
+
+    def __init__(self):
+        self._registrations: Dict[str, Tuple[Callable[[], Any], Handler]] = {}
+        self._table: Optional[Dict[str, BoundHandler]] = None
+        self._lock = threading.Lock()
+
+    def register(self, intent: str, provider: Callable[[], Any], handler: Handler) -> None:
+        with self._lock:
+            self._registrations[intent] = (provider, handler)
+            self._table = None
+
+    def handler(self, intent: str, provider: Callable[[], Any]) -> Callable[[Handler], Handler]:
+        """Decorator form of `register`."""
+
+        def decorator(handler: Handler) -> Handler:
+            self.register(intent, provider, handler)
+            return handler
+
+        return decorator
+
+    def __contains__(self, intent: str) -> bool:
+        return intent in self._registrations
+
+    def target(self, intent: str) -> Optional[Tuple[Callable[[], Any], Handler]]:
+        """The (provider, handler) registered for `intent`; intents sharing one do the same call."""
+        return self._registrations.get(intent)
+
+    def intents(self) -> List[str]:
+        return list(self._registrations)
+
+    def _build(self) -> Dict[str, BoundHandler]:
+        with self._lock:
+            if self._table is None:
+                instances: Dict[Callable[[], Any], Any] = {}
+                table = {}
+                for intent, (provider, handler) in self._registrations.items():
+                    if provider not in instances:
+                        instances[provider] = provider()
+                    table[intent] = functools.partial(handler, instances[provider])
+                self._table = table
+            return self._table
+
+    def resolve(self, intent: str) -> Optional[BoundHandler]:
+        table = self._table if self._table is not None else self._build()
+        return table.get(intent)
+
+    def reset(self) -> None:
+        """Drops the bound table; services are re-resolved on next use."""
+        with self._lock:
+            self._table = None
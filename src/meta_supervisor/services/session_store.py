@@ -0,0 +1,224 @@
+"""
+Per-session conversation memory for the supervisor agent.
+
+Each session keeps its recent turns (user query, final answer) verbatim and
+everything older as one running summary. When a session's turns exceed its
+token budget the oldest of them are folded into the summary until the
+session is back to half the budget; until that compaction finishes,
+`history()` only hands out the newest turns that fit the budget, so the
+prompt never grows past it. Sessions are kept in LRU order and dropped when
+idle past the TTL or when the store holds more than `max_sessions`.
+
+Token counts are estimates (about four ASCII characters or one Hangul
+syllable per token), which is close enough for budgeting.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+Turn = Tuple[str, str]
+Summarizer = Callable[[str, List[Turn]], Awaitable[str]]
+
+
+def estimate_tokens(text: str) -> int:
+    ascii_chars = sum(1 for char in text if char.isascii())
+    return (ascii_chars + 3) // 4 + len(text) - ascii_chars
+
+
+def _turn_tokens(turn: Turn) -> int:
+    return estimate_tokens(turn[0]) + estimate_tokens(turn[1])
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Keeps the end of `text` (the most recent part) within `max_tokens`."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high) // 2
+        if estimate_tokens(text[middle:]) <= max_tokens:
+            high = middle
+        else:
+            low = middle + 1
+    return "…" + text[low:]
+
+
+def extractive_summary(summary: str, turns: List[Turn]) -> str:
+    """Fallback summary: the previous summary followed by the folded turns."""
+    lines = [summary] if summary else []
+    lines += [f"User: {user}\nAssistant: {answer}" for user, answer in turns]
+    return "\n".join(lines)
+
+
+class Session:
+    __slots__ = ("summary", "summary_tokens", "turns", "tokens", "last_used", "compacting")
+
+    def __init__(self, now: float):
+        self.summary = ""
+        self.summary_tokens = 0
+        self.turns: Deque[Turn] = deque()
+        self.tokens = 0
+        self.last_used = now
+        self.compacting = False
+
+
+class SessionStore:
+    def __init__(
+        self,
+        token_budget: int = 2000,
+        summary_max_tokens: int = 400,
+        max_sessions: int = 50000,
+        idle_ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.token_budget = token_budget
+        self.summary_max_tokens = summary_max_tokens
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+        self.compactions = 0
+        self.compaction_failures = 0
+
+    def history(self, session_id: str) -> Tuple[str, List[Turn]]:
+        """Returns (summary, turns oldest first) for the session's next prompt."""
+        with self._lock:
+            session = self._touch(session_id, create=False)
+            if session is None:
+                return "", []
+            turns: List[Turn] = []
+            used = 0
+            for turn in reversed(session.turns):
+                used += _turn_tokens(turn)
+                # The newest turn is always kept, whatever its size.
+                if turns and used > self.token_budget:
+                    break
+                turns.append(turn)
+            turns.reverse()
+            return session.summary, turns
+
+    def append(self, session_id: str, query: str, answer: str) -> bool:
+        """Records one turn; True when the session needs compaction."""
+        with self._lock:
+            session = self._touch(session_id, create=True)
+            turn = (query, answer)
+            session.turns.append(turn)
+            session.tokens += _turn_tokens(turn)
+            return session.tokens > self.token_budget and not session.compacting
+
+    async def compact(self, session_id: str, summarize: Summarizer) -> None:
+        """
+        Folds the oldest turns into the summary until the session is within
+        half its budget. The summarizer runs outside the lock; turns added
+        meanwhile are kept. If it fails the turns are kept verbatim in the
+        summary, truncated to the summary budget.
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.compacting or session.tokens <= self.token_budget:
+                return
+            session.compacting = True
+            folded: List[Turn] = []
+            remaining = session.tokens
+            # Keep at least the newest turn verbatim.
+            for turn in list(session.turns)[:-1]:
+                if remaining <= self.token_budget // 2:
+                    break
+                folded.append(turn)
+                remaining -= _turn_tokens(turn)
+            summary = session.summary
+        try:
+            if not folded:
+                return
+            try:
+                new_summary = await summarize(summary, folded)
+            except Exception as e:
+                logger.warning(f"Session summary failed, keeping turns verbatim: {e}")
+                self.compaction_failures += 1
+                new_summary = extractive_summary(summary, folded)
+            new_summary = _truncate(new_summary, self.summary_max_tokens)
+            with self._lock:
+                for _ in folded:
+                    session.tokens -= _turn_tokens(session.turns.popleft())
+                session.summary = new_summary
+                session.summary_tokens = estimate_tokens(new_summary)
+                self.compactions += 1
+        finally:
+            with self._lock:
+                session.compacting = False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _touch(self, session_id: str, create: bool) -> Optional[Session]:
+        now = self._clock()
+        session = self._sessions.get(session_id)
+        if session is not None and now - session.last_used > self.idle_ttl:
+            del self._sessions[session_id]
+            self.expirations += 1
+            session = None
+        if session is None:
+            if not create:
+                return None
+            session = self._sessions[session_id] = Session(now)
+        session.last_used = now
+        self._sessions.move_to_end(session_id)
+        # The least recently used sessions go first: idle ones, then any.
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if now - oldest.last_used > self.idle_ttl:
+                self.expirations += 1
+            elif len(self._sessions) > self.max_sessions:
+                self.evictions += 1
+            else:
+                break
+            del self._sessions[oldest_id]
+        return session
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            return {
+                "sessions": len(sessions),
+                "max_sessions": self.max_sessions,
+                "token_budget": self.token_budget,
+                "tokens": sum(session.tokens for session in sessions),
+                "summary_tokens": sum(session.summary_tokens for session in sessions),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "compactions": self.compactions,
+                "compaction_failures": self.compaction_failures,
+            }
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Returns the process-wide session store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore(
+                    token_budget=settings.SESSION_TOKEN_BUDGET,
+                    summary_max_tokens=settings.SESSION_SUMMARY_MAX_TOKENS,
+                    max_sessions=settings.SESSION_MAX_SESSIONS,
+                    idle_ttl=settings.SESSION_IDLE_TTL_SECONDS,
+                )
+    return _store
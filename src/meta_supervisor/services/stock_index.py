@@ -0,0 +1,315 @@
+"""
+Memory-mapped stock name/code dictionary for entity extraction.
+
+The listing (codes, company names and aliases) is compiled into a flat trie
+stored in a single binary file. Workers `mmap` the file read-only, so the
+index is loaded in microseconds, costs almost no private memory and its pages
+are shared between every uvicorn worker on the host.
+
+File layout (little endian):
+    header   magic "SKIX", version, node/edge/entry counts, string blob size
+    nodes    node_count  x (edge_start u32, edge_count u32, entry u32)
+    edges    edge_count  x (codepoint u32, child u32), sorted per node
+    entries  entry_count x (code_off u32, code_len u32, name_off u32, name_len u32)
+    strings  UTF-8 blob referenced by entries
+
+Build it with `python -m src.meta_supervisor.services.stock_index`.
+"""
+
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_LISTING_PATH = DATA_DIR / "stock_listing.tsv"
+DEFAULT_INDEX_PATH = DATA_DIR / "stock_listing.idx"
+
+MAGIC = b"SKIX"
+VERSION = 1
+NO_ENTRY = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<4sHHIIII")
+_NODE = struct.Struct("<III")
+_EDGE = struct.Struct("<II")
+_ENTRY = struct.Struct("<IIII")
+_CODEPOINT = struct.Struct("<I")
+
+# Same character class nlu_service keeps, so keys match normalized queries.
+_KEY_CLEANUP_PATTERN = re.compile(r"[^가-힣a-zA-Z0-9\s]")
+# ASCII-only lowering keeps text offsets stable for every other script.
+_ASCII_LOWER = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"
+)
+
+
+class ListingRow(NamedTuple):
+    code: str
+    name: str
+    aliases: Tuple[str, ...] = ()
+
+
+class StockMention(NamedTuple):
+    code: str
+    name: str
+    matched: str
+    start: int
+    end: int
+
+
+def normalize_key(key: str) -> str:
+    return _KEY_CLEANUP_PATTERN.sub("", key).strip().translate(_ASCII_LOWER)
+
+
+# Particles, and words often written without a space, that may follow a Hangul
+# key directly ("삼성전자가", "삼전주가"). Any other syllable continues the word.
+_HANGUL_FOLLOWERS = (
+    "이", "가", "은", "는", "을", "를", "의", "와", "과", "에", "도", "만", "로", "으로",
+    "랑", "나", "야", "요", "께", "하고", "보다", "처럼", "까지", "부터",
+    "주가", "주식", "전망", "실적", "차트", "시세", "분석", "배당", "매수", "매도",
+)
+
+
+def _is_word_char(char: str) -> bool:
+    # ASCII keys need plain word boundaries: "LG" must not match inside "LGU".
+    return char.isascii() and char.isalnum()
+
+
+def _is_hangul(char: str) -> bool:
+    return "가" <= char <= "힣"
+
+
+def _ends_word(text: str, end: int) -> bool:
+    """Whether a key matched up to `end` is not the start of a longer word."""
+    if end >= len(text):
+        return True
+    last, following = text[end - 1], text[end]
+    if _is_word_char(last) and _is_word_char(following):
+        return False
+    # "하이브" must not match "하이브리드", nor "현대차" match "현대차증권".
+    if _is_hangul(last) and _is_hangul(following):
+        return text.startswith(_HANGUL_FOLLOWERS, end)
+    return True
+
+
+def read_listing(path: Path) -> List[ListingRow]:
+    """Reads the tab separated listing: code, name, comma separated aliases."""
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            fields = line.split("\t")
+            aliases = tuple(a.strip() for a in fields[2].split(",")) if len(fields) > 2 else ()
+            rows.append(ListingRow(fields[0].strip(), fields[1].strip(), aliases))
+    return rows
+
+
+def build_index(rows: Iterable[ListingRow], path: Path) -> None:
+    """Compiles listing rows into the binary trie and atomically replaces `path`."""
+    children: List[Dict[int, int]] = [{}]
+    node_entry: List[int] = [NO_ENTRY]
+    strings = bytearray()
+    entries: List[Tuple[int, int, int, int]] = []
+
+    def intern(value: str) -> Tuple[int, int]:
+        data = value.encode("utf-8")
+        offset = len(strings)
+        strings.extend(data)
+        return offset, len(data)
+
+    for row in rows:
+        entry_id = len(entries)
+        entries.append(intern(row.code) + intern(row.name))
+        for key in (row.code, row.name, *row.aliases):
+            key = normalize_key(key)
+            if not key:
+                continue
+            node = 0
+            for char in key:
+                child = children[node].get(ord(char))
+                if child is None:
+                    child = len(children)
+                    children[node][ord(char)] = child
+                    children.append({})
+                    node_entry.append(NO_ENTRY)
+                node = child
+            if node_entry[node] == NO_ENTRY:
+                node_entry[node] = entry_id
+            elif node_entry[node] != entry_id:
+                logger.warning(f"Duplicate stock key '{key}' for {row.code}; keeping first")
+
+    nodes = bytearray()
+    edges = bytearray()
+    edge_count = 0
+    for node, edge_map in enumerate(children):
+        nodes += _NODE.pack(edge_count, len(edge_map), node_entry[node])
+        for codepoint in sorted(edge_map):
+            edges += _EDGE.pack(codepoint, edge_map[codepoint])
+            edge_count += 1
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0, len(children), edge_count, len(entries), len(strings)
+    )
+    entry_bytes = b"".join(_ENTRY.pack(*entry) for entry in entries)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header + nodes + edges + entry_bytes + strings)
+        # Readers that already mapped the old file keep a consistent view.
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class StockIndex:
+    """
+    Read-only view over a compiled, memory-mapped stock index.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, nodes, edges, entries, strings = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a stock index (version {VERSION})")
+        self.node_count = nodes
+        self.entry_count = entries
+        self._nodes_offset = _HEADER.size
+        self._edges_offset = self._nodes_offset + nodes * _NODE.size
+        self._entries_offset = self._edges_offset + edges * _EDGE.size
+        self._strings_offset = self._entries_offset + entries * _ENTRY.size
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _child(self, node: int, codepoint: int) -> int:
+        edge_start, edge_count, _ = _NODE.unpack_from(
+            self._mm, self._nodes_offset + node * _NODE.size
+        )
+        low, high = edge_start, edge_start + edge_count - 1
+        while low <= high:
+            mid = (low + high) // 2
+            offset = self._edges_offset + mid * _EDGE.size
+            (value,) = _CODEPOINT.unpack_from(self._mm, offset)
+            if value == codepoint:
+                return _EDGE.unpack_from(self._mm, offset)[1]
+            if value < codepoint:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return -1
+
+    def _node_entry(self, node: int) -> int:
+        return _NODE.unpack_from(self._mm, self._nodes_offset + node * _NODE.size)[2]
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_offset + offset
+        return self._mm[start : start + length].decode("utf-8")
+
+    def entry(self, entry_id: int) -> Tuple[str, str]:
+        """Returns (code, name) of an entry."""
+        code_off, code_len, name_off, name_len = _ENTRY.unpack_from(
+            self._mm, self._entries_offset + entry_id * _ENTRY.size
+        )
+        return self._string(code_off, code_len), self._string(name_off, name_len)
+
+    def lookup(self, key: str) -> Optional[Tuple[str, str]]:
+        """Exact lookup of a code, name or alias. Returns (code, name)."""
+        node = 0
+        for char in normalize_key(key):
+            node = self._child(node, ord(char))
+            if node < 0:
+                return None
+        entry_id = self._node_entry(node)
+        return self.entry(entry_id) if entry_id != NO_ENTRY else None
+
+    def find_all(self, text: str) -> List[StockMention]:
+        """
+        Resolves every company mention in one left-to-right pass.
+        Overlapping candidates are resolved leftmost-longest, so "삼성전자우"
+        style extensions and "LG" vs "LG전자" pick the longer listing key. A
+        key only matches where its word ends (see _HANGUL_FOLLOWERS).
+        """
+        lowered = text.translate(_ASCII_LOWER)
+        length = len(lowered)
+        mentions = []
+        i = 0
+        while i < length:
+            if i and _is_word_char(lowered[i]) and _is_word_char(lowered[i - 1]):
+                i += 1
+                continue
+            node, j, best = 0, i, None
+            while j < length:
+                node = self._child(node, ord(lowered[j]))
+                if node < 0:
+                    break
+                j += 1
+                entry_id = self._node_entry(node)
+                if entry_id != NO_ENTRY and _ends_word(lowered, j):
+                    best = (entry_id, j)
+            if best is None:
+                i += 1
+                continue
+            entry_id, end = best
+            code, name = self.entry(entry_id)
+            mentions.append(StockMention(code, name, text[i:end], i, end))
+            i = end
+        return mentions
+
+
+def _ensure_compiled(listing_path: Path, index_path: Path) -> Path:
+    # Read-only deployments compile into the temp directory instead.
+    fallback_path = Path(tempfile.gettempdir()) / index_path.name
+    listing_mtime = listing_path.stat().st_mtime
+    for candidate in (index_path, fallback_path):
+        if candidate.exists() and candidate.stat().st_mtime >= listing_mtime:
+            return candidate
+    rows = read_listing(listing_path)
+    try:
+        build_index(rows, index_path)
+    except OSError:
+        index_path = fallback_path
+        build_index(rows, index_path)
+    logger.info(f"Compiled stock index with {len(rows)} listings to {index_path}")
+    return index_path
+
+
+_index: Optional[StockIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_stock_index() -> StockIndex:
+    """Returns the process-wide stock index, compiling it if the listing changed."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                listing_path = Path(settings.STOCK_LISTING_PATH or DEFAULT_LISTING_PATH)
+                index_path = Path(settings.STOCK_INDEX_PATH or DEFAULT_INDEX_PATH)
+                _index = StockIndex(_ensure_compiled(listing_path, index_path))
+    return _index
+
+
+if __name__ == "__main__":
+    listing = Path(settings.STOCK_LISTING_PATH or DEFAULT_LISTING_PATH)
+    target = Path(settings.STOCK_INDEX_PATH or DEFAULT_INDEX_PATH)
+    build_index(read_listing(listing), target)
+    print(f"Wrote {target}")
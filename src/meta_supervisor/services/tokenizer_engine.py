@@ -0,0 +1,146 @@
+"""
+Pooled Okt tokenizer engine.
+
+Creating `konlpy.tag.Okt()` goes through the JVM bridge, so instances are built
+once, warmed up and handed out from a bounded pool instead of per call.
+"""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from ..metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_TEXT = "삼성전자 주가 분석해줘"
+
+
+class TokenizerPoolTimeout(RuntimeError):
+    """Raised when no tokenizer instance becomes available in time."""
+
+
+def _default_factory() -> Any:
+    from konlpy.tag import Okt  # JVM is started lazily by the first Okt()
+
+    return Okt()
+
+
+class TokenizerEngine:
+    """
+    Bounded pool of Okt instances with wait-time and latency statistics.
+
+    Instances are created on demand up to `pool_size`; `warm_up()` creates
+    all of them eagerly so the first requests do not pay JVM start-up cost.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 4,
+        acquire_timeout: float = 10.0,
+        factory: Optional[Callable[[], Any]] = None,
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self._factory = factory or _default_factory
+        self._pool: "queue.LifoQueue[Any]" = queue.LifoQueue(maxsize=pool_size)
+        self._created = 0
+        self._create_lock = threading.Lock()
+        self._timeouts = 0
+        self.wait_stats = LatencyStats()
+        self.tokenize_stats = LatencyStats()
+
+    def _try_create(self) -> Optional[Any]:
+        with self._create_lock:
+            if self._created >= self.pool_size:
+                return None
+            self._created += 1
+        try:
+            return self._factory()
+        except Exception:
+            with self._create_lock:
+                self._created -= 1
+            raise
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        """Borrows a tokenizer instance from the pool."""
+        started = time.perf_counter()
+        try:
+            instance = self._pool.get_nowait()
+        except queue.Empty:
+            instance = self._try_create()
+            if instance is None:
+                try:
+                    instance = self._pool.get(timeout=self.acquire_timeout)
+                except queue.Empty:
+                    self._timeouts += 1
+                    raise TokenizerPoolTimeout(
+                        f"No tokenizer available within {self.acquire_timeout}s"
+                    )
+        self.wait_stats.observe(time.perf_counter() - started)
+        try:
+            yield instance
+        finally:
+            self._pool.put_nowait(instance)
+
+    def pos(self, text: str, norm: bool = True, stem: bool = True) -> List[Tuple[str, str]]:
+        """Part-of-speech tags `text` using a pooled instance."""
+        with self.acquire() as okt:
+            started = time.perf_counter()
+            tokens = okt.pos(text, norm=norm, stem=stem)
+            self.tokenize_stats.observe(time.perf_counter() - started)
+        return tokens
+
+    def warm_up(self) -> None:
+        """Creates every pool instance and runs one tokenization on each."""
+        started = time.perf_counter()
+        borrowed = []
+        try:
+            while len(borrowed) < self.pool_size:
+                instance = self._try_create()
+                if instance is None:
+                    instance = self._pool.get(timeout=self.acquire_timeout)
+                instance.pos(WARM_UP_TEXT, norm=True, stem=True)
+                borrowed.append(instance)
+        finally:
+            for instance in borrowed:
+                self._pool.put_nowait(instance)
+        logger.info(
+            f"Tokenizer pool warmed up: {self.pool_size} instances in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.pool_size,
+            "created": self._created,
+            "available": self._pool.qsize(),
+            "in_use": self._created - self._pool.qsize(),
+            "acquire_timeouts": self._timeouts,
+            "pool_wait": self.wait_stats.snapshot(),
+            "tokenize": self.tokenize_stats.snapshot(),
+        }
+
+
+_engine: Optional[TokenizerEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_tokenizer_engine() -> TokenizerEngine:
+    """Returns the process-wide tokenizer engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = TokenizerEngine(
+                    pool_size=settings.NLU_TOKENIZER_POOL_SIZE,
+                    acquire_timeout=settings.NLU_TOKENIZER_ACQUIRE_TIMEOUT,
+                )
+    return _engine
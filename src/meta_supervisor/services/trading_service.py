@@ -1,9 +1,75 @@
 """
 Trading Service for message-based API communication.
 """
+import re
+
 import httpx
 from pydantic import BaseModel
+from ..clients.backend import BackendClient
+from ..clients.bulkhead import BulkheadFullError
+from ..clients.circuit_breaker import CircuitOpenError
 from ..config import settings
+from ..persistent_cache import get_persistent_cache
+from ..singleflight import SingleFlight
+
+# Terms of messages that place, change or cancel orders, or ask whether to.
+ORDER_KEYWORDS = (
+    "매수", "매도", "주문", "체결", "실행", "매입", "매각", "청산", "손절", "익절", "정정",
+    "취소", "사줘", "사 줘", "사주세요", "사 주세요", "팔아", "살까", "팔까",
+    "사자", "팔자", "담아", "진입", "포지션", "buy", "sell", "order", "execute", "cancel",
+)
+# A message is read-only only when it asks for information with one of these.
+READ_ONLY_KEYWORDS = (
+    "차트", "분석", "지표", "rsi", "macd", "볼린저", "이동평균", "스토캐스틱", "캔들",
+    "지지선", "저항선", "추세", "시세", "현재가", "주가", "거래량", "전망", "실적", "조회",
+    "확인", "알려", "보여", "설명", "비교", "어때", "어떻게", "얼마", "될까", "?",
+)
+# Read-only requests ("분석해줘", "알려 주세요"), removed before looking for other
+# instructions.
+READ_ONLY_REQUEST = re.compile(
+    r"(분석|확인|조회|설명|비교|점검|체크)\s*해\s*(줘|주세요|주실래요|줄래|봐)?"
+    r"|(알려|보여)\s*(줘|주세요|주실래요|줄래)?"
+)
+# Any other instruction ("처리해줘", "진행해") may be an order.
+INSTRUCTION = re.compile(r"(해|줘|주세요|하세요|해라|하자|해요|할래)(?=[\s.!~]|$)")
+
+# Answers about the user's own account change with every order, so they are
+# never cached or shared even though asking cannot place one.
+ACCOUNT_KEYWORDS = (
+    "잔고", "보유", "포트폴리오", "계좌", "주문내역", "체결", "balance", "portfolio", "position",
+)
+
+# Shared by every service instance so identical read-only messages in flight
+# at the same time reach the backend once.
+upstream_flights = SingleFlight("trading")
+
+
+def is_read_only_message(message: str) -> bool:
+    """
+    Whether a message only asks for information and cannot trigger an order.
+
+    Read-only messages are coalesced, cached and retried, so this is an
+    allowlist: a message must ask for analysis or data, name no order term and
+    give no instruction besides the read-only ones. Anything else is treated as
+    a possible order.
+    """
+    lowered = " ".join(message.lower().split())
+    if any(keyword in lowered for keyword in ORDER_KEYWORDS):
+        return False
+    if not any(keyword in lowered for keyword in READ_ONLY_KEYWORDS):
+        return False
+    return not INSTRUCTION.search(READ_ONLY_REQUEST.sub(" ", lowered))
+
+
+def is_account_message(message: str) -> bool:
+    """Whether a message asks about the user's own account."""
+    lowered = message.lower()
+    return any(keyword in lowered for keyword in ACCOUNT_KEYWORDS)
+
+
+def is_instruction(message: str) -> bool:
+    """Whether a message is phrased as an instruction ("…해줘", "…해"), read-only or not."""
+    return bool(INSTRUCTION.search(" ".join(message.lower().split())))
 
 
 class QueryRequest(BaseModel):
@@ -27,31 +93,65 @@ class TradingService:
     
     def __init__(self):
         self.base_url = settings.TRADING_STRATEGY_API_BASE_URL
-        self.timeout = 30.0
+        self.timeout = settings.TRADING_TIMEOUT_SECONDS
+        self.backend = BackendClient("trading", self.base_url, timeout=self.timeout)
     
-    async def send_query(self, message: str) -> QueryResponse:
+    async def send_query(self, message: str, read_only: bool = False) -> QueryResponse:
         """
         Send a message query to the trading server.
         
         Args:
             message: The message string to send
+            read_only: Whether the message is idempotent; identical read-only
+                messages in flight at the same time share one upstream call,
+                and answers are kept in the on-disk cache (except questions
+                about the account, which are only retried)
             
         Returns:
             QueryResponse with role and content from the server
         """
+        if read_only and is_account_message(message):
+            # Safe to retry, but a stale or shared balance is wrong after an order.
+            return await self._send(message, idempotent=True)
+        if read_only:
+            return await upstream_flights.do(
+                (self.base_url, message), lambda: self._send_cached(message)
+            )
+        return await self._send(message)
+
+    async def _send_cached(self, message: str) -> QueryResponse:
+        disk_cache = get_persistent_cache()
+        if disk_cache is None:
+            return await self._send(message, idempotent=True)
+
+        disk_key = f"trading:{self.base_url}:{message}"
+        stored = await disk_cache.aget(disk_key)
+        if stored is not None:
+            return QueryResponse(**stored)
+
+        response = await self._send(message, idempotent=True)
+        if response.role != "error":
+            await disk_cache.aset(
+                disk_key, response.model_dump(), settings.TRADING_CACHE_TTL_SECONDS
+            )
+        return response
+
+    async def _send(self, message: str, idempotent: bool = False) -> QueryResponse:
         request = QueryRequest(message=message)
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/api/agent/trade/chat",
-                    json=request.model_dump(),
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                data = response.json()
-                return QueryResponse(**data)
+            response = await self.backend.request(
+                "POST", "/api/agent/trade/chat", idempotent=idempotent, json=request.model_dump()
+            )
+            response.raise_for_status()
+            data = response.json()
+            return QueryResponse(**data)
                 
+        except (CircuitOpenError, BulkheadFullError) as e:
+            return QueryResponse(
+                role="error",
+                content=f"Trading API unavailable: {str(e)}"
+            )
         except httpx.RequestError as e:
             return QueryResponse(
                 role="error",
@@ -2,12 +2,15 @@ import json
 import logging
 import time
 import uuid
-from typing import Callable, Optional
+from typing import AsyncIterator, Callable, Optional
 from datetime import datetime, timezone
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from .config import settings
+from .usage import RequestUsage, record_request, usage_scope
+
 # Setup logger
 logger = logging.getLogger("http_middleware")
 logger.setLevel(logging.INFO)
@@ -55,8 +58,9 @@ class SimpleLoggingMiddleware(BaseHTTPMiddleware):
         }
         logger.info(json.dumps(request_log, ensure_ascii=False))
         
-        # Process request
-        response = await call_next(request)
+        # Process request; LLM and tool calls made for it are accounted to it
+        with usage_scope(record=False) as usage:
+            response = await call_next(request)
         
         # Calculate duration
         duration_ms = (time.perf_counter() - start_time) * 1000
@@ -71,18 +75,64 @@ class SimpleLoggingMiddleware(BaseHTTPMiddleware):
             "path": request.url.path,
             "status_code": response.status_code,
             "duration_ms": round(duration_ms, 2),
-            "body": self._filter_sensitive_data(response_body)
+            "body": self._filter_sensitive_data(response_body),
+            "llm_usage": usage.snapshot(),
         }
         
         # Log at appropriate level
         log_level = logging.ERROR if response.status_code >= 400 else logging.INFO
-        logger.log(log_level, json.dumps(response_log, ensure_ascii=False))
+        logger.log(
+            log_level,
+            json.dumps(response_log, ensure_ascii=False),
+            extra={"correlation_id": correlation_id, "llm_usage": response_log["llm_usage"]},
+        )
         
         # Add correlation ID to response headers
         response.headers["x-correlation-id"] = correlation_id
+        if settings.USAGE_IN_RESPONSE:
+            response.headers["x-llm-usage"] = json.dumps(
+                response_log["llm_usage"], separators=(",", ":")
+            )
+        
+        # Usage is recorded once the body is sent: streamed bodies keep calling
+        # the LLM after the headers went out
+        response.body_iterator = self._finish_usage(
+            response.body_iterator, usage, request, correlation_id, start_time
+        )
         
         return response
     
+    async def _finish_usage(
+        self,
+        body: AsyncIterator[bytes],
+        usage: RequestUsage,
+        request: Request,
+        correlation_id: str,
+        start_time: float,
+    ) -> AsyncIterator[bytes]:
+        """Records the request's usage once its body has been sent."""
+        before = usage.snapshot()
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            record_request(usage)
+            after = usage.snapshot()
+            if after != before:
+                stream_log = {
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "correlation_id": correlation_id,
+                    "event": "stream_end",
+                    "method": request.method,
+                    "path": request.url.path,
+                    "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+                    "llm_usage": after,
+                }
+                logger.info(
+                    json.dumps(stream_log, ensure_ascii=False),
+                    extra={"correlation_id": correlation_id, "llm_usage": after},
+                )
+    
     async def _get_request_body(self, request: Request) -> Optional[str]:
         """Get request body safely."""
         try:
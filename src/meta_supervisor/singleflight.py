@@ -0,0 +1,50 @@
+"""
+Single-flight coalescing of identical in-flight async calls.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one upstream call.
+
+    The first caller starts the call; later callers await the same task and
+    receive its result or exception. The key is released as soon as the call
+    finishes, so results are never served after the fact (that is a cache's
+    job). A cancelled waiter does not cancel the shared call.
+    """
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.calls = 0
+        self.upstream_calls = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.upstream_calls += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: "asyncio.Future[Any]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved when every waiter went away.
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.upstream_calls,
+            "saved_upstream_calls": self.calls - self.upstream_calls,
+            "in_flight": len(self._in_flight),
+        }
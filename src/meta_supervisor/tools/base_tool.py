@@ -1,22 +1,84 @@
+import copy
+import time
 from abc import ABC, abstractmethod
 from typing import Any
 from langchain.tools import BaseTool
 from pydantic import Field
 
+from ..config import settings
+from ..usage import record_tool_call
+from .memo import get_tool_memo, memo_key
+from .run_context import current_run_context
+
+_MISSING = object()
+
 
 class BaseAPITool(BaseTool, ABC):
     """
     Base class for API-based tools in the meta-supervisor.
+
+    Tools with `cacheable` set share their results across agent runs for
+    `cache_ttl` seconds, keyed on the validated `args_schema` input. Every
+    caller gets its own copy of a memoized result.
     """
 
     client: Any = Field(default=None, exclude=True)
+    cacheable: bool = False
+    cache_ttl: float = 0.0
 
     def __init__(self, client=None, **kwargs):
         super().__init__(**kwargs)
         self.__dict__["client"] = client
 
-    @abstractmethod
     async def _arun(self, **kwargs) -> Any:
+        """
+        Returns a memoized result when there is one; otherwise runs the tool
+        within the agent run's tool concurrency cap and timing. Either way
+        the call is added to the request's usage.
+        """
+        started = time.perf_counter()
+        cached = False
+        try:
+            if not (settings.TOOL_CACHE_ENABLED and self.cacheable and self.cache_ttl > 0):
+                return await self._run_in_context(**kwargs)
+            memo = get_tool_memo(self.name, self.cache_ttl)
+            if not self._may_cache(**kwargs):
+                memo.bypassed += 1
+                return await self._run_in_context(**kwargs)
+            key = memo_key(self.args_schema, kwargs)
+            result = memo.cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = await self._run_in_context(**kwargs)
+                if self._may_cache_result(result):
+                    memo.cache.set(key, copy.deepcopy(result))
+            else:
+                cached = True
+                result = copy.deepcopy(result)
+            return result
+        finally:
+            record_tool_call(time.perf_counter() - started, cached)
+
+    def _may_cache(self, **kwargs) -> bool:
+        """
+        Whether this particular call may be served from or stored in the cache.
+        """
+        return True
+
+    def _may_cache_result(self, result: Any) -> bool:
+        """
+        Whether a result is worth reusing; failures should not be.
+        """
+        return True
+
+    async def _run_in_context(self, **kwargs) -> Any:
+        context = current_run_context()
+        if context is None:
+            return await self._execute(**kwargs)
+        async with context.span(self.name):
+            return await self._execute(**kwargs)
+
+    @abstractmethod
+    async def _execute(self, **kwargs) -> Any:
         """
         Async implementation of the tool.
         """
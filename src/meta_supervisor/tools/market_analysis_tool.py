@@ -1,6 +1,7 @@
 from typing import Any, Dict
 from pydantic import BaseModel, Field
 
+from ..config import settings
 from .base_tool import BaseAPITool
 from ..services.market_analysis_service import MarketAnalysisService
 
@@ -23,15 +24,26 @@ class MarketAnalysisTool(BaseAPITool):
     description: str = "시장 분석 에이전트 - 기업 기본 분석, 산업 동향, 경제 지표, 시장 센티먼트를 분석합니다. Generate comprehensive market research reports including fundamental analysis, sector trends, economic indicators, company financials, and market sentiment analysis for investment decision support"
     args_schema: type[BaseModel] = MarketAnalysisInput
     service: MarketAnalysisService = Field(default=None, exclude=True)
+    cacheable: bool = True
+    cache_ttl: float = Field(default_factory=lambda: settings.MARKET_ANALYSIS_TOOL_CACHE_TTL_SECONDS)
 
-    def __init__(self):
-        service = MarketAnalysisService()
+    def __init__(self, service: MarketAnalysisService = None):
+        service = service or MarketAnalysisService()
         super().__init__(client=service)
         self.__dict__["service"] = service
 
-    async def _arun(self, query: str) -> Dict[str, Any]:
+    async def _execute(self, query: str) -> Dict[str, Any]:
         """
         Run market analysis for the given query.
         MarketAnalysisService를 통해 외부 API와 통신합니다.
         """
         return await self.service.analyze_market(query)
+
+    def _may_cache_result(self, result: Dict[str, Any]) -> bool:
+        # The fallback stands in for an unavailable backend, and a stale answer
+        # would get a fresh TTL here while the service is refreshing it.
+        return (
+            result.get("source") != "fallback"
+            and result.get("cache_status") != "stale"
+            and "error" not in result
+        )
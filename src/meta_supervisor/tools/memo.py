@@ -0,0 +1,66 @@
+"""
+Result memoization for agent tools, shared by all agent runs.
+
+Each tool gets its own cache, so TTLs and hit rates are per tool. Keys are
+the tool's validated `args_schema` input with whitespace in string values
+collapsed, so calls the schema considers equal share one entry.
+"""
+
+import json
+import re
+import threading
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+from ..cache import TTLCache
+from ..config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return _WHITESPACE.sub(" ", value).strip()
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def memo_key(args_schema: Optional[type], kwargs: Dict[str, Any]) -> str:
+    """Canonical key for one tool input."""
+    if isinstance(args_schema, type) and issubclass(args_schema, BaseModel):
+        kwargs = args_schema(**kwargs).model_dump()
+    return json.dumps(_normalize(kwargs), sort_keys=True, ensure_ascii=False, default=str)
+
+
+class ToolMemo:
+    """One tool's result cache plus a count of calls it may not cache."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.cache = TTLCache(max_entries=max_entries, ttl=ttl)
+        self.bypassed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "ttl": self.cache.ttl, "bypassed": self.bypassed}
+
+
+_memos: Dict[str, ToolMemo] = {}
+_memos_lock = threading.Lock()
+
+
+def get_tool_memo(tool: str, ttl: float) -> ToolMemo:
+    """Returns the process-wide result cache for `tool`."""
+    with _memos_lock:
+        memo = _memos.get(tool)
+        if memo is None:
+            memo = _memos[tool] = ToolMemo(ttl, settings.TOOL_CACHE_MAX_ENTRIES)
+        return memo
+
+
+def tool_memo_stats() -> Dict[str, Any]:
+    with _memos_lock:
+        memos = dict(_memos)
+    return {tool: memo.stats() for tool, memo in memos.items()}
@@ -0,0 +1,105 @@
+"""
+Per-request context for the tool calls of one agent run.
+
+LangGraph's tool node runs all tool calls of one LLM turn concurrently. The
+context caps how many of them may execute at once and records a span per
+call, so each request can report how long its tools would have taken back
+to back (serial) against the wall-clock time they actually took.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+_current: ContextVar[Optional["ToolRunContext"]] = ContextVar("tool_run_context", default=None)
+
+
+class ToolRunContext:
+    def __init__(self, max_parallel: int = 4):
+        self.max_parallel = max(1, max_parallel)
+        self._slots = asyncio.Semaphore(self.max_parallel)
+        # (tool name, started, finished) per call, perf_counter seconds
+        self.spans: List[Tuple[str, float, float]] = []
+
+    @asynccontextmanager
+    async def span(self, tool: str) -> AsyncIterator[None]:
+        """Runs one tool call inside the concurrency cap and records its span."""
+        async with self._slots:
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.spans.append((tool, started, time.perf_counter()))
+
+    def timing(self) -> Dict[str, Any]:
+        serial = sum(end - start for _, start, end in self.spans)
+        wall = 0.0
+        peak = 0
+        covered_until = float("-inf")
+        for _, start, end in sorted(self.spans, key=lambda span: span[1]):
+            # Union of the spans: overlapping time is counted once.
+            if end > covered_until:
+                wall += end - max(start, covered_until)
+                covered_until = end
+            peak = max(peak, sum(1 for _, s, e in self.spans if s <= start < e))
+        return {
+            "tool_calls": len(self.spans),
+            "peak_parallel": peak,
+            "serial_ms": round(serial * 1000, 3),
+            "wall_ms": round(wall * 1000, 3),
+            "saved_ms": round((serial - wall) * 1000, 3),
+        }
+
+
+def current_run_context() -> Optional[ToolRunContext]:
+    return _current.get()
+
+
+@contextmanager
+def tool_run_context(max_parallel: int) -> Iterator[ToolRunContext]:
+    """Installs a fresh context for the tool calls of one agent run."""
+    context = ToolRunContext(max_parallel)
+    token = _current.set(context)
+    try:
+        yield context
+    finally:
+        _current.reset(token)
+        tool_timing_stats.record(context)
+
+
+class ToolTimingStats:
+    """Process-wide totals of serial vs wall-clock tool time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.runs_with_parallel_calls = 0
+        self.tool_calls = 0
+        self.serial_ms = 0.0
+        self.wall_ms = 0.0
+
+    def record(self, context: ToolRunContext) -> None:
+        timing = context.timing()
+        with self._lock:
+            self.runs += 1
+            self.runs_with_parallel_calls += timing["peak_parallel"] > 1
+            self.tool_calls += timing["tool_calls"]
+            self.serial_ms += timing["serial_ms"]
+            self.wall_ms += timing["wall_ms"]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "runs_with_parallel_calls": self.runs_with_parallel_calls,
+                "tool_calls": self.tool_calls,
+                "serial_ms": round(self.serial_ms, 3),
+                "wall_ms": round(self.wall_ms, 3),
+                "saved_ms": round(self.serial_ms - self.wall_ms, 3),
+            }
+
+
+tool_timing_stats = ToolTimingStats()
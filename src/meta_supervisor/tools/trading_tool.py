@@ -4,8 +4,13 @@ Trading Tool for message-based API interaction.
 from typing import Dict, Any
 from pydantic import BaseModel, Field
 
+from ..config import settings
 from .base_tool import BaseAPITool
-from ..services.trading_service import TradingService
+from ..services.trading_service import (
+    TradingService,
+    is_account_message,
+    is_read_only_message,
+)
 
 
 class TradingInput(BaseModel):
@@ -27,13 +32,23 @@ class TradingTool(BaseAPITool):
     description: str = "매매 에이전트 - 주식 거래, 차트 분석, 기술적 지표 분석을 수행합니다. Execute trading strategies, chart analysis, technical indicators (RSI, MACD, Bollinger Bands), price pattern recognition, portfolio management, and risk assessment for informed trading decisions"
     args_schema: type[BaseModel] = TradingInput
     service: TradingService = Field(default=None, exclude=True)
+    # Only read-only messages are cached; orders and account questions always
+    # reach the backend.
+    cacheable: bool = True
+    cache_ttl: float = Field(default_factory=lambda: settings.TRADING_TOOL_CACHE_TTL_SECONDS)
     
-    def __init__(self):
-        service = TradingService()
+    def __init__(self, service: TradingService = None):
+        service = service or TradingService()
         super().__init__(client=service)
         self.__dict__["service"] = service
     
-    async def _arun(self, message: str) -> Dict[str, Any]:
+    def _may_cache(self, message: str) -> bool:
+        return is_read_only_message(message) and not is_account_message(message)
+
+    def _may_cache_result(self, result: Dict[str, Any]) -> bool:
+        return result["success"]
+
+    async def _execute(self, message: str) -> Dict[str, Any]:
         """
         Send a trading query message.
         
@@ -44,7 +59,9 @@ class TradingTool(BaseAPITool):
             Dictionary with role, content, and success status
         """
         try:
-            response = await self.service.send_query(message)
+            response = await self.service.send_query(
+                message, read_only=is_read_only_message(message)
+            )
             
             return {
                 "role": response.role,
@@ -0,0 +1,268 @@
+"""
+Per-request accounting of LLM and tool usage.
+
+`usage_scope()` installs a `RequestUsage` for the current request (the
+logging middleware opens one per HTTP request). `UsageCallbackHandler`,
+attached to the shared ChatOpenAI client, adds every LLM call's tokens,
+estimated cost and wall time to it, and `BaseAPITool` adds every tool call.
+Counters are also aggregated process-wide as calls finish; per-request
+histograms are recorded when the scope closes.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from .config import settings
+from .metrics import Histogram, LatencyStats
+
+_current: ContextVar[Optional["RequestUsage"]] = ContextVar("request_usage", default=None)
+
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+LLM_CALL_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12)
+
+
+def llm_cost(prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost at the configured per-million-token prices."""
+    return (
+        prompt_tokens * settings.LLM_PROMPT_PRICE_PER_1M_TOKENS
+        + completion_tokens * settings.LLM_COMPLETION_PRICE_PER_1M_TOKENS
+    ) / 1_000_000
+
+
+class RequestUsage:
+    """LLM and tool usage of one request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.llm_errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.llm_seconds = 0.0
+        self.tool_calls = 0
+        self.tool_cache_hits = 0
+        self.tool_seconds = 0.0
+        self.models: Dict[str, int] = {}
+
+    def add_llm_call(
+        self, model: str, prompt_tokens: int, completion_tokens: int, seconds: float, error: bool
+    ) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_errors += error
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost_usd += llm_cost(prompt_tokens, completion_tokens)
+            self.llm_seconds += seconds
+            self.models[model] = self.models.get(model, 0) + 1
+
+    def add_tool_call(self, seconds: float, cached: bool) -> None:
+        with self._lock:
+            self.tool_calls += 1
+            self.tool_cache_hits += cached
+            self.tool_seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "llm_calls": self.llm_calls,
+                "llm_errors": self.llm_errors,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": self.prompt_tokens + self.completion_tokens,
+                "cost_usd": round(self.cost_usd, 6),
+                # Summed per call; concurrent calls can exceed the request's wall time.
+                "llm_ms": round(self.llm_seconds * 1000, 3),
+                "tool_calls": self.tool_calls,
+                "tool_cache_hits": self.tool_cache_hits,
+                "tool_ms": round(self.tool_seconds * 1000, 3),
+                "models": dict(self.models),
+            }
+
+
+def current_usage() -> Optional[RequestUsage]:
+    return _current.get()
+
+
+@contextmanager
+def usage_scope(record: bool = True) -> Iterator[RequestUsage]:
+    """
+    Collects the LLM and tool usage of the code run inside it, including
+    tasks started there. With `record` False the caller records the usage
+    (e.g. after a streamed response finishes).
+    """
+    usage = RequestUsage()
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+        if record:
+            record_request(usage)
+
+
+def record_request(usage: RequestUsage) -> None:
+    """Adds a finished request to the per-request histograms."""
+    usage_stats.record_request(usage)
+
+
+def record_tool_call(seconds: float, cached: bool = False) -> None:
+    usage = _current.get()
+    if usage is not None:
+        usage.add_tool_call(seconds, cached)
+    usage_stats.record_tool_call(seconds, cached)
+
+
+def _token_counts(response: LLMResult) -> Tuple[int, int]:
+    prompt_tokens = completion_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if metadata:
+                prompt_tokens += metadata.get("input_tokens", 0)
+                completion_tokens += metadata.get("output_tokens", 0)
+    if not prompt_tokens and not completion_tokens:
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = token_usage.get("prompt_tokens") or 0
+        completion_tokens = token_usage.get("completion_tokens") or 0
+    return prompt_tokens, completion_tokens
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """Feeds LLM calls into the current request's usage and the process totals."""
+
+    # Runs on the caller's task, where the request's context variable is set.
+    run_inline = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # run id -> (model, started)
+        self._runs: Dict[UUID, Tuple[str, float]] = {}
+
+    def on_chat_model_start(
+        self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._start(run_id, serialized, kwargs.get("metadata"))
+
+    def on_llm_start(
+        self, serialized: Dict[str, Any], prompts: Any, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._start(run_id, serialized, kwargs.get("metadata"))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        model, seconds = self._finish(run_id)
+        model = (response.llm_output or {}).get("model_name") or model
+        prompt_tokens, completion_tokens = _token_counts(response)
+        self._record(model, prompt_tokens, completion_tokens, seconds, error=False)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        model, seconds = self._finish(run_id)
+        self._record(model, 0, 0, seconds, error=True)
+
+    def _start(
+        self,
+        run_id: UUID,
+        serialized: Optional[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]],
+    ) -> None:
+        model = (metadata or {}).get("ls_model_name") or (serialized or {}).get("name")
+        with self._lock:
+            self._runs[run_id] = (model or "unknown", time.perf_counter())
+
+    def _finish(self, run_id: UUID) -> Tuple[str, float]:
+        with self._lock:
+            model, started = self._runs.pop(run_id, ("unknown", None))
+        return model, time.perf_counter() - started if started is not None else 0.0
+
+    def _record(
+        self, model: str, prompt_tokens: int, completion_tokens: int, seconds: float, error: bool
+    ) -> None:
+        usage = _current.get()
+        if usage is not None:
+            usage.add_llm_call(model, prompt_tokens, completion_tokens, seconds, error)
+        usage_stats.record_llm_call(prompt_tokens, completion_tokens, seconds, error)
+
+
+class UsageStats:
+    """Process-wide LLM and tool usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.llm_errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.tool_calls = 0
+        self.tool_cache_hits = 0
+        self.requests = 0
+        self.llm_call_latency = LatencyStats()
+        self.tool_call_latency = LatencyStats()
+        self.request_llm_time = LatencyStats()
+        self.request_tool_time = LatencyStats()
+        self.request_tokens = Histogram(TOKEN_BUCKETS)
+        self.request_llm_calls = Histogram(LLM_CALL_BUCKETS)
+
+    def record_llm_call(
+        self, prompt_tokens: int, completion_tokens: int, seconds: float, error: bool
+    ) -> None:
+        self.llm_call_latency.observe(seconds)
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_errors += error
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cost_usd += llm_cost(prompt_tokens, completion_tokens)
+
+    def record_tool_call(self, seconds: float, cached: bool) -> None:
+        self.tool_call_latency.observe(seconds)
+        with self._lock:
+            self.tool_calls += 1
+            self.tool_cache_hits += cached
+
+    def record_request(self, usage: RequestUsage) -> None:
+        # Requests that never reached an LLM or tool would only dilute the histograms.
+        if not usage.llm_calls and not usage.tool_calls:
+            return
+        with self._lock:
+            self.requests += 1
+        self.request_llm_time.observe(usage.llm_seconds)
+        self.request_tool_time.observe(usage.tool_seconds)
+        self.request_tokens.observe(usage.prompt_tokens + usage.completion_tokens)
+        self.request_llm_calls.observe(usage.llm_calls)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            totals = {
+                "requests": self.requests,
+                "llm_calls": self.llm_calls,
+                "llm_errors": self.llm_errors,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "cost_usd": round(self.cost_usd, 6),
+                "tool_calls": self.tool_calls,
+                "tool_cache_hits": self.tool_cache_hits,
+            }
+        return {
+            **totals,
+            "llm_call_latency": self.llm_call_latency.snapshot(),
+            "tool_call_latency": self.tool_call_latency.snapshot(),
+            "per_request": {
+                "llm_time": self.request_llm_time.snapshot(),
+                "tool_time": self.request_tool_time.snapshot(),
+                "tokens": self.request_tokens.snapshot(),
+                "llm_calls": self.request_llm_calls.snapshot(),
+            },
+        }
+
+
+usage_stats = UsageStats()
+usage_callback = UsageCallbackHandler()
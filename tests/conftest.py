@@ -3,6 +3,7 @@ Pytest configuration and fixtures for FinAgent Meta-Supervisor tests.
 """
 
 import os
+import sys
 import pytest
 from unittest.mock import patch
 
@@ -12,6 +13,13 @@ os.environ.setdefault("MARKET_ANALYSIS_API_BASE_URL", "http://localhost:8001/tes
 os.environ.setdefault("TRADING_STRATEGY_API_BASE_URL", "http://localhost:8002/test")
 os.environ.setdefault("MAIN_LLM_MODEL", "gpt-4o-mini")
 os.environ.setdefault("ENVIRONMENT", "testing")
+# Tests must not share answers through the on-disk cache.
+os.environ.setdefault("PERSISTENT_CACHE_ENABLED", "false")
+# Agent tests script the LLM turns; tests that exercise the fast path turn it on.
+os.environ.setdefault("NLU_FAST_PATH_MODE", "off")
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -29,6 +37,31 @@ def setup_test_environment():
         yield
 
 
+def _reset_shared_state():
+    from meta_supervisor.clients import adaptive_limit, backend, bulkhead, circuit_breaker
+    from meta_supervisor.services import agent_service, market_analysis_service, session_store
+
+    market_analysis_service.response_cache.clear()
+    agent_service.answer_cache.clear()
+    session_store.get_session_store().clear()
+    # The agent imports its tools as src.meta_supervisor.tools.
+    for name in ("meta_supervisor.tools.memo", "src.meta_supervisor.tools.memo"):
+        if name in sys.modules:
+            sys.modules[name]._memos.clear()
+    circuit_breaker._breakers.clear()
+    backend._endpoints.clear()
+    bulkhead._bulkheads.clear()
+    adaptive_limit._limiters.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state():
+    """Keep cached answers and per-backend resilience state from leaking between tests."""
+    _reset_shared_state()
+    yield
+    _reset_shared_state()
+
+
 @pytest.fixture
 def mock_environment():
     """Provide a clean environment for individual tests."""
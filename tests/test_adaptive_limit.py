@@ -0,0 +1,118 @@
+"""
+Test suite for AIMD concurrency limits.
+"""
+
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.clients.adaptive_limit import AdaptiveLimiter, adaptive_limit_stats
+from meta_supervisor.clients.backend import BackendClient
+from meta_supervisor.clients.bulkhead import Bulkhead
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(clock=None, **overrides):
+    # Judge every call on its own against the first, unless a test says otherwise.
+    options = dict(initial_limit=4, min_limit=2, max_limit=10, min_samples=1, smoothing=1.0)
+    options.update(overrides)
+    bulkhead = Bulkhead("backend", max_concurrent=10)
+    return AdaptiveLimiter(bulkhead, clock=clock or FakeClock(), **options)
+
+
+class TestAdaptiveLimiter:
+    """Test additive increase and multiplicative decrease."""
+
+    def test_grows_additively_while_latency_is_at_baseline(self):
+        limiter = make_limiter()
+        for _ in range(5):
+            limiter.record(0.1, True, in_flight=4)
+
+        assert limiter.limit == 5
+        assert limiter.bulkhead.capacity == 5
+
+        for _ in range(100):
+            limiter.record(0.1, True, in_flight=limiter.limit)
+        assert limiter.limit == 10  # never above max_limit
+
+    def test_does_not_grow_while_mostly_idle(self):
+        limiter = make_limiter()
+        for _ in range(20):
+            limiter.record(0.1, True, in_flight=1)
+
+        assert limiter.limit == 4
+
+    def test_cuts_multiplicatively_on_latency_rise_and_errors(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock, initial_limit=10)
+        limiter.record(0.1, True, in_flight=10)
+
+        limiter.record(0.5, True, in_flight=10)
+        assert limiter.limit == 7
+        clock.now += 1
+        limiter.record(0.1, False, in_flight=7)
+        assert limiter.limit == 4
+        clock.now += 1
+        limiter.record(0.1, False, in_flight=4)
+        clock.now += 1
+        limiter.record(0.1, False, in_flight=4)
+        assert limiter.limit == 2  # never below min_limit
+        assert limiter.bulkhead.capacity == 2
+
+    def test_cuts_at_most_once_per_round_trip(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock, initial_limit=10)
+        for _ in range(5):
+            limiter.record(1.0, False, in_flight=10)
+
+        assert limiter.limit == 7
+        assert limiter.stats()["decreases"] == 1
+
+    def test_one_slow_call_of_a_noisy_endpoint_is_not_congestion(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock, initial_limit=10, min_samples=20, smoothing=0.1)
+        for latency in [3.0, 5.0, 10.0, 2.0, 30.0, 4.0, 8.0, 3.0, 25.0, 6.0] * 4:
+            clock.now += latency
+            limiter.record(latency, True, in_flight=10)
+
+        assert limiter.stats()["decreases"] == 0
+
+    def test_sustained_latency_rise_is_congestion(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock, initial_limit=10, min_samples=20, smoothing=0.1)
+        for latency in [5.0] * 200 + [20.0] * 20:
+            clock.now += latency
+            limiter.record(latency, True, in_flight=10)
+
+        assert limiter.stats()["decreases"] >= 1
+
+    def test_baselines_are_per_endpoint(self):
+        limiter = make_limiter(initial_limit=10, min_samples=5, smoothing=0.5)
+        for _ in range(10):
+            limiter.record(0.2, True, in_flight=10, endpoint="/quote")
+            limiter.record(30.0, True, in_flight=10, endpoint="/analyze")
+
+        assert limiter.stats()["decreases"] == 0
+        assert limiter.baseline("/quote") == pytest.approx(0.2)
+        assert limiter.baseline("/analyze") == pytest.approx(30.0)
+
+    def test_backend_client_feeds_its_limiter(self):
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+
+        assert client.limiter is not None
+        assert client.bulkhead.capacity == client.limiter.limit
+        assert adaptive_limit_stats()["stub"]["limit"] == client.limiter.limit
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -56,6 +56,18 @@ class TestAPIEndpoints:
         data = response.json()
         assert "detail" in data
 
+    def test_batch_analysis_rejects_oversized_batch(self, client):
+        """Test /api/analyze/batch refuses batches above the configured limit."""
+        response = client.post(
+            "/api/analyze/batch",
+            json={"queries": ["삼성전자 주가 분석"] * 1001}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is False
+        assert data["error_code"] == "BATCH_TOO_LARGE"
+
 
 class TestSchemaValidation:
     """Test Pydantic schema validation."""
@@ -0,0 +1,222 @@
+"""
+Test suite for backend requests: adaptive timeouts, hedging and retries.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.clients import backend, http
+from meta_supervisor.clients.backend import (
+    BackendClient,
+    backend_stats,
+    backoff_delay,
+    get_endpoint_stats,
+)
+from meta_supervisor.clients.http import HTTPTransport
+from meta_supervisor.config import settings
+
+
+@pytest.fixture
+def latency_backend(monkeypatch):
+    """Stub backend answering after an injected per-request delay."""
+    delays = []
+    read_timeouts = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        read_timeouts.append(request.extensions["timeout"]["read"])
+        delay = delays.pop(0) if delays else 0.005
+        if isinstance(delay, Exception):
+            raise delay
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"ok": True})
+
+    monkeypatch.setattr(http, "_transport", HTTPTransport(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(settings, "BACKEND_TIMEOUT_MIN_SAMPLES", 10)
+    monkeypatch.setattr(settings, "BACKEND_TIMEOUT_FLOOR_SECONDS", 0.5)
+    return delays, read_timeouts
+
+
+async def warm_up(client: BackendClient, endpoint: str, calls: int = 10) -> None:
+    for _ in range(calls):
+        await client.request("GET", endpoint)
+
+
+class TestAdaptiveTimeouts:
+    """Test that timeouts follow observed latency."""
+
+    async def test_fixed_timeout_until_enough_samples(self, latency_backend):
+        _, read_timeouts = latency_backend
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+
+        await warm_up(client, "/fast", calls=9)
+        assert read_timeouts[-1] == 30.0
+
+        await warm_up(client, "/fast", calls=2)
+        assert read_timeouts[-1] == 0.5  # tail latency x multiplier, raised to the floor
+
+    async def test_timeouts_are_tracked_per_endpoint(self, latency_backend, monkeypatch):
+        delays, _ = latency_backend
+        monkeypatch.setattr(settings, "BACKEND_TIMEOUT_FLOOR_SECONDS", 0.001)
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+        delays.extend([0.05] * 10)
+
+        await warm_up(client, "/slow")
+        await warm_up(client, "/fast")
+
+        assert client.timeout_for("/slow") > client.timeout_for("/fast")
+        assert client.timeout_for("/other") == 30.0
+
+    async def test_timeouts_widen_until_the_backend_answers(self, latency_backend):
+        delays, read_timeouts = latency_backend
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+        await warm_up(client, "/slow")
+        delays.extend([httpx.ReadTimeout("timed out")] * 2)
+
+        for _ in range(2):
+            with pytest.raises(httpx.ReadTimeout):
+                await client.request("POST", "/slow")
+        await client.request("POST", "/slow")
+
+        # Each timeout is a sample at the timeout and doubles the next one.
+        assert read_timeouts[-3:] == [0.5, 3.0, 30.0]
+        stats = get_endpoint_stats("stub", "/slow")
+        assert (stats.timeouts, stats.consecutive_timeouts) == (2, 0)
+        assert client.timeout_for("/slow") > 0.5
+
+    async def test_disabled_adaptive_timeouts(self, latency_backend, monkeypatch):
+        monkeypatch.setattr(settings, "BACKEND_ADAPTIVE_TIMEOUTS", False)
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+        await warm_up(client, "/fast")
+
+        assert client.timeout_for("/fast") == 30.0
+
+
+class TestHedging:
+    """Test hedged requests for idempotent calls."""
+
+    async def test_slow_idempotent_call_is_hedged(self, latency_backend, monkeypatch):
+        delays, _ = latency_backend
+        monkeypatch.setattr(settings, "BACKEND_HEDGING", True)
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+        await warm_up(client, "/query")
+
+        delays.extend([1.0, 0.005])  # the first attempt hangs, the hedge is fast
+        started = time.perf_counter()
+        response = await client.request("POST", "/query", idempotent=True)
+
+        assert response.status_code == 200
+        assert time.perf_counter() - started < 0.5
+        stats = get_endpoint_stats("stub", "/query")
+        assert (stats.hedged, stats.hedge_wins) == (1, 1)
+
+    async def test_non_idempotent_call_is_not_hedged(self, latency_backend, monkeypatch):
+        delays, read_timeouts = latency_backend
+        monkeypatch.setattr(settings, "BACKEND_HEDGING", True)
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+        await warm_up(client, "/order")
+
+        delays.append(0.1)
+        await client.request("POST", "/order")
+
+        assert len(read_timeouts) == 11
+        assert backend_stats()["stub"]["/order"]["hedged"] == 0
+
+    async def test_fast_call_is_not_hedged(self, latency_backend, monkeypatch):
+        monkeypatch.setattr(settings, "BACKEND_HEDGING", True)
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+        await warm_up(client, "/query")
+
+        await client.request("GET", "/query")
+
+        assert get_endpoint_stats("stub", "/query").hedged == 0
+
+
+class TestRetries:
+    """Test bounded retries of transient failures."""
+
+    @pytest.fixture
+    def flaky_backend(self, monkeypatch):
+        outcomes = []
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            outcome = outcomes.pop(0) if outcomes else 200
+            if outcome == "connect":
+                raise httpx.ConnectError("connection refused", request=request)
+            if outcome == "read_timeout":
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(outcome, json={"ok": outcome == 200})
+
+        monkeypatch.setattr(http, "_transport", HTTPTransport(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(settings, "BACKEND_RETRY_BASE_DELAY", 0.001)
+        return outcomes, calls
+
+    async def test_idempotent_call_is_retried_until_success(self, flaky_backend):
+        outcomes, calls = flaky_backend
+        outcomes.extend(["connect", 503])
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+
+        response = await client.request("GET", "/quote")
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        assert get_endpoint_stats("stub", "/quote").retries == 2
+
+    async def test_retries_are_bounded(self, flaky_backend):
+        outcomes, calls = flaky_backend
+        outcomes.extend([503] * 10)
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+
+        response = await client.request("GET", "/quote")
+
+        assert response.status_code == 503
+        assert len(calls) == settings.BACKEND_RETRY_ATTEMPTS + 1
+
+    async def test_non_idempotent_and_client_errors_are_not_retried(self, flaky_backend):
+        outcomes, calls = flaky_backend
+        outcomes.extend(["connect", 404])
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+
+        with pytest.raises(httpx.ConnectError):
+            await client.request("POST", "/order")
+        assert (await client.request("GET", "/quote")).status_code == 404
+        assert len(calls) == 2
+
+    async def test_read_timeouts_are_not_retried(self, flaky_backend):
+        outcomes, calls = flaky_backend
+        outcomes.append("read_timeout")
+        client = BackendClient("stub", "http://stub", timeout=30.0)
+
+        with pytest.raises(httpx.ReadTimeout):
+            await client.request("GET", "/quote")
+        assert len(calls) == 1
+
+    async def test_retries_stop_at_the_configured_timeout(self, flaky_backend, monkeypatch):
+        outcomes, calls = flaky_backend
+        outcomes.extend([503] * 10)
+        monkeypatch.setattr(backend, "backoff_delay", lambda retry, base, cap: 0.2)
+        client = BackendClient("stub", "http://stub", timeout=0.1)
+
+        response = await client.request("GET", "/quote")
+
+        assert response.status_code == 503
+        assert len(calls) == 1
+
+    def test_backoff_is_jittered_and_capped(self):
+        delays = [backoff_delay(5, base=0.1, cap=1.0) for _ in range(200)]
+
+        assert all(0 <= delay <= 1.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,103 @@
+"""
+Test suite for per-backend concurrency bulkheads.
+"""
+
+import asyncio
+
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.clients.bulkhead import Bulkhead, BulkheadFullError
+
+
+async def hold(bulkhead: Bulkhead, release: asyncio.Event, order: list, tag: int) -> None:
+    async with bulkhead.slot():
+        order.append(tag)
+        await release.wait()
+
+
+class TestBulkhead:
+    """Test the concurrency cap and the bounded wait queue."""
+
+    async def test_caps_concurrency_and_admits_in_order(self):
+        bulkhead = Bulkhead("backend", max_concurrent=2, max_queue=10, queue_timeout=1.0)
+        release = asyncio.Event()
+        order = []
+
+        tasks = [asyncio.ensure_future(hold(bulkhead, release, order, i)) for i in range(5)]
+        await asyncio.sleep(0.01)
+        assert order == [0, 1]
+        assert bulkhead.stats()["queue_depth"] == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2, 3, 4]
+        assert bulkhead.stats()["active"] == 0
+        assert bulkhead.stats()["admitted"] == 5
+
+    async def test_rejects_when_queue_is_full(self):
+        bulkhead = Bulkhead("backend", max_concurrent=1, max_queue=1, queue_timeout=1.0)
+        release = asyncio.Event()
+        tasks = [asyncio.ensure_future(hold(bulkhead, release, [], i)) for i in range(2)]
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(BulkheadFullError):
+            await bulkhead.acquire()
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert bulkhead.stats()["rejected_queue_full"] == 1
+
+    async def test_rejects_after_queue_timeout(self):
+        bulkhead = Bulkhead("backend", max_concurrent=1, max_queue=5, queue_timeout=0.02)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(bulkhead, release, [], 0))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(BulkheadFullError):
+            await bulkhead.acquire()
+
+        assert bulkhead.stats()["queue_depth"] == 0
+        assert bulkhead.stats()["rejected_timeout"] == 1
+        release.set()
+        await holder
+        assert bulkhead.stats()["active"] == 0
+
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        bulkhead = Bulkhead("backend", max_concurrent=1, max_queue=5, queue_timeout=1.0)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(bulkhead, release, [], 0))
+        await asyncio.sleep(0.01)
+
+        waiter = asyncio.ensure_future(bulkhead.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+
+        assert bulkhead.stats()["queue_depth"] == 0
+        release.set()
+        await holder
+        assert bulkhead.stats()["active"] == 0
+
+    async def test_raising_capacity_admits_waiters(self):
+        bulkhead = Bulkhead("backend", max_concurrent=1, max_queue=5, queue_timeout=1.0)
+        release = asyncio.Event()
+        order = []
+        tasks = [asyncio.ensure_future(hold(bulkhead, release, order, i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        assert order == [0]
+
+        bulkhead.set_capacity(3)
+        await asyncio.sleep(0.01)
+        assert order == [0, 1, 2]
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,182 @@
+"""
+Test suite for the in-process caches.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.cache import AsyncTTLCache, TTLCache
+from meta_supervisor.services import market_analysis_service
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Test the LRU/TTL cache."""
+
+    def test_hit_and_miss_counters(self):
+        cache = TTLCache(max_entries=10)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(max_entries=10, ttl=5, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=20)
+
+        clock.now = 10
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.stats()["expirations"] == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_memory_cap(self):
+        cache = TTLCache(
+            max_entries=100, max_bytes=10, sizeof=lambda key, value: len(value)
+        )
+        cache.set("a", "xxxx")
+        cache.set("b", "xxxx")
+        cache.set("c", "xxxx")
+
+        assert len(cache) == 2
+        assert cache.stats()["bytes"] == 8
+        # A single value larger than the cap is never stored.
+        cache.set("d", "x" * 11)
+        assert cache.get("d") is None
+
+
+class TestAsyncTTLCache:
+    """Test stale-while-revalidate behaviour."""
+
+    async def test_fresh_stale_and_expired(self):
+        clock = FakeClock()
+        cache = AsyncTTLCache(ttl=10, stale_ttl=20, clock=clock)
+        versions = iter(["v1", "v2", "v3"])
+
+        async def load():
+            return next(versions)
+
+        assert await cache.get_or_load("k", load) == ("v1", "miss")
+        clock.now = 5
+        assert await cache.get_or_load("k", load) == ("v1", "fresh")
+
+        clock.now = 15
+        assert await cache.get_or_load("k", load) == ("v1", "stale")
+        await asyncio.sleep(0)
+        assert await cache.get_or_load("k", load) == ("v2", "fresh")
+
+        clock.now = 100
+        assert await cache.get_or_load("k", load) == ("v3", "miss")
+        assert cache.stats()["refreshes"] == 1
+
+    async def test_failed_refresh_keeps_stale_value(self):
+        clock = FakeClock()
+        cache = AsyncTTLCache(ttl=10, stale_ttl=20, clock=clock)
+        cache.set("k", "old")
+
+        async def fail():
+            raise RuntimeError("backend down")
+
+        clock.now = 15
+        assert await cache.get_or_load("k", fail) == ("old", "stale")
+        await asyncio.sleep(0)
+        assert await cache.get_or_load("k", fail) == ("old", "stale")
+        assert cache.stats()["refresh_failures"] >= 1
+
+    async def test_refresh_tasks_are_kept_until_done(self):
+        clock = FakeClock()
+        cache = AsyncTTLCache(ttl=10, stale_ttl=20, clock=clock)
+        cache.set("k", "old")
+        release = asyncio.Event()
+
+        async def slow_load():
+            await release.wait()
+            return "new"
+
+        clock.now = 15
+        await cache.get_or_load("k", slow_load)
+        assert len(cache._refresh_tasks) == 1
+
+        release.set()
+        await asyncio.sleep(0.01)
+        assert not cache._refresh_tasks
+        assert await cache.get_or_load("k", slow_load) == ("new", "fresh")
+
+    async def test_loader_errors_are_not_cached(self):
+        cache = AsyncTTLCache(ttl=10)
+
+        async def fail():
+            raise RuntimeError("backend down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", fail)
+        assert cache.stats()["entries"] == 0
+
+
+class TestMarketAnalysisCache:
+    """Test that market analysis answers are cached and marked."""
+
+    async def test_repeat_query_is_served_from_cache(self, monkeypatch):
+        service = market_analysis_service.MarketAnalysisService()
+        calls = []
+
+        async def fake_request(method, endpoint, params=None, json=None):
+            calls.append(json)
+            return {"answer": "report", "timestamp": "2025-01-01T00:00:00"}
+
+        monkeypatch.setattr(service, "_request", fake_request)
+
+        first = await service.analyze_market("삼성전자 전망")
+        second = await service.analyze_market("삼성전자  전망")
+
+        assert len(calls) == 1
+        assert "cached" not in first
+        assert second["answer"] == "report"
+        assert second["cached"] is True
+        assert second["cache_status"] == "fresh"
+
+    async def test_fallback_is_not_cached(self, monkeypatch):
+        service = market_analysis_service.MarketAnalysisService()
+        calls = []
+
+        async def failing_request(method, endpoint, params=None, json=None):
+            calls.append(json)
+            raise Exception("Market Analysis API request failed")
+
+        monkeypatch.setattr(service, "_request", failing_request)
+
+        assert (await service.analyze_market("삼성전자 전망"))["source"] == "fallback"
+        assert (await service.analyze_market("삼성전자 전망"))["source"] == "fallback"
+        assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
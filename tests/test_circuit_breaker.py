@@ -0,0 +1,149 @@
+"""
+Test suite for per-backend circuit breakers.
+"""
+
+import time
+
+import httpx
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.clients import http
+from meta_supervisor.clients.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    circuit_breaker_stats,
+)
+from meta_supervisor.clients.http import HTTPTransport
+from meta_supervisor.services.market_analysis_service import MarketAnalysisService
+from meta_supervisor.services.trading_service import TradingService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock, **overrides):
+    options = dict(
+        window_seconds=10, min_calls=4, error_rate_threshold=0.5,
+        slow_call_seconds=1.0, slow_call_rate_threshold=0.5, open_seconds=5,
+    )
+    options.update(overrides)
+    return CircuitBreaker("backend", clock=clock, **options)
+
+
+class TestCircuitBreaker:
+    """Test state transitions."""
+
+    def test_opens_on_error_rate(self):
+        breaker = make_breaker(FakeClock())
+        for success in (True, False, True, False):
+            breaker.before_call()
+            breaker.record(success, 0.1)
+
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.stats()["rejected"] == 1
+
+    def test_opens_on_slow_calls(self):
+        breaker = make_breaker(FakeClock())
+        for duration in (2.0, 2.0, 0.1, 0.1):
+            breaker.record(True, duration)
+
+        assert breaker.state == "open"
+
+    def test_old_failures_leave_the_window(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        breaker.record(False, 0.1)
+        breaker.record(False, 0.1)
+        clock.now = 20
+        for _ in range(3):
+            breaker.record(True, 0.1)
+        breaker.record(False, 0.1)
+
+        assert breaker.state == "closed"
+
+    def test_half_open_probe_closes_or_reopens(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock, min_calls=1)
+        breaker.record(False, 0.1)
+        clock.now = 6
+
+        assert breaker.state == "half_open"
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # only one probe at a time
+        breaker.record(False, 0.1)
+        assert breaker.state == "open"
+
+        clock.now = 12
+        breaker.before_call()
+        breaker.record(True, 0.1)
+        assert breaker.state == "closed"
+
+    def test_cancelled_probe_frees_its_slot(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock, min_calls=1)
+        breaker.record(False, 0.1)
+        clock.now = 6
+        breaker.before_call()
+        breaker.release()
+
+        breaker.before_call()
+
+
+class TestServicesFailFast:
+    """Test that services skip the network while a circuit is open."""
+
+    @pytest.fixture
+    def failing_backend(self, monkeypatch):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(503, text="unavailable")
+
+        monkeypatch.setattr(http, "_transport", HTTPTransport(transport=httpx.MockTransport(handler)))
+        return requests
+
+    async def test_market_analysis_falls_back_without_calling_backend(self, failing_backend):
+        service = MarketAnalysisService()
+        for i in range(service.backend.breaker.min_calls):
+            result = await service.analyze_market(f"삼성전자 전망 {i}")
+            assert result["source"] == "fallback"
+        calls_before_open = len(failing_backend)
+
+        started = time.perf_counter()
+        result = await service.analyze_market("SK하이닉스 전망")
+
+        assert time.perf_counter() - started < 0.1
+        assert result["source"] == "fallback"
+        assert "open" in result["error"]
+        assert len(failing_backend) == calls_before_open
+        assert circuit_breaker_stats()["market_analysis"]["state"] == "open"
+
+    async def test_trading_returns_error_response_while_open(self, failing_backend):
+        service = TradingService()
+        for _ in range(service.backend.breaker.min_calls):
+            await service.send_query("삼성전자 10주 매수")
+        calls_before_open = len(failing_backend)
+
+        response = await service.send_query("삼성전자 10주 매수")
+
+        assert response.role == "error"
+        assert "unavailable" in response.content
+        assert len(failing_backend) == calls_before_open
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
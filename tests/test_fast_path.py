@@ -0,0 +1,192 @@
+"""
+Test suite for the NLU fast path in front of the supervisor agent.
+"""
+
+import pytest
+import sys
+import os
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor import schemas
+from meta_supervisor.services import agent_service
+from meta_supervisor.services.agent_service import AgentService
+from meta_supervisor.services.fast_path import FastPathStats, choose_route
+from meta_supervisor.services.trading_service import QueryResponse
+
+
+def analysis(
+    intent="market_analysis", confidence=1.0, entities=None
+) -> schemas.IntentAnalysisResult:
+    if entities is None:
+        entities = {"stock_code": "005930"}
+    return schemas.IntentAnalysisResult(intent=intent, entities=entities, confidence=confidence)
+
+
+class TestChooseRoute:
+    """Test which queries take the fast path and to which tool."""
+
+    def test_market_question_goes_to_market_analysis(self):
+        route, reason = choose_route("삼성전자 전망", analysis(), 0.8)
+
+        assert reason == "market_analysis"
+        assert route.args == {"query": "삼성전자 전망"}
+
+    def test_chart_question_goes_to_trading(self):
+        route, reason = choose_route("005930 차트 분석", analysis(), 0.8)
+
+        assert reason == "trading"
+        assert route.args == {"message": "005930 차트 분석"}
+
+    def test_fundamental_and_technical_need_the_agent(self):
+        assert choose_route("삼성전자 전망과 RSI", analysis(), 0.8) == (None, "multi_tool")
+
+    def test_low_confidence_needs_the_agent(self):
+        assert choose_route("삼성전자 전망", analysis(confidence=0.6), 0.8) == (
+            None,
+            "low_confidence",
+        )
+
+    def test_lone_keyword_without_a_stock_needs_the_agent(self):
+        assert choose_route("요즘 시장 분석 좀", analysis(entities={}), 0.8) == (None, "no_entity")
+
+    def test_orders_never_take_the_fast_path(self):
+        assert choose_route("삼성전자 주가 보고 매수", analysis(), 0.8) == (None, "not_read_only")
+        assert choose_route("전략 실행", analysis("strategy_execution"), 0.8) == (None, "intent")
+        assert choose_route("삼성전자 차트상 손절해줘", analysis(), 0.8) == (None, "not_read_only")
+
+    def test_trading_instructions_need_the_agent(self):
+        assert choose_route("005930 차트 분석해줘", analysis(), 0.8) == (None, "instruction")
+
+
+class RecordingModel(GenericFakeChatModel):
+    inputs: list = []
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    async def _agenerate(self, messages, *args, **kwargs):
+        self.inputs.append([message.content for message in messages])
+        return await super()._agenerate(messages, *args, **kwargs)
+
+
+class CountingMarketService:
+    def __init__(self):
+        self.calls = 0
+
+    async def analyze_market(self, query):
+        self.calls += 1
+        return {"query": query, "answer": "report"}
+
+
+class FakeTradingService:
+    async def send_query(self, message, read_only=False):
+        return QueryResponse(role="assistant", content="RSI 55")
+
+
+def make_service(llm, confidence=1.0, market_service=None) -> AgentService:
+    async def analyze_intent(query):
+        intent = "backtest" if "백테스트" in query else "market_analysis"
+        return analysis(intent, confidence)
+
+    return AgentService(
+        market_service=market_service or CountingMarketService(),
+        trading_service=FakeTradingService(),
+        llm=llm,
+        analyze_intent=analyze_intent,
+    )
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    monkeypatch.setattr(agent_service.settings, "NLU_FAST_PATH_MODE", "summarize")
+    stats = FastPathStats()
+    monkeypatch.setattr(agent_service, "fast_path_stats", stats)
+    return stats
+
+
+class TestAgentFastPath:
+    """Test the fast path inside AgentService."""
+
+    async def test_summarize_uses_one_llm_call(self, stats):
+        llm = RecordingModel(inputs=[], messages=iter([AIMessage(content="요약 답변")]))
+        market_service = CountingMarketService()
+
+        result = await make_service(llm, market_service=market_service).process_query(
+            "삼성전자 전망"
+        )
+
+        assert result["result"] == "요약 답변"
+        assert result["fast_path"]["tool"] == "market_analysis"
+        assert market_service.calls == 1
+        assert len(llm.inputs) == 1
+        assert "report" in llm.inputs[0][1]
+        assert stats.stats()["routed"] == {"market_analysis": 1}
+
+    async def test_direct_returns_the_tool_output(self, stats, monkeypatch):
+        monkeypatch.setattr(agent_service.settings, "NLU_FAST_PATH_MODE", "direct")
+        llm = RecordingModel(inputs=[], messages=iter([]))
+
+        result = await make_service(llm).process_query("005930 차트 분석")
+
+        assert result["result"] == "RSI 55"
+        assert llm.inputs == []
+
+    async def test_low_confidence_runs_the_agent(self, stats):
+        llm = RecordingModel(inputs=[], messages=iter([AIMessage(content="에이전트 답변")]))
+
+        result = await make_service(llm, confidence=0.5).process_query("삼성전자 전망")
+
+        assert result["result"]["messages"][-1].content == "에이전트 답변"
+        assert "fast_path" not in result
+        assert stats.stats()["skipped"] == {"low_confidence": 1}
+
+    async def test_share_and_latency_saved(self, stats):
+        llm = RecordingModel(inputs=[], messages=iter([
+            AIMessage(content="요약 답변"),
+            AIMessage(content="에이전트 답변"),
+        ]))
+        service = make_service(llm)
+
+        await service.process_query("삼성전자 전망")
+        await service.process_query("백테스트 돌려줘")
+        report = stats.stats()
+
+        assert report["fast_path_share"] == 0.5
+        assert report["estimated_saved_ms_per_query"] is not None
+
+    async def test_stream_sends_tool_events_and_tokens(self, stats):
+        llm = RecordingModel(inputs=[], messages=iter([AIMessage(content="요약 답변")]))
+
+        events = [event async for event in make_service(llm).stream_query("삼성전자 전망")]
+
+        kinds = [event["event"] for event in events]
+        assert kinds[:2] == ["tool_start", "tool_end"]
+        assert "token" in kinds
+        assert events[-1]["event"] == "done"
+        assert events[-1]["data"]["answer"] == "요약 답변"
+        assert events[-1]["data"]["fast_path"]["tool"] == "market_analysis"
+
+    async def test_off_mode_never_asks_the_nlu(self, monkeypatch):
+        monkeypatch.setattr(agent_service.settings, "NLU_FAST_PATH_MODE", "off")
+        llm = RecordingModel(inputs=[], messages=iter([AIMessage(content="에이전트 답변")]))
+
+        async def analyze_intent(query):
+            raise AssertionError("NLU should not be called")
+
+        service = AgentService(
+            market_service=CountingMarketService(),
+            trading_service=FakeTradingService(),
+            llm=llm,
+            analyze_intent=analyze_intent,
+        )
+        result = await service.process_query("삼성전자 전망")
+
+        assert result["result"]["messages"][-1].content == "에이전트 답변"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
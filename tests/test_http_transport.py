@@ -0,0 +1,87 @@
+"""
+Test suite for the shared backend HTTP transport.
+"""
+
+import httpx
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.clients import http
+from meta_supervisor.clients.http import HTTPTransport
+from meta_supervisor.services.market_analysis_service import MarketAnalysisService
+from meta_supervisor.services.trading_service import TradingService
+
+
+@pytest.fixture
+def stub_backend(monkeypatch):
+    """Installs a transport whose backends answer from an in-process handler."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path.endswith("/api/agent/trade/chat"):
+            return httpx.Response(200, json={"role": "assistant", "content": "ok"})
+        return httpx.Response(200, json={"answer": "report", "timestamp": "now"})
+
+    transport = HTTPTransport(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http, "_transport", transport)
+    yield transport, requests
+
+
+class TestHTTPTransport:
+    """Test client pooling per backend."""
+
+    async def test_reuses_client_per_backend(self):
+        transport = HTTPTransport()
+        try:
+            first = transport.client("market_analysis", "http://market")
+            second = transport.client("market_analysis", "http://market")
+            other = transport.client("trading", "http://trading")
+        finally:
+            await transport.aclose()
+
+        assert first is second
+        assert first is not other
+        assert transport.stats()["backends"] == {}
+
+    async def test_replaced_client_is_closed_on_shutdown(self):
+        transport = HTTPTransport()
+        old = transport.client("market_analysis", "http://market")
+        new = transport.client("market_analysis", "http://market-v2")
+
+        assert new is not old
+        assert not old.is_closed
+
+        await transport.aclose()
+
+        assert old.is_closed
+        assert new.is_closed
+
+    def test_http2_falls_back_without_h2(self, monkeypatch):
+        monkeypatch.setattr(http.importlib.util, "find_spec", lambda name: None)
+
+        assert HTTPTransport(http2=True).http2 is False
+
+    async def test_services_share_the_transport(self, stub_backend):
+        transport, requests = stub_backend
+
+        market = await MarketAnalysisService().analyze_market("삼성전자 전망")
+        trading = await TradingService().send_query("RSI 확인")
+
+        assert market["answer"] == "report"
+        assert trading.content == "ok"
+        assert [r.url.path for r in requests] == [
+            "/test/api/query",
+            "/test/api/agent/trade/chat",
+        ]
+        backends = transport.stats()["backends"]
+        assert backends["market_analysis"]["requests"] == 1
+        assert backends["trading"]["requests"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
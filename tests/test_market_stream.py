@@ -0,0 +1,153 @@
+"""
+Test suite for streaming market analysis answers from the backend.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import sys
+import os
+from fastapi.testclient import TestClient
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.clients import http
+from meta_supervisor.clients.backend import ResponseTooLargeError
+from meta_supervisor.clients.http import HTTPTransport
+from meta_supervisor.config import settings
+from meta_supervisor.main import app
+from meta_supervisor.routers import api
+from meta_supervisor.services.market_analysis_service import MarketAnalysisService
+
+
+async def chunked(*parts: str, delay: float = 0.0):
+    for part in parts:
+        await asyncio.sleep(delay)
+        yield part.encode("utf-8")
+
+
+@pytest.fixture
+def backend_reply(monkeypatch):
+    """Installs a market backend that answers with the given response factory."""
+    replies = []
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return replies.pop(0)()
+
+    monkeypatch.setattr(http, "_transport", HTTPTransport(transport=httpx.MockTransport(handler)))
+    return replies, requests
+
+
+async def collect(service: MarketAnalysisService, query: str = "삼성전자 전망"):
+    return [text async for text in service.stream_market(query)]
+
+
+class TestStreamMarket:
+    """Test incremental parsing of backend stream formats."""
+
+    async def test_server_sent_events(self, backend_reply):
+        replies, requests = backend_reply
+        replies.append(lambda: httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=chunked(
+                'data: {"delta": "삼성전자는 "}\n\n',
+                'data: {"delta": "강세',  # event split across chunks
+                '입니다."}\n\n',
+                'data: {"answer": "삼성전자는 강세입니다."}\n\ndata: [DONE]\n\n',
+            ),
+        ))
+
+        assert await collect(MarketAnalysisService()) == ["삼성전자는 ", "강세입니다."]
+        payload = json.loads(requests[0].content)
+        assert payload["stream"] is True
+        assert "text/event-stream" in requests[0].headers["accept"]
+
+    async def test_ndjson(self, backend_reply):
+        replies, _ = backend_reply
+        replies.append(lambda: httpx.Response(
+            200,
+            headers={"content-type": "application/x-ndjson"},
+            content=chunked('{"content": "첫 줄"}\n{"content": ', '"둘째 줄"}\n'),
+        ))
+
+        assert await collect(MarketAnalysisService()) == ["첫 줄", "둘째 줄"]
+
+    async def test_plain_json_arrives_in_one_piece(self, backend_reply):
+        replies, _ = backend_reply
+        replies.append(lambda: httpx.Response(
+            200, json={"answer": "report", "timestamp": "2025-01-01T00:00:00"}
+        ))
+
+        assert await collect(MarketAnalysisService()) == ["report"]
+
+    async def test_oversized_response_is_cut_off(self, backend_reply, monkeypatch):
+        replies, _ = backend_reply
+        monkeypatch.setattr(settings, "MARKET_ANALYSIS_MAX_RESPONSE_BYTES", 64)
+        replies.append(lambda: httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=chunked(*['data: {"delta": "xxxxxxxxxx"}\n\n'] * 10),
+        ))
+
+        received = []
+        with pytest.raises(ResponseTooLargeError):
+            async for text in MarketAnalysisService().stream_market("삼성전자 전망"):
+                received.append(text)
+        assert len(received) < 10
+
+    async def test_limiter_sees_the_whole_stream(self, backend_reply):
+        replies, _ = backend_reply
+        replies.append(lambda: httpx.Response(
+            200,
+            headers={"content-type": "application/x-ndjson"},
+            content=chunked('{"content": "a"}\n', '{"content": "b"}\n', delay=0.05),
+        ))
+        service = MarketAnalysisService()
+
+        await collect(service)
+
+        endpoint = service.backend.limiter.stats()["endpoints"]["/api/query"]
+        assert endpoint["smoothed_ms"] >= 100
+
+
+class TestMarketStreamEndpoint:
+    """Test the SSE proxy endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        app.dependency_overrides[api.get_market_analysis_service] = MarketAnalysisService
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_forwards_deltas(self, client, backend_reply):
+        replies, _ = backend_reply
+        replies.append(lambda: httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=chunked('data: {"delta": "삼성전자 "}\n\n', 'data: {"delta": "리포트"}\n\n'),
+        ))
+
+        response = client.post("/api/market-analysis/stream", json={"query": "삼성전자 전망"})
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert 'event: delta\ndata: {"content": "삼성전자 "}' in response.text
+        assert 'event: done\ndata: {"query": "삼성전자 전망", "length": 8}' in response.text
+
+    def test_backend_error_becomes_error_event(self, client, backend_reply):
+        replies, _ = backend_reply
+        replies.append(lambda: httpx.Response(404, text="not found"))
+
+        response = client.post("/api/market-analysis/stream", json={"query": "삼성전자 전망"})
+
+        assert response.text.startswith("event: error\n")
+        assert "404" in response.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,225 @@
+"""
+Test suite for the NLU service and its tokenizer engine.
+
+Okt needs a JVM, so these tests run the pooled engine against a fake tokenizer.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import threading
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.services import nlu_service
+from meta_supervisor.services.intent_matcher import IntentMatcher
+from meta_supervisor.services.nlu_executor import NLUExecutor, NLUOverloadedError
+from meta_supervisor.services.tokenizer_engine import (
+    TokenizerEngine,
+    TokenizerPoolTimeout,
+)
+
+
+class FakeOkt:
+    """Whitespace tokenizer that tags every word as a noun."""
+
+    instances = 0
+
+    def __init__(self):
+        FakeOkt.instances += 1
+
+    def pos(self, text, norm=False, stem=False):
+        return [(word, "Noun") for word in text.split()]
+
+
+@pytest.fixture
+def fake_okt():
+    FakeOkt.instances = 0
+    return FakeOkt
+
+
+@pytest.fixture
+def fake_engine(monkeypatch, fake_okt):
+    """Routes nlu_service tokenization through a pool of fake tokenizers."""
+    engine = TokenizerEngine(pool_size=2, factory=fake_okt)
+    monkeypatch.setattr(nlu_service, "get_tokenizer_engine", lambda: engine)
+    nlu_service.result_cache.clear()
+    yield engine
+    nlu_service.result_cache.clear()
+
+
+class TestTokenizerEngine:
+    """Test the pooled tokenizer engine."""
+
+    def test_instances_are_reused(self, fake_okt):
+        """Sequential calls should share a single tokenizer instance."""
+        engine = TokenizerEngine(pool_size=4, factory=fake_okt)
+
+        for _ in range(10):
+            assert engine.pos("삼성전자 주가 분석") == [
+                ("삼성전자", "Noun"),
+                ("주가", "Noun"),
+                ("분석", "Noun"),
+            ]
+
+        assert fake_okt.instances == 1
+        stats = engine.stats()
+        assert stats["created"] == 1
+        assert stats["tokenize"]["count"] == 10
+        assert stats["pool_wait"]["count"] == 10
+
+    def test_warm_up_fills_pool(self, fake_okt):
+        """Warm-up should create every instance ahead of time."""
+        engine = TokenizerEngine(pool_size=3, factory=fake_okt)
+        engine.warm_up()
+
+        assert fake_okt.instances == 3
+        assert engine.stats()["available"] == 3
+
+    def test_pool_is_bounded(self, fake_okt):
+        """Callers should time out instead of creating more instances."""
+        engine = TokenizerEngine(pool_size=1, acquire_timeout=0.05, factory=fake_okt)
+        errors = []
+
+        with engine.acquire():
+            worker = threading.Thread(
+                target=lambda: errors.append(
+                    pytest.raises(TokenizerPoolTimeout, engine.pos, "test")
+                )
+            )
+            worker.start()
+            worker.join()
+
+        assert len(errors) == 1
+        assert fake_okt.instances == 1
+        assert engine.stats()["acquire_timeouts"] == 1
+
+
+class TestNLUExecutor:
+    """Test the executor that keeps tokenization off the event loop."""
+
+    async def test_runs_in_worker_thread(self):
+        """Blocking work should run outside the event loop thread."""
+        executor = NLUExecutor(kind="thread", max_workers=2)
+        try:
+            worker_thread = await executor.run(threading.get_ident)
+        finally:
+            executor.shutdown()
+
+        assert worker_thread != threading.get_ident()
+        assert executor.stats()["run"]["count"] == 1
+
+    async def test_rejects_when_saturated(self):
+        """Callers beyond workers + queue should be rejected after the queue timeout."""
+        executor = NLUExecutor(
+            kind="thread", max_workers=1, max_queue=0, queue_timeout=0.05
+        )
+        try:
+            busy = asyncio.ensure_future(executor.run(time.sleep, 0.3))
+            await asyncio.sleep(0.01)
+            with pytest.raises(NLUOverloadedError):
+                await executor.run(time.sleep, 0)
+            await busy
+        finally:
+            executor.shutdown()
+
+        assert executor.stats()["rejected"] == 1
+
+
+class TestIntentMatcher:
+    """Test the compiled intent matcher."""
+
+    @pytest.fixture
+    def matcher(self):
+        return IntentMatcher(nlu_service.INTENT_KEYWORDS)
+
+    def test_ranks_all_matching_intents(self, matcher):
+        """Every intent with a match should be ranked, best first."""
+        ranked = matcher.rank(["삼성전자", "주가", "분석", "전략"])
+
+        assert [intent for intent, _ in ranked] == ["market_analysis", "strategy_creation"]
+        assert ranked[0][1] == pytest.approx(2 / 3, abs=1e-3)
+        assert sum(confidence for _, confidence in ranked) == pytest.approx(1.0)
+
+    def test_matches_keywords_inside_text(self, matcher):
+        """Stems such as '만들' should match inside inflected words of the text."""
+        ranked = matcher.rank([], "매매 전략 만들어줘")
+
+        assert ranked[0][0] == "strategy_creation"
+
+    def test_overlapping_keywords(self):
+        """Keywords sharing prefixes and suffixes should all be reported."""
+        matcher = IntentMatcher({"a": ["he", "she"], "b": ["hers"], "c": ["his"]})
+
+        assert matcher.scores([], "ushers") == {"a": 1.0, "b": 0.5}
+
+    def test_no_match(self, matcher):
+        assert matcher.rank(["날씨"], "오늘 날씨 어때") == []
+        assert nlu_service.classify_intent(["날씨"]) == "unknown"
+
+
+class TestAnalyze:
+    """Test the end-to-end analysis with a fake tokenizer."""
+
+    def test_fills_confidence_and_ranked_intents(self, fake_engine):
+        result = nlu_service.analyze("005930 차트 분석")
+
+        assert result.intent == "market_analysis"
+        assert result.confidence == 1.0
+        assert [ranked.intent for ranked in result.intents] == ["market_analysis"]
+        assert result.entities["stock_code"] == "005930"
+
+    def test_resolves_company_names(self, fake_engine):
+        """Company names without a code should still yield a stock_code."""
+        result = nlu_service.analyze("삼성전자랑 SK하이닉스 주가 분석해줘")
+
+        assert result.entities["stock_code"] == "005930"
+        assert [stock["code"] for stock in result.entities["stocks"]] == [
+            "005930",
+            "000660",
+        ]
+
+    def test_unknown_intent(self, fake_engine):
+        result = nlu_service.analyze("안녕하세요")
+
+        assert result.intent == "unknown"
+        assert result.confidence == 0.0
+        assert result.intents == []
+
+    def test_normalized_queries_hit_the_cache(self, fake_engine):
+        """Queries differing only in punctuation and spacing are tokenized once."""
+        first = nlu_service.analyze("삼성전자 주가 분석해줘!")
+        second = nlu_service.analyze("  삼성전자   주가 분석해줘?? ")
+
+        assert first == second
+        assert first is not second
+        assert fake_engine.stats()["tokenize"]["count"] == 1
+        assert nlu_service.result_cache.hits >= 1
+
+    async def test_batch_preserves_input_order(self, fake_engine, monkeypatch):
+        """Chunks run concurrently but results must come back in input order."""
+        executor = NLUExecutor(kind="thread", max_workers=3)
+        monkeypatch.setattr(nlu_service, "get_nlu_executor", lambda: executor)
+        queries = [f"{i:06d} 주가 분석" if i % 2 else "매매 전략 생성" for i in range(50)]
+
+        try:
+            results = await nlu_service.analyze_batch_async(queries, chunk_size=7)
+        finally:
+            executor.shutdown()
+
+        assert len(results) == 50
+        for i, result in enumerate(results):
+            if i % 2:
+                assert result.intent == "market_analysis"
+                assert result.entities["stock_code"] == f"{i:06d}"
+            else:
+                assert result.intent == "strategy_creation"
+        # 25 distinct stock queries + 1 repeated strategy query, 7 per chunk.
+        assert executor.stats()["run"]["count"] == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+Test suite for concurrent tool execution inside the supervisor agent.
+"""
+
+import asyncio
+
+import pytest
+import sys
+import os
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.services import agent_service
+from meta_supervisor.services.agent_service import AgentService
+from meta_supervisor.services.trading_service import QueryResponse
+from meta_supervisor.tools.run_context import ToolRunContext
+
+
+class ToolCallingFakeModel(GenericFakeChatModel):
+    # The fake cannot stream a message made of tool calls only.
+    disable_streaming: bool = True
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+class SlowMarketService:
+    async def analyze_market(self, query):
+        await asyncio.sleep(0.1)
+        return {"query": query, "answer": "report"}
+
+
+class SlowTradingService:
+    async def send_query(self, message, read_only=False):
+        await asyncio.sleep(0.1)
+        return QueryResponse(role="assistant", content="RSI 55")
+
+
+def make_service() -> AgentService:
+    llm = ToolCallingFakeModel(messages=iter([
+        AIMessage(content="", tool_calls=[
+            {"name": "market_analysis", "args": {"query": "삼성전자 전망"}, "id": "call-1"},
+            {"name": "trading", "args": {"message": "삼성전자 RSI 확인"}, "id": "call-2"},
+        ]),
+        AIMessage(content="삼성전자는 강세입니다."),
+    ]))
+    return AgentService(
+        market_service=SlowMarketService(), trading_service=SlowTradingService(), llm=llm
+    )
+
+
+class TestToolRunContext:
+    """Test span bookkeeping."""
+
+    def test_timing_counts_overlap_once(self):
+        context = ToolRunContext()
+        context.spans = [("a", 0.0, 1.0), ("b", 0.5, 1.5), ("c", 2.0, 3.0)]
+
+        timing = context.timing()
+
+        assert timing["serial_ms"] == 3000
+        assert timing["wall_ms"] == 2500
+        assert timing["saved_ms"] == 500
+        assert timing["peak_parallel"] == 2
+
+
+class TestParallelToolCalls:
+    """Test that tool calls from one LLM turn overlap."""
+
+    async def test_independent_tool_calls_run_concurrently(self):
+        result = await make_service().process_query("삼성전자 전망과 RSI 알려줘")
+
+        timing = result["tool_timing"]
+        assert result["result"]["messages"][-1].content == "삼성전자는 강세입니다."
+        assert timing["tool_calls"] == 2
+        assert timing["peak_parallel"] == 2
+        assert timing["wall_ms"] < 180
+        assert timing["saved_ms"] > 50
+
+    async def test_concurrency_cap(self, monkeypatch):
+        monkeypatch.setattr(agent_service.settings, "AGENT_MAX_PARALLEL_TOOLS", 1)
+
+        result = await make_service().process_query("삼성전자 전망과 RSI 알려줘")
+
+        assert result["tool_timing"]["peak_parallel"] == 1
+        assert result["tool_timing"]["wall_ms"] >= 190
+
+    async def test_stream_reports_tool_timing(self):
+        events = [event async for event in make_service().stream_query("삼성전자 전망")]
+
+        assert events[-1]["data"]["tool_timing"]["tool_calls"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
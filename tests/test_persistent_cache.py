@@ -0,0 +1,151 @@
+"""
+Test suite for the on-disk persistent cache.
+"""
+
+import multiprocessing
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.persistent_cache import PersistentCache
+from meta_supervisor.services import market_analysis_service, trading_service
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _write_entries(path, worker, count):
+    cache = PersistentCache(path)
+    for i in range(count):
+        cache.set(f"{worker}:{i}", {"worker": worker, "i": i}, ttl=60)
+    cache.close()
+
+
+class TestPersistentCache:
+    """Test storage, expiry and compaction."""
+
+    def test_survives_reopen(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        cache = PersistentCache(path)
+        cache.set("key", {"answer": "삼성전자 리포트"}, ttl=60)
+        cache.close()
+
+        reopened = PersistentCache(path)
+        assert reopened.get("key") == {"answer": "삼성전자 리포트"}
+        assert reopened.get("missing") is None
+        assert reopened.stats()["hits"] == 1
+
+    def test_entries_expire(self, tmp_path):
+        clock = FakeClock()
+        cache = PersistentCache(str(tmp_path / "cache.sqlite3"), clock=clock)
+        cache.set("key", "value", ttl=10)
+
+        clock.now += 5
+        assert cache.get("key") == "value"
+        clock.now += 10
+        assert cache.get("key") is None
+
+        cache.compact()
+        assert cache.stats()["entries"] == 0
+
+    def test_compaction_drops_least_recently_used(self, tmp_path):
+        clock = FakeClock()
+        cache = PersistentCache(
+            str(tmp_path / "cache.sqlite3"), max_bytes=1000, compact_every=1, clock=clock
+        )
+        for i in range(10):
+            clock.now += 1
+            cache.set(f"key{i}", "x" * 95, ttl=60)
+            if i == 0:
+                continue
+            clock.now += 1
+            cache.get("key0")
+
+        assert cache.stats()["bytes"] <= 1000
+        assert cache.get("key0") == "x" * 95
+        assert cache.get("key1") is None
+        assert cache.get("key9") == "x" * 95
+
+    def test_concurrent_writers_from_several_processes(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        PersistentCache(path).close()
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(target=_write_entries, args=(path, worker, 50))
+            for worker in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            assert worker.exitcode == 0
+
+        cache = PersistentCache(path)
+        assert cache.stats()["entries"] == 200
+        assert cache.get("3:49") == {"worker": 3, "i": 49}
+
+
+class TestServiceIntegration:
+    """Test that backend services read through the persistent cache."""
+
+    @pytest.fixture
+    def disk_cache(self, tmp_path, monkeypatch):
+        cache = PersistentCache(str(tmp_path / "cache.sqlite3"))
+        monkeypatch.setattr(market_analysis_service, "get_persistent_cache", lambda: cache)
+        monkeypatch.setattr(trading_service, "get_persistent_cache", lambda: cache)
+        yield cache
+        cache.close()
+
+    async def test_market_answer_survives_restart(self, disk_cache, monkeypatch):
+        service = market_analysis_service.MarketAnalysisService()
+        calls = []
+
+        async def fake_request(method, endpoint, params=None, json=None):
+            calls.append(json)
+            return {"answer": "report", "timestamp": "2025-01-01T00:00:00"}
+
+        monkeypatch.setattr(service, "_request", fake_request)
+
+        await service.analyze_market("삼성전자 전망")
+        # A restart empties the in-process cache but not the file.
+        market_analysis_service.response_cache.clear()
+        result = await service.analyze_market("삼성전자 전망")
+
+        assert len(calls) == 1
+        assert result["answer"] == "report"
+        assert result["cache_status"] == "persistent"
+
+    async def test_trading_caches_only_successful_read_only_answers(
+        self, disk_cache, monkeypatch
+    ):
+        service = trading_service.TradingService()
+        calls = []
+
+        async def fake_send(message, idempotent=False):
+            calls.append(message)
+            role = "error" if "오류" in message else "assistant"
+            return trading_service.QueryResponse(role=role, content=message)
+
+        monkeypatch.setattr(service, "_send", fake_send)
+
+        for message in ["삼성전자 RSI 확인", "오류 확인", "삼성전자 10주 매수", "내 잔고 확인"]:
+            read_only = trading_service.is_read_only_message(message)
+            await service.send_query(message, read_only=read_only)
+            await service.send_query(message, read_only=read_only)
+
+        assert calls.count("삼성전자 RSI 확인") == 1
+        assert calls.count("오류 확인") == 2
+        assert calls.count("삼성전자 10주 매수") == 2
+        assert calls.count("내 잔고 확인") == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
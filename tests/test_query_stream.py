@@ -0,0 +1,121 @@
+"""
+Test suite for server-sent-events streaming of agent answers.
+"""
+
+import asyncio
+import json
+
+import pytest
+import sys
+import os
+from fastapi.testclient import TestClient
+from langchain_core.messages import AIMessageChunk, ToolMessage
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.main import app
+from meta_supervisor.routers import api
+from meta_supervisor.services.agent_service import AgentService
+
+
+class FakeAgent:
+    """Replays the v2 event sequence of one tool call followed by an answer."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.closed = False
+
+    async def astream_events(self, inputs, version):
+        assert version == "v2"
+        try:
+            yield {"event": "on_chat_model_start", "name": "ChatOpenAI", "data": {}}
+            yield {"event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content="")}}
+            yield {"event": "on_tool_start", "name": "market_analysis", "data": {"input": {"query": "삼성전자"}}}
+            await asyncio.sleep(self.delay)
+            yield {
+                "event": "on_tool_end",
+                "name": "market_analysis",
+                "data": {"output": ToolMessage(content="report", tool_call_id="1")},
+            }
+            yield {"event": "on_chat_model_start", "name": "ChatOpenAI", "data": {}}
+            for token in ["삼성전자는 ", "강세입니다."]:
+                await asyncio.sleep(self.delay)
+                yield {"event": "on_chat_model_stream", "data": {"chunk": AIMessageChunk(content=token)}}
+        finally:
+            self.closed = True
+
+
+def make_service(agent: FakeAgent) -> AgentService:
+    service = AgentService(market_service=object(), trading_service=object())
+    service._agent = agent
+    return service
+
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestStreamQuery:
+    """Test the agent event translation."""
+
+    async def test_yields_tool_events_tokens_and_answer(self):
+        events = [event async for event in make_service(FakeAgent()).stream_query("삼성전자 전망")]
+
+        assert [event["event"] for event in events] == [
+            "tool_start", "tool_end", "token", "token", "done",
+        ]
+        assert events[1]["data"] == {"tool": "market_analysis", "output": "report"}
+        assert events[-1]["data"]["answer"] == "삼성전자는 강세입니다."
+
+    async def test_closing_the_stream_cancels_the_run(self):
+        agent = FakeAgent(delay=0.01)
+        events = make_service(agent).stream_query("삼성전자 전망")
+
+        assert (await events.__anext__())["event"] == "tool_start"
+        await events.aclose()
+
+        assert agent.closed
+
+
+class TestQueryStreamEndpoint:
+    """Test the SSE endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        agent = FakeAgent()
+        app.dependency_overrides[api.get_agent_service] = lambda: make_service(agent)
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_streams_server_sent_events(self, client):
+        with client.stream("POST", "/api/query/stream", json={"query": "삼성전자 전망"}) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = "".join(response.iter_text())
+
+        events = parse_sse(body)
+        assert events[0] == ("tool_start", {"tool": "market_analysis", "input": {"query": "삼성전자"}})
+        assert events[-1][0] == "done"
+        assert events[-1][1]["answer"] == "삼성전자는 강세입니다."
+
+    def test_agent_errors_become_error_events(self, client):
+        class FailingAgent(FakeAgent):
+            async def astream_events(self, inputs, version):
+                raise RuntimeError("LLM unavailable")
+                yield
+
+        app.dependency_overrides[api.get_agent_service] = lambda: make_service(FailingAgent())
+        response = client.post("/api/query/stream", json={"query": "삼성전자 전망"})
+
+        assert parse_sse(response.text) == [
+            ("error", {"error_code": "INTERNAL_SERVER_ERROR", "error_message": "LLM unavailable"})
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
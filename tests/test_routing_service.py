@@ -0,0 +1,142 @@
+"""
+Test suite for the routing service.
+
+Backends are replaced with in-process fakes so fan-out, deadlines and result
+merging can be checked without network access.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor import dependencies, schemas
+from meta_supervisor.services import routing_service
+from meta_supervisor.services.trading_service import QueryResponse
+
+
+class FakeMarketService:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.queries = []
+
+    async def analyze_market(self, query):
+        self.queries.append(query)
+        await asyncio.sleep(self.delay)
+        return {"query": query, "answer": "market report"}
+
+
+class FakeTradingService:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.messages = []
+
+    async def send_query(self, message):
+        self.messages.append(message)
+        await asyncio.sleep(self.delay)
+        return QueryResponse(role="assistant", content="strategy")
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    def install(market_delay=0.0, trading_delay=0.0):
+        market = FakeMarketService(market_delay)
+        trading = FakeTradingService(trading_delay)
+        monkeypatch.setattr(dependencies, "get_market_analysis_service", lambda: market)
+        monkeypatch.setattr(dependencies, "get_trading_service", lambda: trading)
+        routing_service.registry.reset()
+        return market, trading
+
+    yield install
+    routing_service.registry.reset()
+
+
+def make_analysis(*ranked, entities=None):
+    return schemas.IntentAnalysisResult(
+        intent=ranked[0][0],
+        confidence=ranked[0][1],
+        entities=entities if entities is not None else {"stock_code": "005930"},
+        intents=[schemas.RankedIntent(intent=i, confidence=c) for i, c in ranked],
+    )
+
+
+class TestRouteRequest:
+    """Test multi-intent fan-out."""
+
+    async def test_fans_out_concurrently(self, fake_backends):
+        fake_backends(market_delay=0.2, trading_delay=0.2)
+        analysis = make_analysis(("market_analysis", 0.6), ("strategy_creation", 0.4))
+
+        started = time.perf_counter()
+        result = await routing_service.route_request(analysis, query="삼성전자 분석하고 전략 만들어줘")
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.35
+        assert result["intents"] == ["market_analysis", "strategy_creation"]
+        assert result["results"]["market_analysis"]["answer"] == "market report"
+        assert result["results"]["strategy_creation"]["content"] == "strategy"
+        assert result["partial"] is False
+
+    async def test_deadline_returns_partial_result(self, fake_backends):
+        fake_backends(market_delay=0.0, trading_delay=5.0)
+        analysis = make_analysis(("market_analysis", 0.6), ("strategy_creation", 0.4))
+
+        result = await routing_service.route_request(analysis, query="q", deadline=0.1)
+
+        assert "market_analysis" in result["results"]
+        assert "strategy_creation" in result["errors"]
+        assert result["partial"] is True
+
+    async def test_skips_low_confidence_secondary_intents(self, fake_backends):
+        fake_backends()
+        analysis = make_analysis(("market_analysis", 0.9), ("strategy_creation", 0.1))
+
+        result = await routing_service.route_request(analysis, query="q")
+
+        assert result["intents"] == ["market_analysis"]
+
+    async def test_trading_backend_gets_the_message_once(self, fake_backends):
+        _, trading = fake_backends()
+        analysis = make_analysis(("strategy_creation", 0.6), ("strategy_execution", 0.4))
+
+        result = await routing_service.route_request(analysis, query="삼성전자 매매 전략 만들어줘")
+
+        assert trading.messages == ["삼성전자 매매 전략 만들어줘"]
+        assert result["intents"] == ["strategy_creation"]
+
+    async def test_unsupported_intent(self, fake_backends):
+        fake_backends()
+        analysis = make_analysis(("unknown", 0.0))
+
+        result = await routing_service.route_request(analysis, query="q")
+
+        assert "error" in result
+
+    async def test_registry_is_lazy_and_shared(self, fake_backends):
+        """Services are resolved from dependencies once, on first dispatch."""
+        market, _ = fake_backends()
+        assert routing_service.registry._table is None
+
+        handler = routing_service.registry.resolve("market_analysis")
+
+        assert handler.args[0] is market
+        assert routing_service.registry.resolve("backtest").args[0] is (
+            routing_service.registry.resolve("strategy_execution").args[0]
+        )
+
+    async def test_missing_stock_code_is_reported(self, fake_backends):
+        fake_backends()
+        analysis = make_analysis(("market_analysis", 1.0), entities={})
+
+        result = await routing_service.route_request(analysis, query="q")
+
+        assert result["results"] == {}
+        assert "stock_code" in result["errors"]["market_analysis"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
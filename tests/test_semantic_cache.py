@@ -0,0 +1,196 @@
+"""
+Test suite for the similarity-keyed answer cache.
+"""
+
+import pytest
+import sys
+import os
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.semantic_cache import QueryVectorizer, SemanticCache
+from meta_supervisor.services import agent_service
+from meta_supervisor.services.agent_service import AgentService, answer_cache_scope
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(**kwargs) -> SemanticCache:
+    vectorizer = QueryVectorizer(
+        agent_service.ANSWER_CACHE_CONCEPTS,
+        agent_service.ANSWER_CACHE_FILLERS,
+        agent_service.ANSWER_CACHE_SUFFIXES,
+    )
+    return SemanticCache(vectorizer, **kwargs)
+
+
+class TestSemanticCache:
+    """Test nearest-neighbour lookups."""
+
+    def test_paraphrase_hits(self):
+        cache = make_cache()
+        cache.set("삼성전자 전망 어때?", "answer")
+
+        hit = cache.get("삼성전자는 앞으로 어떻게 될까요?")
+
+        assert hit is not None
+        value, similarity, matched = hit
+        assert value == "answer"
+        assert similarity >= 0.85
+        assert matched == "삼성전자 전망 어때?"
+
+    def test_different_subject_misses(self):
+        cache = make_cache()
+        cache.set("반도체 섹터 전망", "answer")
+
+        assert cache.get("자동차 섹터 전망") is None
+        assert cache.get("반도체 섹터 뉴스") is None
+
+    @pytest.mark.parametrize(
+        "stored, query",
+        [
+            ("금 전망 어때?", "유가 전망 어때?"),
+            ("유가 전망 어때?", "달러 전망 어때?"),
+            ("달러 전망 어때?", "금 전망 어때?"),
+            ("금리 전망", "환율 전망"),
+        ],
+    )
+    def test_shared_concepts_alone_miss(self, stored, query):
+        cache = make_cache()
+        cache.set(stored, "answer")
+
+        assert cache.get(query) is None
+        assert cache.get(stored)[0] == "answer"
+
+    def test_scope_must_match(self):
+        cache = make_cache()
+        cache.set("전망 어때?", "samsung", scope=frozenset({"005930"}))
+
+        assert cache.get("전망 어때?", scope=frozenset({"000660"})) is None
+        assert cache.get("전망 어때?", scope=frozenset({"005930"}))[0] == "samsung"
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = make_cache(ttl=10, clock=clock)
+        cache.set("삼성전자 전망", "answer")
+
+        clock.now = 11
+        assert cache.get("삼성전자 전망") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = make_cache(max_entries=2)
+        cache.set("삼성전자 전망", "a")
+        cache.set("반도체 섹터 전망", "b")
+        cache.get("삼성전자 전망")
+        cache.set("자동차 섹터 뉴스", "c")
+
+        assert cache.get("반도체 섹터 전망") is None
+        assert cache.get("삼성전자 전망")[0] == "a"
+        assert cache.stats()["evictions"] == 1
+
+    def test_stats_report_similarity(self):
+        cache = make_cache()
+        cache.set("삼성전자 전망 어때?", "answer")
+        cache.get("삼성전자 앞으로 어떻게 될까")
+        cache.get("삼성전자 실적 어때?")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["avg_hit_similarity"] == 1.0
+        assert sum(stats["best_similarity_histogram"].values()) == 2
+
+
+class TestAnswerCacheScope:
+    """Test which queries may be answered from the cache."""
+
+    def test_companies_form_the_scope(self):
+        assert answer_cache_scope("삼성전자 전망") == frozenset({"005930"})
+
+    @pytest.mark.parametrize(
+        "query, changed",
+        [
+            (
+                "삼성전자 2023년 4분기 실적과 반도체 업황, 향후 주가 전망 분석",
+                "삼성전자 2024년 4분기 실적과 반도체 업황, 향후 주가 전망 분석",
+            ),
+            (
+                "미국 연준 금리 인하가 국내 증시에 미칠 영향과 투자 전략 분석해줘",
+                "미국 연준 금리 인상이 국내 증시에 미칠 영향과 투자 전략 분석해줘",
+            ),
+        ],
+    )
+    def test_numbers_and_polar_terms_split_the_scope(self, query, changed):
+        assert answer_cache_scope(query) != answer_cache_scope(changed)
+
+    def test_orders_and_account_queries_are_not_cached(self):
+        assert answer_cache_scope("삼성전자 10주 매수해줘") is None
+        assert answer_cache_scope("내 포트폴리오 보여줘") is None
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(agent_service.settings, "ANSWER_CACHE_ENABLED", False)
+
+        assert answer_cache_scope("삼성전자 전망") is None
+
+
+class FakeAgentModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def make_service() -> AgentService:
+    llm = FakeAgentModel(messages=iter([
+        AIMessage(content="삼성전자는 강세입니다."),
+        AIMessage(content="두 번째 답변"),
+    ]))
+    return AgentService(market_service=object(), trading_service=object(), llm=llm)
+
+
+class TestAgentAnswerCache:
+    """Test the cache in front of the agent."""
+
+    async def test_paraphrase_skips_the_agent(self):
+        service = make_service()
+
+        first = await service.process_query("삼성전자 전망 어때?")
+        second = await service.process_query("삼성전자는 앞으로 어떻게 될까요?")
+
+        assert first["result"]["messages"][-1].content == "삼성전자는 강세입니다."
+        assert second["result"] == "삼성전자는 강세입니다."
+        assert second["cached"] is True
+        assert second["matched_query"] == "삼성전자 전망 어때?"
+
+    async def test_other_company_runs_the_agent(self):
+        service = make_service()
+
+        await service.process_query("삼성전자 전망 어때?")
+        second = await service.process_query("SK하이닉스 전망 어때?")
+
+        assert second["result"]["messages"][-1].content == "두 번째 답변"
+
+    async def test_stream_sends_cached_answer(self):
+        service = make_service()
+        await service.process_query("삼성전자 전망 어때?")
+
+        events = [event async for event in service.stream_query("삼성전자 앞으로 어떻게 될까")]
+
+        assert len(events) == 1
+        assert events[0]["event"] == "done"
+        assert events[0]["data"]["answer"] == "삼성전자는 강세입니다."
+        assert events[0]["data"]["cached"] is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
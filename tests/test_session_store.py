@@ -0,0 +1,209 @@
+"""
+Test suite for session-scoped conversation memory.
+"""
+
+import asyncio
+
+import pytest
+import sys
+import os
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.services.agent_service import AgentService
+from meta_supervisor.services.session_store import SessionStore, estimate_tokens
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def summarize(summary, turns):
+    return "요약: " + ", ".join(user for user, _ in turns)
+
+
+async def failing_summarize(summary, turns):
+    raise RuntimeError("LLM unavailable")
+
+
+class TestEstimateTokens:
+    """Test the token estimate."""
+
+    def test_ascii_and_hangul(self):
+        assert estimate_tokens("abcdefgh") == 2
+        assert estimate_tokens("삼성전자") == 4
+        assert estimate_tokens("") == 0
+
+
+class TestSessionStore:
+    """Test history, compaction and eviction."""
+
+    def test_history_returns_turns_in_order(self):
+        store = SessionStore()
+        store.append("s1", "질문1", "답변1")
+        store.append("s1", "질문2", "답변2")
+
+        assert store.history("s1") == ("", [("질문1", "답변1"), ("질문2", "답변2")])
+        assert store.history("other") == ("", [])
+
+    def test_history_stays_within_budget_before_compaction(self):
+        store = SessionStore(token_budget=20)
+        for i in range(5):
+            store.append("s1", f"질문{i}", "가" * 5)
+
+        _, turns = store.history("s1")
+
+        assert [user for user, _ in turns] == ["질문3", "질문4"]
+
+    async def test_compaction_folds_oldest_turns_into_summary(self):
+        store = SessionStore(token_budget=20)
+        needs_compaction = False
+        for i in range(3):
+            needs_compaction = store.append("s1", f"질문{i}", "가" * 5)
+        assert needs_compaction
+
+        await store.compact("s1", summarize)
+
+        summary, turns = store.history("s1")
+        assert summary == "요약: 질문0, 질문1"
+        assert turns == [("질문2", "가" * 5)]
+        assert store.stats()["compactions"] == 1
+        assert store.stats()["tokens"] <= 10
+
+    async def test_failed_summary_keeps_turns_verbatim(self):
+        store = SessionStore(token_budget=20, summary_max_tokens=100)
+        for i in range(3):
+            store.append("s1", f"질문{i}", "가" * 5)
+
+        await store.compact("s1", failing_summarize)
+
+        summary, _ = store.history("s1")
+        assert "User: 질문0" in summary
+        assert store.stats()["compaction_failures"] == 1
+
+    async def test_cancelled_compaction_can_be_retried(self):
+        store = SessionStore(token_budget=20)
+        for i in range(3):
+            store.append("s1", f"질문{i}", "가" * 5)
+
+        async def cancelled(summary, turns):
+            raise asyncio.CancelledError()
+
+        with pytest.raises(asyncio.CancelledError):
+            await store.compact("s1", cancelled)
+        assert store.append("s1", "질문3", "가" * 5)
+
+        await store.compact("s1", summarize)
+
+        assert store.history("s1")[0] == "요약: 질문0, 질문1, 질문2"
+
+    async def test_summary_is_truncated(self):
+        store = SessionStore(token_budget=20, summary_max_tokens=10)
+        for i in range(3):
+            store.append("s1", f"질문{i}", "가" * 5)
+
+        async def long_summary(summary, turns):
+            return "나" * 100
+
+        await store.compact("s1", long_summary)
+
+        assert estimate_tokens(store.history("s1")[0]) <= 11
+
+    def test_least_recently_used_session_is_evicted(self):
+        store = SessionStore(max_sessions=2)
+        store.append("a", "q", "a")
+        store.append("b", "q", "a")
+        store.history("a")
+        store.append("c", "q", "a")
+
+        assert store.history("b") == ("", [])
+        assert store.history("a")[1] == [("q", "a")]
+        assert store.stats()["evictions"] == 1
+
+    def test_idle_sessions_expire(self):
+        clock = FakeClock()
+        store = SessionStore(idle_ttl=60, clock=clock)
+        store.append("a", "q", "a")
+
+        clock.now = 61
+        assert store.history("a") == ("", [])
+        assert store.stats()["expirations"] == 1
+
+
+class RecordingModel(GenericFakeChatModel):
+    inputs: list = []
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    async def _agenerate(self, messages, *args, **kwargs):
+        self.inputs.append([message.content for message in messages])
+        return await super()._agenerate(messages, *args, **kwargs)
+
+
+def make_service(store: SessionStore, llm: RecordingModel) -> AgentService:
+    return AgentService(
+        market_service=object(), trading_service=object(), llm=llm, session_store=store
+    )
+
+
+class TestAgentSessions:
+    """Test that the agent sees and records the session's conversation."""
+
+    async def test_follow_up_sees_previous_turn(self):
+        llm = RecordingModel(inputs=[], messages=iter([
+            AIMessage(content="삼성전자는 강세입니다."),
+            AIMessage(content="SK하이닉스도 강세입니다."),
+        ]))
+        service = make_service(SessionStore(), llm)
+
+        await service.process_query("삼성전자 전망 어때?", session_id="s1")
+        await service.process_query("그럼 SK하이닉스는?", session_id="s1")
+
+        assert llm.inputs[1][1:] == [
+            "삼성전자 전망 어때?",
+            "삼성전자는 강세입니다.",
+            "그럼 SK하이닉스는?",
+        ]
+
+    async def test_no_session_keeps_runs_independent(self):
+        llm = RecordingModel(inputs=[], messages=iter([
+            AIMessage(content="첫 번째"),
+            AIMessage(content="두 번째"),
+        ]))
+        store = SessionStore()
+        service = make_service(store, llm)
+
+        await service.process_query("질문1")
+        await service.process_query("질문2")
+
+        assert llm.inputs[1][1:] == ["질문2"]
+        assert len(store) == 0
+
+    async def test_summary_is_part_of_the_prompt(self):
+        llm = RecordingModel(inputs=[], messages=iter([
+            AIMessage(content="가" * 30),
+            AIMessage(content="요약된 대화"),
+            AIMessage(content="답변"),
+        ]))
+        store = SessionStore(token_budget=20)
+        store.append("s1", "이전 질문", "이전 답변")
+        service = make_service(store, llm)
+
+        await service.process_query("질문", session_id="s1")
+        await asyncio.gather(*service._compactions)
+        await service.process_query("다음 질문", session_id="s1")
+
+        assert store.history("s1")[0] == "요약된 대화"
+        assert "Summary of the earlier conversation:\n요약된 대화" in llm.inputs[2]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,136 @@
+"""
+Test suite for single-flight request coalescing.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.singleflight import SingleFlight
+from meta_supervisor.services import market_analysis_service, trading_service
+
+
+class TestSingleFlight:
+    """Test the coalescing primitive."""
+
+    async def test_concurrent_calls_share_one_upstream_call(self):
+        flights = SingleFlight()
+        upstream = []
+
+        async def fetch():
+            upstream.append(1)
+            await asyncio.sleep(0.05)
+            return "answer"
+
+        results = await asyncio.gather(*[flights.do("key", fetch) for _ in range(10)])
+
+        assert results == ["answer"] * 10
+        assert len(upstream) == 1
+        assert flights.stats()["saved_upstream_calls"] == 9
+        assert flights.stats()["in_flight"] == 0
+
+    async def test_errors_are_shared_and_not_remembered(self):
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("backend down")
+
+        results = await asyncio.gather(
+            flights.do("key", fail), flights.do("key", fail), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        async def succeed():
+            return "ok"
+
+        assert await flights.do("key", succeed) == "ok"
+        assert flights.upstream_calls == 2
+
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        flights = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "answer"
+
+        first = asyncio.ensure_future(flights.do("key", fetch))
+        second = asyncio.ensure_future(flights.do("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "answer"
+
+
+class TestServiceCoalescing:
+    """Test that backend services coalesce identical requests."""
+
+    async def test_market_analysis_coalesces_identical_queries(self, monkeypatch):
+        service = market_analysis_service.MarketAnalysisService()
+        calls = []
+
+        async def fake_request(method, endpoint, params=None, json=None):
+            calls.append(json)
+            await asyncio.sleep(0.05)
+            return {"answer": "report", "timestamp": "2025-01-01T00:00:00"}
+
+        monkeypatch.setattr(service, "_request", fake_request)
+        before = market_analysis_service.upstream_flights.stats()["saved_upstream_calls"]
+
+        results = await asyncio.gather(
+            *[service.analyze_market("삼성전자 전망") for _ in range(5)]
+        )
+
+        assert len(calls) == 1
+        assert all(result["answer"] == "report" for result in results)
+        after = market_analysis_service.upstream_flights.stats()["saved_upstream_calls"]
+        assert after - before == 4
+
+    async def test_trading_only_coalesces_read_only_messages(self, monkeypatch):
+        service = trading_service.TradingService()
+        calls = []
+
+        async def fake_send(message, idempotent=False):
+            calls.append(message)
+            await asyncio.sleep(0.05)
+            return trading_service.QueryResponse(role="assistant", content=message)
+
+        monkeypatch.setattr(service, "_send", fake_send)
+
+        await asyncio.gather(
+            *[service.send_query("삼성전자 RSI 확인", read_only=True) for _ in range(3)]
+        )
+        await asyncio.gather(*[service.send_query("삼성전자 10주 매수") for _ in range(3)])
+
+        assert calls.count("삼성전자 RSI 확인") == 1
+        assert calls.count("삼성전자 10주 매수") == 3
+        assert not trading_service.is_read_only_message("삼성전자 10주 매수")
+
+    @pytest.mark.parametrize(
+        "message",
+        ["삼성전자 RSI 확인", "005930 차트 분석해 주세요", "반도체 섹터 전망 알려줘"],
+    )
+    def test_information_requests_are_read_only(self, message):
+        assert trading_service.is_read_only_message(message)
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "삼성전자 차트상 손절해줘",
+            "삼성전자 사줘",
+            "보유 종목 팔아줘",
+            "미체결 주문 정정",
+            "삼성전자 차트 보고 처리해줘",
+            "삼성전자 10주",
+        ],
+    )
+    def test_orders_and_unknown_messages_are_not_read_only(self, message):
+        assert not trading_service.is_read_only_message(message)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
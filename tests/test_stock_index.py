@@ -0,0 +1,90 @@
+"""
+Test suite for the memory-mapped stock index.
+"""
+
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.services.stock_index import (
+    DEFAULT_LISTING_PATH,
+    ListingRow,
+    StockIndex,
+    build_index,
+    read_listing,
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    rows = [
+        ListingRow("005930", "삼성전자", ("삼전", "Samsung Electronics")),
+        ListingRow("005935", "삼성전자우", ()),
+        ListingRow("003550", "LG", ("엘지",)),
+        ListingRow("066570", "LG전자", ("엘지전자",)),
+        ListingRow("005380", "현대차", ("현대자동차",)),
+        ListingRow("352820", "하이브", ("HYBE",)),
+    ]
+    path = tmp_path / "stocks.idx"
+    build_index(rows, path)
+    stock_index = StockIndex(path)
+    yield stock_index
+    stock_index.close()
+
+
+class TestStockIndex:
+    """Test lookups against a compiled index."""
+
+    def test_resolves_every_mention(self, index):
+        mentions = index.find_all("삼전이랑 LG전자 비교하고 005930 차트 보여줘")
+
+        assert [(m.code, m.matched) for m in mentions] == [
+            ("005930", "삼전"),
+            ("066570", "LG전자"),
+            ("005930", "005930"),
+        ]
+        assert mentions[1].name == "LG전자"
+
+    def test_prefers_longest_match(self, index):
+        assert [m.code for m in index.find_all("삼성전자우 배당")] == ["005935"]
+        assert [m.code for m in index.find_all("삼성전자가 올랐다")] == ["005930"]
+
+    def test_ascii_keys_respect_word_boundaries(self, index):
+        assert index.find_all("LGU 실적") == []
+        assert index.find_all("1005930 번호") == []
+        assert [m.code for m in index.find_all("samsung electronics 전망")] == ["005930"]
+
+    def test_hangul_keys_end_at_a_particle(self, index):
+        assert index.find_all("하이브리드 차량 판매") == []
+        assert index.find_all("현대차증권 리포트") == []
+        assert [m.matched for m in index.find_all("하이브와 현대차의 실적")] == ["하이브", "현대차"]
+        assert [m.code for m in index.find_all("삼성전자주가 알려줘")] == ["005930"]
+
+    def test_exact_lookup(self, index):
+        assert index.lookup("엘지") == ("003550", "LG")
+        assert index.lookup("lg전자") == ("066570", "LG전자")
+        assert index.lookup("삼성") is None
+
+    def test_bundled_listing_compiles(self, tmp_path):
+        path = tmp_path / "bundled.idx"
+        build_index(read_listing(DEFAULT_LISTING_PATH), path)
+        stock_index = StockIndex(path)
+
+        assert stock_index.lookup("SK하이닉스") == ("000660", "SK하이닉스")
+        assert [m.code for m in stock_index.find_all("삼성전자우 배당")] == ["005935"]
+        assert [m.code for m in stock_index.find_all("현대차증권 목표가")] == ["001500"]
+        stock_index.close()
+
+    def test_rejects_foreign_files(self, tmp_path):
+        path = tmp_path / "garbage.idx"
+        path.write_bytes(b"\0" * 64)
+
+        with pytest.raises(ValueError):
+            StockIndex(path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,151 @@
+"""
+Test suite for memoized agent tool results.
+"""
+
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor.services.trading_service import QueryResponse
+from meta_supervisor.tools import base_tool, memo
+from meta_supervisor.tools.market_analysis_tool import MarketAnalysisInput, MarketAnalysisTool
+from meta_supervisor.tools.trading_tool import TradingTool
+
+
+class CountingMarketService:
+    def __init__(self, result=None):
+        self.calls = 0
+        self.result = result or {"answer": "report"}
+
+    async def analyze_market(self, query):
+        self.calls += 1
+        return {"query": query, **self.result}
+
+
+class CountingTradingService:
+    def __init__(self, role="assistant"):
+        self.calls = 0
+        self.role = role
+
+    async def send_query(self, message, read_only=False):
+        self.calls += 1
+        return QueryResponse(role=self.role, content="ok")
+
+
+class TestMemoKey:
+    """Test key canonicalization."""
+
+    def test_whitespace_is_collapsed(self):
+        assert memo.memo_key(MarketAnalysisInput, {"query": " 삼성전자   전망 "}) == memo.memo_key(
+            MarketAnalysisInput, {"query": "삼성전자 전망"}
+        )
+
+    def test_different_input_different_key(self):
+        assert memo.memo_key(MarketAnalysisInput, {"query": "삼성전자 전망"}) != memo.memo_key(
+            MarketAnalysisInput, {"query": "SK하이닉스 전망"}
+        )
+
+
+class TestToolMemo:
+    """Test memoization in BaseAPITool."""
+
+    async def test_repeated_call_is_served_from_cache(self):
+        service = CountingMarketService()
+        tool = MarketAnalysisTool(service=service)
+
+        first = await tool.ainvoke({"query": "삼성전자 전망"})
+        second = await MarketAnalysisTool(service=service).ainvoke({"query": "삼성전자  전망"})
+
+        assert first == second
+        assert service.calls == 1
+        stats = memo.tool_memo_stats()["market_analysis"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["ttl"] == tool.cache_ttl
+
+    async def test_fallback_is_not_cached(self):
+        service = CountingMarketService({"answer": "unavailable", "source": "fallback"})
+        tool = MarketAnalysisTool(service=service)
+
+        await tool.ainvoke({"query": "삼성전자 전망"})
+        await tool.ainvoke({"query": "삼성전자 전망"})
+
+        assert service.calls == 2
+
+    async def test_stale_answers_are_not_cached(self):
+        service = CountingMarketService({"answer": "old report", "cache_status": "stale"})
+        tool = MarketAnalysisTool(service=service)
+
+        await tool.ainvoke({"query": "삼성전자 전망"})
+        await tool.ainvoke({"query": "삼성전자 전망"})
+
+        assert service.calls == 2
+
+    async def test_callers_get_their_own_copy(self):
+        service = CountingMarketService({"answer": "report", "sources": ["a"]})
+        tool = MarketAnalysisTool(service=service)
+
+        first = await tool.ainvoke({"query": "삼성전자 전망"})
+        first["sources"].append("b")
+        second = await tool.ainvoke({"query": "삼성전자 전망"})
+        second["answer"] = "edited"
+        third = await tool.ainvoke({"query": "삼성전자 전망"})
+
+        assert service.calls == 1
+        assert third["sources"] == ["a"]
+        assert third["answer"] == "report"
+
+    async def test_orders_bypass_the_cache(self):
+        service = CountingTradingService()
+        tool = TradingTool(service=service)
+
+        await tool.ainvoke({"message": "삼성전자 10주 매수"})
+        await tool.ainvoke({"message": "삼성전자 10주 매수"})
+
+        assert service.calls == 2
+        assert memo.tool_memo_stats()["trading"]["bypassed"] == 2
+
+    async def test_account_questions_bypass_the_cache(self):
+        service = CountingTradingService()
+        tool = TradingTool(service=service)
+
+        await tool.ainvoke({"message": "내 잔고 확인"})
+        await tool.ainvoke({"message": "내 잔고 확인"})
+
+        assert service.calls == 2
+        assert memo.tool_memo_stats()["trading"]["bypassed"] == 2
+
+    async def test_read_only_trading_messages_are_cached(self):
+        service = CountingTradingService()
+        tool = TradingTool(service=service)
+
+        await tool.ainvoke({"message": "삼성전자 RSI 확인"})
+        await tool.ainvoke({"message": "삼성전자 RSI 확인"})
+
+        assert service.calls == 1
+
+    async def test_errors_are_not_cached(self):
+        service = CountingTradingService(role="error")
+        tool = TradingTool(service=service)
+
+        await tool.ainvoke({"message": "삼성전자 RSI 확인"})
+        await tool.ainvoke({"message": "삼성전자 RSI 확인"})
+
+        assert service.calls == 2
+
+    async def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(base_tool.settings, "TOOL_CACHE_ENABLED", False)
+        service = CountingMarketService()
+        tool = MarketAnalysisTool(service=service)
+
+        await tool.ainvoke({"query": "삼성전자 전망"})
+        await tool.ainvoke({"query": "삼성전자 전망"})
+
+        assert service.calls == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
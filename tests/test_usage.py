@@ -0,0 +1,181 @@
+"""
+Test suite for per-request LLM and tool usage accounting.
+"""
+
+import json
+
+import pytest
+import sys
+import os
+from uuid import uuid4
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor import simple_logging, usage
+from meta_supervisor.metrics import Histogram
+from meta_supervisor.simple_logging import SimpleLoggingMiddleware
+from meta_supervisor.tools.market_analysis_tool import MarketAnalysisTool
+
+
+def reply(content="답변", input_tokens=100, output_tokens=20) -> AIMessage:
+    return AIMessage(
+        content=content,
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+    )
+
+
+def make_llm(*messages) -> GenericFakeChatModel:
+    return GenericFakeChatModel(messages=iter(messages), callbacks=[usage.UsageCallbackHandler()])
+
+
+class FakeMarketService:
+    async def analyze_market(self, query):
+        return {"query": query, "answer": "report"}
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    stats = usage.UsageStats()
+    monkeypatch.setattr(usage, "usage_stats", stats)
+    return stats
+
+
+class TestHistogram:
+    """Test the fixed-bucket histogram."""
+
+    def test_buckets_are_inclusive_upper_bounds(self):
+        histogram = Histogram((1, 10))
+        for value in (0, 1, 5, 10, 11):
+            histogram.observe(value)
+
+        assert histogram.snapshot()["buckets"] == {"<=1": 2, "<=10": 2, ">10": 1}
+        assert histogram.snapshot()["avg"] == 5.4
+
+
+class TestUsageAccounting:
+    """Test LLM and tool calls landing in the request's usage."""
+
+    async def test_llm_calls_are_accounted_to_the_scope(self, stats, monkeypatch):
+        monkeypatch.setattr(usage.settings, "LLM_PROMPT_PRICE_PER_1M_TOKENS", 1.0)
+        monkeypatch.setattr(usage.settings, "LLM_COMPLETION_PRICE_PER_1M_TOKENS", 2.0)
+        llm = make_llm(reply(), reply(input_tokens=200, output_tokens=40))
+
+        with usage.usage_scope() as request_usage:
+            await llm.ainvoke("질문")
+            await llm.ainvoke("질문")
+
+        snapshot = request_usage.snapshot()
+        assert snapshot["llm_calls"] == 2
+        assert snapshot["prompt_tokens"] == 300
+        assert snapshot["completion_tokens"] == 60
+        assert snapshot["cost_usd"] == pytest.approx((300 * 1.0 + 60 * 2.0) / 1_000_000)
+        assert stats.stats()["requests"] == 1
+        assert stats.stats()["per_request"]["tokens"]["buckets"]["<=500"] == 1
+
+    async def test_calls_outside_a_scope_only_count_globally(self, stats):
+        await make_llm(reply()).ainvoke("질문")
+
+        assert stats.stats()["llm_calls"] == 1
+        assert stats.stats()["requests"] == 0
+
+    def test_token_usage_from_llm_output(self, stats):
+        handler = usage.UsageCallbackHandler()
+        run_id = uuid4()
+        result = LLMResult(
+            generations=[[ChatGeneration(message=AIMessage(content="답변"))]],
+            llm_output={
+                "token_usage": {"prompt_tokens": 50, "completion_tokens": 5},
+                "model_name": "gpt-4o-mini",
+            },
+        )
+
+        with usage.usage_scope() as request_usage:
+            handler.on_chat_model_start({}, [], run_id=run_id)
+            handler.on_llm_end(result, run_id=run_id)
+
+        snapshot = request_usage.snapshot()
+        assert snapshot["prompt_tokens"] == 50
+        assert snapshot["completion_tokens"] == 5
+        assert snapshot["models"] == {"gpt-4o-mini": 1}
+
+    async def test_tool_calls_and_cache_hits(self, stats):
+        tool = MarketAnalysisTool(service=FakeMarketService())
+
+        with usage.usage_scope() as request_usage:
+            await tool.ainvoke({"query": "삼성전자 전망"})
+            await tool.ainvoke({"query": "삼성전자 전망"})
+
+        snapshot = request_usage.snapshot()
+        assert snapshot["tool_calls"] == 2
+        assert snapshot["tool_cache_hits"] == 1
+        assert stats.stats()["tool_calls"] == 2
+
+
+class TestUsageMiddleware:
+    """Test the per-request breakdown in logs and responses."""
+
+    @pytest.fixture
+    def client(self, stats):
+        app = FastAPI()
+        app.add_middleware(SimpleLoggingMiddleware)
+        llm = make_llm(reply(), reply(), reply())
+
+        @app.post("/ask")
+        async def ask(data: dict):
+            answer = await llm.ainvoke(data["query"])
+            return {"answer": answer.content}
+
+        @app.post("/stream")
+        async def stream(data: dict):
+            async def body():
+                yield "생각 중\n"
+                answer = await llm.ainvoke(data["query"])
+                yield answer.content
+
+            return StreamingResponse(body(), media_type="text/plain")
+
+        return TestClient(app)
+
+    def test_usage_is_logged(self, client, caplog):
+        with caplog.at_level("INFO", logger="http_middleware"):
+            client.post("/ask", json={"query": "질문"})
+
+        responses = [
+            json.loads(record.getMessage())
+            for record in caplog.records
+            if '"event": "response"' in record.getMessage()
+        ]
+        assert responses[0]["llm_usage"]["llm_calls"] == 1
+        assert responses[0]["llm_usage"]["total_tokens"] == 120
+
+    def test_usage_header_is_optional(self, client, monkeypatch, stats):
+        response = client.post("/ask", json={"query": "질문"})
+        assert "x-llm-usage" not in response.headers
+
+        monkeypatch.setattr(simple_logging.settings, "USAGE_IN_RESPONSE", True)
+        response = client.post("/ask", json={"query": "질문"})
+        assert json.loads(response.headers["x-llm-usage"])["llm_calls"] == 1
+        assert stats.stats()["requests"] == 2
+
+    @pytest.mark.parametrize("path", ["/ask", "/stream"])
+    def test_request_is_recorded_once(self, client, stats, path):
+        client.post(path, json={"query": "질문"})
+
+        snapshot = stats.stats()
+        assert snapshot["requests"] == 1
+        assert snapshot["per_request"]["llm_calls"]["count"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,100 @@
+"""
+Test suite for the startup warm-up and readiness probe.
+"""
+
+import asyncio
+import time
+
+import pytest
+import sys
+import os
+from fastapi.testclient import TestClient
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from meta_supervisor import main
+from meta_supervisor.main import app
+from meta_supervisor.services import agent_service
+from meta_supervisor.services.agent_service import AgentService
+
+
+class ToolModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def wait_until_ready(client, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        response = client.get("/ready")
+        if response.status_code == 200 or time.perf_counter() > deadline:
+            return response
+        time.sleep(0.02)
+
+
+class TestAgentConstruction:
+    """Test that the agent graph is built once."""
+
+    async def test_concurrent_first_requests_build_one_agent(self, monkeypatch):
+        builds = []
+        create_react_agent = agent_service.create_react_agent
+
+        def counting_create(**kwargs):
+            builds.append(kwargs)
+            return create_react_agent(**kwargs)
+
+        monkeypatch.setattr(agent_service, "create_react_agent", counting_create)
+        service = AgentService(llm=ToolModel(messages=iter([])))
+
+        agents = await asyncio.gather(*[service.get_agent() for _ in range(5)])
+
+        assert len(builds) == 1
+        assert all(agent is agents[0] for agent in agents)
+
+
+class TestReadiness:
+    """Test the /ready probe around the lifespan warm-up."""
+
+    def test_not_ready_before_startup(self):
+        response = TestClient(app).get("/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "warming_up"
+
+    def test_ready_after_warm_up(self):
+        with TestClient(app) as client:
+            response = wait_until_ready(client)
+
+        assert response.status_code == 200
+        timings = response.json()["warm_up"]
+        assert {"agent_ms", "clients_ms", "nlu_ms", "total_ms"} <= set(timings)
+        assert not app.state.ready
+
+    def test_failed_warm_up_stays_unready(self, monkeypatch):
+        async def broken_agent():
+            raise RuntimeError("bad configuration")
+
+        monkeypatch.setattr(main, "_warm_up_agent", broken_agent)
+        with TestClient(app) as client:
+            deadline = time.perf_counter() + 10.0
+            while app.state.warm_up_error is None and time.perf_counter() < deadline:
+                time.sleep(0.02)
+            response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.json() == {"status": "failed", "error": "bad configuration"}
+
+    def test_disabled_warm_up_is_ready_at_once(self, monkeypatch):
+        monkeypatch.setattr(main.settings, "WARM_UP_ON_STARTUP", False)
+
+        with TestClient(app) as client:
+            response = client.get("/ready")
+
+        assert response.status_code == 200
+        assert response.json()["warm_up"] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])